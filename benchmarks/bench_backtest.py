@@ -0,0 +1,66 @@
+"""
+Benchmark of the vectorized backtest engine.
+
+Backtests ``MomentumStrategy`` on synthetic random-walk klines, by default 400 symbols of
+five years of 1h bars, with symbols listed at different times. Run from the repository root:
+
+    python -m benchmarks.bench_backtest [--symbols 400] [--years 5] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.quants.backtest import BacktestConfig, run_backtest
+from src.quants.strategies.momentum import MomentumStrategy
+from src.quants.utils.timeframes import interval_to_ms
+
+
+def make_frames(symbols: int, bars: int, interval: str, seed: int = 0):
+    """Random-walk klines; a quarter of the symbols list partway through the period."""
+    rng = np.random.default_rng(seed)
+    step = interval_to_ms(interval)
+    open_time = 1_500_000_000_000 + step * np.arange(bars, dtype=np.int64)
+    frames = {}
+    for i in range(symbols):
+        start = int(rng.integers(0, bars // 2)) if i % 4 == 0 else 0
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars - start)))
+        open_ = np.r_[100.0, close[:-1]] * (1 + rng.normal(0, 0.001, bars - start))
+        frames[f"SYM{i:04d}USDT"] = pd.DataFrame(
+            {
+                "open_time": open_time[start:],
+                "close_time": open_time[start:] + step - 1,
+                "open": open_,
+                "close": close,
+            }
+        )
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=400)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bars = int(args.years * 365 * interval_to_ms("1d") / interval_to_ms(args.interval))
+    frames = make_frames(args.symbols, bars, args.interval)
+    strategy = MomentumStrategy(period=24)
+    config = BacktestConfig()
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = run_backtest(strategy, frames, args.interval, config, keep_series=False)
+        timings.append(time.perf_counter() - started)
+    print(f"{args.symbols} symbols x {bars} {args.interval} bars: {min(timings):.2f}s")
+    print(f"trades: {int(result.metrics['trades'].sum())}")
+    print(f"portfolio: {result.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark of the universe-wide indicator kernels.
+
+Times each backend on a (bars, symbols) panel and reports seconds per million bars, next
+to pandas run one symbol at a time. Correctness against pandas and pandas_ta is covered by
+tests/test_indicators.py. Run from the repository root:
+
+    python -m benchmarks.bench_indicators [--symbols 400] [--bars 43800] [--repeat 3]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.quants import indicators
+
+
+def make_panel(bars: int, symbols: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Random-walk OHLC; a quarter of the symbols list partway through."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (bars, symbols)), axis=0))
+    high = close * (1 + rng.uniform(0, 0.01, close.shape))
+    low = close * (1 - rng.uniform(0, 0.01, close.shape))
+    for j in range(0, symbols, 4):
+        listed = rng.integers(0, bars // 2)
+        close[:listed, j] = high[:listed, j] = low[:listed, j] = np.nan
+    return {"high": high, "low": low, "close": close}
+
+
+def ema_reference(close: pd.Series, length: int) -> pd.Series:
+    """pandas_ta's ``ema``: seeded with the SMA of the first ``length`` bars."""
+    values = close.loc[close.first_valid_index() :].copy()
+    values.iloc[: length - 1] = np.nan
+    values.iloc[length - 1] = close.loc[values.index[0] :].iloc[:length].mean()
+    return values.ewm(span=length, adjust=False).mean().reindex(close.index)
+
+
+def rma_reference(values: pd.Series, length: int) -> pd.Series:
+    return values.ewm(alpha=1 / length, min_periods=length).mean()
+
+
+def references(high: pd.Series, low: pd.Series, close: pd.Series) -> Dict[str, pd.Series]:
+    """The indicators of one symbol with pandas alone, the baseline of the timings."""
+    change = close.diff()
+    gains = rma_reference(change.clip(lower=0), 14)
+    losses = rma_reference(-change.clip(upper=0), 14)
+    previous = close.shift()
+    true_range = pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1)
+    macd = ema_reference(close, 12) - ema_reference(close, 26)
+    return {
+        "sma": close.rolling(20).mean(),
+        "ema": ema_reference(close, 20),
+        "rsi": 100 * gains / (gains + losses),
+        "atr": rma_reference(true_range.max(axis=1).where(previous.notna()), 14),
+        "macd": ema_reference(macd, 9),
+        "bollinger": close.rolling(20).mean() + 2 * close.rolling(20).std(ddof=0),
+        "zscore": (close - close.rolling(30).mean()) / close.rolling(30).std(),
+        "momentum": close.diff(10),
+    }
+
+
+def kernels(backend: str) -> Dict[str, Callable[[Dict[str, np.ndarray]], np.ndarray]]:
+    return {
+        "sma": lambda p: indicators.sma(p["close"], 20),
+        "ema": lambda p: indicators.ema(p["close"], 20, backend),
+        "rsi": lambda p: indicators.rsi(p["close"], 14, backend),
+        "atr": lambda p: indicators.atr(p["high"], p["low"], p["close"], 14, backend),
+        "macd": lambda p: indicators.macd(p["close"], backend=backend)["signal"],
+        "bollinger": lambda p: indicators.bollinger(p["close"], 20, 2)["upper"],
+        "zscore": lambda p: indicators.zscore(p["close"], 30),
+        "momentum": lambda p: indicators.momentum(p["close"], 10),
+    }
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=400)
+    parser.add_argument("--bars", type=int, default=43_800)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    panel = make_panel(args.bars, args.symbols)
+    backends = indicators.available_backends()
+    for backend in backends:
+        # compile outside the timings
+        for kernel in kernels(backend).values():
+            kernel(make_panel(100, 2))
+    millions = args.bars * args.symbols / 1e6
+    print(f"{args.symbols} symbols x {args.bars} bars, seconds per 1M bars")
+    print(f"{'indicator':<10}" + "".join(f"{backend:>10}" for backend in backends))
+    by_backend = {backend: kernels(backend) for backend in backends}
+    totals = np.zeros(len(backends))
+    for name in by_backend[backends[0]]:
+        seconds = [best_of(lambda: by_backend[b][name](panel), args.repeat) for b in backends]
+        totals += seconds
+        print(f"{name:<10}" + "".join(f"{s / millions:>10.4f}" for s in seconds))
+
+    def per_symbol() -> None:
+        for j in range(args.symbols):
+            references(*(pd.Series(panel[col][:, j]) for col in ("high", "low", "close")))
+
+    baseline = best_of(per_symbol, 1)
+    print(f"{'all':<10}" + "".join(f"{s / millions:>10.4f}" for s in totals))
+    print(f"pandas one symbol at a time, all indicators: {baseline / millions:.4f}")
+
+
+if __name__ == "__main__":
+    main()
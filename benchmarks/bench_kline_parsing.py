@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for kline parsing.
+
+Compares the previous ``create_dataframe`` (object frame, per-column astype, datetime
+conversion) with ``BinancePlatform.create_dataframe`` fed either parsed JSON rows or the raw
+response body. Run from the repository root:
+
+    python -m benchmarks.bench_kline_parsing [--sizes 1000 100000 1000000] [--repeat 3]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, List
+
+import numpy as np
+import pandas as pd
+
+from src.quants.platform.binance import BinancePlatform
+
+
+def legacy_create_dataframe(klines: List[List[Any]]) -> pd.DataFrame:
+    df = pd.DataFrame(klines, columns=BinancePlatform.KLINE_COLS)
+    df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
+    df["close_time"] = pd.to_datetime(df["close_time"], unit="ms")
+    for col in df.columns:
+        if col not in ["open_time", "close_time"]:
+            df[col] = df[col].astype(float)
+    return df
+
+
+def make_payload(rows: int, seed: int = 0) -> str:
+    """Build a ``/api/v3/klines``-shaped JSON body with 1m bars."""
+    rng = np.random.default_rng(seed)
+    start = 1_700_000_000_000
+    prices = rng.uniform(0.0001, 100_000, size=(rows, 9))
+    trades = rng.integers(0, 100_000, size=rows)
+    klines = []
+    for i in range(rows):
+        p = [f"{value:.8f}" for value in prices[i]]
+        open_time = start + i * 60_000
+        klines.append(
+            [open_time, *p[:5], open_time + 59_999, p[5], int(trades[i]), p[6], p[7], "0"]
+        )
+    return json.dumps(klines, separators=(",", ":"))
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy':>10} {'rows->cols':>11} {'json+legacy':>12} {'raw body':>10}")
+    for rows in args.sizes:
+        payload = make_payload(rows)
+        klines = json.loads(payload)
+
+        expected = legacy_create_dataframe(klines)
+        parsed = BinancePlatform.create_dataframe(payload)
+        for col in BinancePlatform.KLINE_COLS:
+            if col in ("open_time", "close_time"):
+                expected_values = expected[col].values.astype("datetime64[ms]").astype(np.int64)
+            else:
+                expected_values = expected[col].to_numpy()
+            np.testing.assert_array_equal(parsed[col].to_numpy(), expected_values)
+
+        results = [
+            best_of(lambda: legacy_create_dataframe(klines), args.repeat),
+            best_of(lambda: BinancePlatform.create_dataframe(klines), args.repeat),
+            best_of(lambda: legacy_create_dataframe(json.loads(payload)), args.repeat),
+            best_of(lambda: BinancePlatform.create_dataframe(payload), args.repeat),
+        ]
+        print(
+            f"{rows:>10} {results[0]:>10.4f} {results[1]:>11.4f} "
+            f"{results[2]:>12.4f} {results[3]:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark of per-symbol load-and-convert time for stored klines.
+
+The legacy path reads CSV files with datetime text, parses it back to epoch ms, converts
+both time columns to the local timezone in the collector, and converts ``close_time`` once
+more in the chart drawer. The current path reads int64 epoch ms and renders only the
+plotted tail in the local timezone. Run from the repository root:
+
+    python -m benchmarks.bench_time_representation [--sizes 1000 100000 1000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from src.quants.storage import TIME_COLUMNS, StorageFactory
+from src.quants.utils.timeframes import localize_times
+from src.quants.visualization.chart_drawer import ChartDrawer
+
+SYMBOL = "BTCUSDT"
+INTERVAL = "1m"
+TIMEZONE = "Asia/Singapore"
+
+
+def make_klines(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    open_time = 1_700_000_000_000 + np.arange(rows, dtype=np.int64) * 60_000
+    data = {"open_time": open_time}
+    for col in ("open", "high", "low", "close", "volume"):
+        data[col] = rng.uniform(1, 100_000, rows)
+    data["close_time"] = open_time + 59_999
+    return pd.DataFrame(data)
+
+
+def write_legacy_csv(root: str, klines: pd.DataFrame) -> None:
+    """Write the file the way CSVStorage did before times were kept as epoch ms."""
+    data = klines.copy()
+    for col in TIME_COLUMNS:
+        data[col] = pd.to_datetime(data[col], unit="ms", utc=True)
+    path = os.path.join(root, SYMBOL, f"{INTERVAL}.csv")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data.to_csv(path, index=False)
+
+
+def legacy_csv_read(root: str) -> pd.DataFrame:
+    df = pd.read_csv(os.path.join(root, SYMBOL, f"{INTERVAL}.csv"))
+    for col in TIME_COLUMNS:
+        df[col] = pd.to_datetime(df[col], utc=True)
+    for col in TIME_COLUMNS:
+        df[col] = df[col].values.astype("datetime64[ms]").astype(np.int64)
+    return df
+
+
+def legacy_convert(df: pd.DataFrame) -> pd.DatetimeIndex:
+    # collector load_data, then ChartDrawer on the full frame
+    for col in TIME_COLUMNS:
+        df[col] = pd.to_datetime(df[col], unit="ms", utc=True).dt.tz_convert(TIMEZONE)
+    dates = pd.to_datetime(df["close_time"], unit="ms", utc=True).dt.tz_convert(TIMEZONE)
+    return pd.DatetimeIndex(dates).tz_convert(TIMEZONE)[-ChartDrawer.MAX_CANDLES :]
+
+
+def current_convert(df: pd.DataFrame) -> pd.DatetimeIndex:
+    return localize_times(df["close_time"].tail(ChartDrawer.MAX_CANDLES), TIMEZONE)
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>10} {'csv legacy':>11} {'csv epoch':>10} {'npy legacy':>11} {'npy epoch':>10}"
+    )
+    for rows in args.sizes:
+        klines = make_klines(rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_root = os.path.join(tmp, "legacy")
+            write_legacy_csv(legacy_root, klines)
+            csv_storage = StorageFactory.create_storage("csv", os.path.join(tmp, "csv"))
+            csv_storage.write(SYMBOL, INTERVAL, klines)
+            npy_storage = StorageFactory.create_storage("npy", os.path.join(tmp, "npy"))
+            npy_storage.write(SYMBOL, INTERVAL, klines)
+
+            expected = localize_times(klines["close_time"].tail(ChartDrawer.MAX_CANDLES), TIMEZONE)
+            for rendered in (
+                legacy_convert(legacy_csv_read(legacy_root)),
+                current_convert(csv_storage.read(SYMBOL, INTERVAL)),
+                current_convert(npy_storage.read(SYMBOL, INTERVAL)),
+            ):
+                assert (rendered == expected).all()
+
+            results = [
+                best_of(lambda: legacy_convert(legacy_csv_read(legacy_root)), args.repeat),
+                best_of(lambda: current_convert(csv_storage.read(SYMBOL, INTERVAL)), args.repeat),
+                best_of(lambda: legacy_convert(npy_storage.read(SYMBOL, INTERVAL)), args.repeat),
+                best_of(lambda: current_convert(npy_storage.read(SYMBOL, INTERVAL)), args.repeat),
+            ]
+        print(
+            f"{rows:>10} {results[0]:>11.4f} {results[1]:>10.4f} "
+            f"{results[2]:>11.4f} {results[3]:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,9 @@ class AnalysisRunner:
     def __init__(self, collector, config):
         self.collector = collector
         self.config = config
-        self.chart_drawer = ChartDrawer(os.path.join(config.data_path, "analysis_charts"))
+        self.chart_drawer = ChartDrawer(
+            os.path.join(config.data_path, "analysis_charts"), config.timezone
+        )
         self.analyses = self._load_analyses(config.analysis)
 
     def _load_analyses(self, analysis_config: Dict[str, Any]) -> Dict[str, Any]:
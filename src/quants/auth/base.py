@@ -11,8 +11,8 @@ class BaseAuth(ABC):
         """
         pass
 
-    @abstractmethod
     def get_spot(self) -> dict:
         """
-        Get the spot for the authentication."""
-        pass
+        Get the spot for the authentication. Providers without a separate spot client
+        return None."""
+        return None
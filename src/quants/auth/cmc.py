@@ -20,3 +20,6 @@ class CoinMarketCapAuth(BaseAuth):
 
     def get_session(self) -> Session:
         return self.session
+
+    def get_client(self) -> Session:
+        return self.session
@@ -0,0 +1,28 @@
+from .engine import (
+    METRICS,
+    BacktestAccumulator,
+    BacktestConfig,
+    BacktestResult,
+    backtest_panel,
+    run_backtest,
+    simulate,
+    target_positions,
+)
+from .parallel import run_backtest_parallel
+from .sweep import ParameterSweep, SweepData, grid_points, random_points
+
+__all__ = [
+    "BacktestAccumulator",
+    "BacktestConfig",
+    "BacktestResult",
+    "METRICS",
+    "ParameterSweep",
+    "SweepData",
+    "backtest_panel",
+    "grid_points",
+    "random_points",
+    "run_backtest",
+    "run_backtest_parallel",
+    "simulate",
+    "target_positions",
+]
@@ -0,0 +1,333 @@
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..strategies.base import BaseStrategy
+from ..strategies.panel import PricePanel
+from ..utils.logger import get_logger
+from ..utils.timeframes import interval_to_ms
+
+logger = get_logger(__name__)
+
+YEAR_MS = 365 * interval_to_ms("1d")
+METRICS = [
+    "total_return",
+    "cagr",
+    "volatility",
+    "sharpe",
+    "max_drawdown",
+    "trades",
+    "win_rate",
+    "exposure",
+    "fees",
+]
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    """
+    :param fee_bps: Fee per unit of position traded, in basis points of the fill price
+    :param slippage_bps: Price impact per fill, in basis points against the trade
+    :param fill: "next_open" fills a signal at the next bar's open, "close" at the bar's
+        own close (optimistic: the signal is known only once the bar closed)
+    :param allow_short: Sell signals go short instead of flat
+    :param block_size: Symbols simulated at once, bounding memory on long histories
+    """
+
+    fee_bps: float = 10.0
+    slippage_bps: float = 5.0
+    fill: str = "next_open"
+    allow_short: bool = False
+    block_size: int = 64
+
+
+@dataclass
+class BacktestResult:
+    """
+    :param metrics: One row of ``METRICS`` per symbol
+    :param equity: (bars,) equity of an equal-weight portfolio of the symbols with a bar,
+        rebalanced every bar, starting at 1
+    :param returns: (bars, symbols) net returns per bar, if kept
+    :param positions: (bars, symbols) position held during each bar, if kept
+    """
+
+    interval: str
+    symbols: List[str]
+    open_time: np.ndarray
+    metrics: pd.DataFrame
+    equity: np.ndarray
+    returns: Optional[np.ndarray] = None
+    positions: Optional[np.ndarray] = None
+
+    def summary(self) -> Dict[str, float]:
+        """Metrics of the portfolio equity curve."""
+        if not len(self.equity):
+            return {"total_return": 0.0, "cagr": 0.0, "sharpe": 0.0, "max_drawdown": 0.0}
+        returns = self.equity / np.r_[1.0, self.equity[:-1]] - 1
+        periods_per_year = YEAR_MS / interval_to_ms(self.interval)
+        std = returns.std()
+        peak = np.maximum.accumulate(np.maximum(self.equity, 1))
+        return {
+            "total_return": float(self.equity[-1] - 1),
+            "cagr": float(self.equity[-1] ** (periods_per_year / len(returns)) - 1),
+            "sharpe": float(returns.mean() / std * np.sqrt(periods_per_year)) if std else 0.0,
+            "max_drawdown": float((self.equity / peak - 1).min()),
+        }
+
+
+def target_positions(signals: np.ndarray, allow_short: bool = False) -> np.ndarray:
+    """
+    Position wanted after each bar: 1 after a buy signal, -1 (or 0 without shorts) after a
+    sell signal, carried forward over bars without a signal; flat before the first signal.
+    """
+    signals = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+    rows = np.arange(len(signals))[:, None]
+    last = np.maximum.accumulate(np.where(signals != 0, rows, -1), axis=0)
+    sell = -1 if allow_short else 0
+    values = np.where(signals > 0, 1, sell).astype(np.int8)
+    positions = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+    positions[last < 0] = 0
+    return positions
+
+
+def simulate(
+    open_: np.ndarray,
+    close: np.ndarray,
+    signals: np.ndarray,
+    config: BacktestConfig,
+    periods_per_year: float,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate trading ``signals`` on (bars, symbols) prices, all symbols at once.
+
+    A position changes at the fill price and costs ``fee_bps + slippage_bps`` per unit of
+    change. Bars without prices (NaN) earn nothing.
+
+    :return: ``returns`` and ``positions`` (bars, symbols), ``active`` (bars, symbols) for
+        bars with prices, and one (symbols,) array per metric
+    """
+    bars, n = close.shape
+    target = target_positions(signals, config.allow_short)
+    held = np.zeros_like(target)
+    held[1:] = target[:-1]
+    previous = np.zeros_like(held)
+    previous[1:] = held[:-1]
+
+    prev_close = np.full_like(close, np.nan)
+    prev_close[1:] = close[:-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if config.fill == "next_open":
+            # the old position carries over the gap to the open, the new one to the close
+            gap = np.nan_to_num(open_ / prev_close - 1)
+            intrabar = np.nan_to_num(close / open_ - 1)
+        else:
+            gap = np.zeros_like(close)
+            intrabar = np.nan_to_num(close / prev_close - 1)
+    rate = (config.fee_bps + config.slippage_bps) / 10_000
+    changed = held != previous
+    # positions are -1, 0 or 1, so a change closes |previous| and opens |held|
+    exit_cost = np.where(changed, np.abs(previous), 0) * rate
+    entry_cost = np.where(changed, np.abs(held), 0) * rate
+    cost = exit_cost + entry_cost
+    returns = (1 + previous * gap) * (1 + held * intrabar) * (1 - cost) - 1
+    active = ~np.isnan(close)
+
+    metrics = _metrics(returns, active, periods_per_year)
+    metrics.update(
+        _trade_metrics(held, previous, gap, intrabar, exit_cost, entry_cost),
+        exposure=_ratio((active & (held != 0)).sum(axis=0), active.sum(axis=0)),
+        fees=cost.sum(axis=0),
+    )
+    return {"returns": returns, "positions": held, "active": active, **metrics}
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _metrics(
+    returns: np.ndarray, active: np.ndarray, periods_per_year: float
+) -> Dict[str, np.ndarray]:
+    bars, n = returns.shape
+    if not bars:
+        zeros = np.zeros(n)
+        return dict.fromkeys(
+            ["total_return", "cagr", "volatility", "sharpe", "max_drawdown"], zeros
+        )
+    active_bars = active.sum(axis=0)
+    equity = np.cumprod(1 + returns, axis=0)
+    final = equity[-1]
+    mean = _ratio(np.where(active, returns, 0).sum(axis=0), active_bars)
+    var = _ratio(np.where(active, (returns - mean) ** 2, 0).sum(axis=0), active_bars)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cagr = np.where(active_bars > 0, final ** (periods_per_year / active_bars) - 1, 0.0)
+        sharpe = np.where(var > 0, mean / np.sqrt(var) * np.sqrt(periods_per_year), 0.0)
+    peak = np.maximum.accumulate(np.maximum(equity, 1), axis=0)
+    return {
+        "total_return": final - 1,
+        "cagr": cagr,
+        "volatility": np.sqrt(var * periods_per_year),
+        "sharpe": sharpe,
+        "max_drawdown": (equity / peak - 1).min(axis=0),
+    }
+
+
+def _trade_metrics(
+    held: np.ndarray,
+    previous: np.ndarray,
+    gap: np.ndarray,
+    intrabar: np.ndarray,
+    exit_cost: np.ndarray,
+    entry_cost: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Number of trades and share of winning ones. A trade is a run of one non-zero position;
+    a flip closes one trade and opens the next.
+    """
+    n = held.shape[1]
+    trade_id = np.cumsum((held != 0) & (held != previous), axis=0)
+    trades = trade_id[-1] if len(trade_id) else np.zeros(n, dtype=np.int64)
+    # trade k of symbol j is entry offsets[j] + k of the flat trade list
+    offsets = np.r_[0, np.cumsum(trades)][:-1] - 1
+    previous_id = np.zeros_like(trade_id)
+    previous_id[1:] = trade_id[:-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # a bar's gap and exit belong to the trade held before its open, the rest to the new
+        old_part = np.log1p(previous * gap) + np.log1p(-exit_cost)
+        new_part = np.log1p(held * intrabar) + np.log1p(-entry_cost)
+    total = int(trades.sum())
+    in_old, in_new = previous != 0, held != 0
+    trade_log = np.bincount(
+        (offsets + previous_id)[in_old], weights=old_part[in_old], minlength=total
+    ) + np.bincount((offsets + trade_id)[in_new], weights=new_part[in_new], minlength=total)
+    wins = np.bincount(
+        np.repeat(np.arange(n), trades), weights=(trade_log > 0).astype(np.float64), minlength=n
+    )
+    return {"trades": trades, "win_rate": _ratio(wins, trades)}
+
+
+def panel_signals(
+    strategy: BaseStrategy, frames: Mapping[str, pd.DataFrame], panel: PricePanel
+) -> np.ndarray:
+    """(bars, symbols) signals of ``strategy`` on the panel grid."""
+    if strategy.supports_panel:
+        return np.asarray(strategy.generate_signals_panel(panel), dtype=np.float64)
+    step = interval_to_ms(panel.interval)
+    signals = np.zeros(panel.shape)
+    for j, symbol in enumerate(panel.symbols):
+        data = strategy.generate_signals(frames[symbol])
+        rows = (data["open_time"].to_numpy(dtype=np.int64) - panel.open_time[0]) // step
+        signals[rows, j] = data["signal"].to_numpy(dtype=np.float64)
+    return signals
+
+
+class BacktestAccumulator:
+    """
+    Combines simulated symbol blocks into one ``BacktestResult`` on the grid ``open_time``.
+    Blocks may cover part of the grid; series are kept only for blocks covering all of it.
+    """
+
+    def __init__(self, interval: str, open_time: np.ndarray, keep_series: bool = False):
+        self.interval = interval
+        self.open_time = open_time
+        self.keep_series = keep_series
+        self.symbols: List[str] = []
+        self.metrics: List[pd.DataFrame] = []
+        self.return_sum = np.zeros(len(open_time))
+        self.active_count = np.zeros(len(open_time))
+        self.returns: List[np.ndarray] = []
+        self.positions: List[np.ndarray] = []
+
+    def add(self, symbols: List[str], block: Dict[str, np.ndarray], offset: int = 0) -> None:
+        """
+        :param block: ``simulate`` output
+        :param offset: Grid row of the block's first bar
+        """
+        self.add_metrics(pd.DataFrame({m: block[m] for m in METRICS}, index=symbols))
+        self.add_portfolio(
+            np.where(block["active"], block["returns"], 0).sum(axis=1),
+            block["active"].sum(axis=1),
+            offset,
+        )
+        if self.keep_series:
+            self.returns.append(block["returns"])
+            self.positions.append(block["positions"])
+
+    def add_metrics(self, metrics: pd.DataFrame) -> None:
+        self.symbols += list(metrics.index)
+        self.metrics.append(metrics)
+
+    def add_portfolio(
+        self, return_sum: np.ndarray, active_count: np.ndarray, offset: int = 0
+    ) -> None:
+        self.return_sum[offset : offset + len(return_sum)] += return_sum
+        self.active_count[offset : offset + len(active_count)] += active_count
+
+    def result(self) -> BacktestResult:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            portfolio = np.where(self.active_count > 0, self.return_sum / self.active_count, 0)
+        metrics = pd.concat(self.metrics) if self.metrics else pd.DataFrame(columns=METRICS)
+        return BacktestResult(
+            self.interval,
+            self.symbols,
+            self.open_time,
+            metrics,
+            np.cumprod(1 + portfolio),
+            np.hstack(self.returns) if self.returns else None,
+            np.hstack(self.positions) if self.positions else None,
+        )
+
+
+def backtest_panel(
+    strategy: BaseStrategy,
+    frames: Mapping[str, pd.DataFrame],
+    panel: PricePanel,
+    config: BacktestConfig,
+    accumulator: BacktestAccumulator,
+) -> None:
+    """Simulate ``strategy`` on every symbol of ``panel``, ``block_size`` symbols at a time."""
+    if not panel.symbols:
+        return
+    signals = panel_signals(strategy, frames, panel)
+    step = interval_to_ms(panel.interval)
+    offset = int(panel.open_time[0] - accumulator.open_time[0]) // step
+    periods_per_year = YEAR_MS / step
+    for start in range(0, len(panel.symbols), config.block_size):
+        columns = slice(start, start + config.block_size)
+        block = simulate(
+            panel.fields["open"][:, columns],
+            panel.close[:, columns],
+            signals[:, columns],
+            config,
+            periods_per_year,
+        )
+        accumulator.add(panel.symbols[columns], block, offset)
+
+
+def run_backtest(
+    strategy: BaseStrategy,
+    frames: Mapping[str, pd.DataFrame],
+    interval: str,
+    config: Optional[BacktestConfig] = None,
+    keep_series: bool = True,
+) -> BacktestResult:
+    """
+    Backtest a strategy over the full history of many symbols.
+
+    :param frames: Symbol -> klines with epoch-ms ``open_time``, ``open`` and ``close``
+        and whatever the strategy needs
+    :param config: Costs and fills, or None for the ``BacktestConfig`` defaults
+    :param keep_series: Keep per-symbol returns and positions in the result
+    """
+    config = config or BacktestConfig()
+    panel = PricePanel.from_frames(frames, interval, columns=("open", "close"))
+    accumulator = BacktestAccumulator(interval, panel.open_time, keep_series)
+    backtest_panel(strategy, frames, panel, config, accumulator)
+    logger.info(
+        f"Backtested {strategy.name} on {len(panel.symbols)} symbols x {len(panel.open_time)} "
+        f"{interval} bars"
+    )
+    return accumulator.result()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..storage import StorageFactory
+from ..storage.base import BaseStorage
+from ..strategies import load_strategies
+from ..strategies.base import BaseStrategy
+from ..strategies.panel import PricePanel
+from ..utils.logger import get_logger, setup_logging
+from ..utils.timeframes import interval_to_ms
+from .engine import BacktestAccumulator, BacktestConfig, BacktestResult, backtest_panel
+
+logger = get_logger(__name__)
+
+# chunks per worker: enough to balance symbols of uneven history, few enough to amortize IPC
+CHUNKS_PER_WORKER = 4
+
+
+def backtest_columns(strategy: BaseStrategy) -> Optional[List[str]]:
+    """Columns a backtest loads: fill prices and the strategy's, or None for all."""
+    if strategy.required_columns is None:
+        return None
+    columns = ["open_time", "close_time", "open", "close"]
+    return columns + [c for c in strategy.required_columns if c not in columns]
+
+
+def common_grid(storage: BaseStorage, symbols: Sequence[str], interval: str) -> np.ndarray:
+    """Open times from the first to the last stored bar of any of ``symbols``."""
+    bounds = []
+    for symbol in symbols:
+        entry = storage.series_entry(symbol, interval)
+        if entry is not None:
+            bounds.append((entry.first_ms, entry.last_ms))
+        elif storage.exists(symbol, interval):
+            open_time = storage.read(symbol, interval, columns=["open_time"])["open_time"]
+            if len(open_time):
+                bounds.append((int(open_time.iloc[0]), int(open_time.iloc[-1])))
+    if not bounds:
+        return np.empty(0, dtype=np.int64)
+    start = min(first for first, _ in bounds)
+    end = max(last for _, last in bounds)
+    return np.arange(start, end + 1, interval_to_ms(interval), dtype=np.int64)
+
+
+def _backtest_chunk(
+    strategy_name: str,
+    strategy_params: Dict[str, Any],
+    backend: str,
+    data_path: str,
+    interval: str,
+    symbols: Sequence[str],
+    open_time: np.ndarray,
+    config: BacktestConfig,
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Worker: backtest ``symbols`` read from storage, returning metrics and portfolio sums."""
+    strategy = load_strategies({strategy_name: strategy_params})[strategy_name]
+    # the parent owns the catalog; workers only read bars
+    storage = StorageFactory.create_storage(backend, data_path, catalog=False)
+    columns = backtest_columns(strategy)
+    frames = {symbol: storage.read(symbol, interval, columns=columns) for symbol in symbols}
+    for symbol, data in frames.items():
+        data.attrs.update(symbol=symbol, interval=interval)
+    panel = PricePanel.from_frames(frames, interval, columns=("open", "close"))
+    accumulator = BacktestAccumulator(interval, open_time)
+    backtest_panel(strategy, frames, panel, config, accumulator)
+    metrics = accumulator.result().metrics
+    return metrics, accumulator.return_sum, accumulator.active_count
+
+
+def run_backtest_parallel(
+    strategy_name: str,
+    strategy_params: Dict[str, Any],
+    backend: str,
+    data_path: str,
+    interval: str,
+    symbols: Optional[Sequence[str]] = None,
+    config: Optional[BacktestConfig] = None,
+    workers: Optional[int] = None,
+) -> BacktestResult:
+    """
+    Backtest stored series in worker processes, each reading and simulating a chunk of
+    symbols. Only per-symbol metrics and the chunk's portfolio sums come back, so results
+    match ``run_backtest`` with ``keep_series=False``.
+
+    :param strategy_params: Constructor parameters of the strategy
+    :param symbols: Symbols to backtest, or None for every stored series of ``interval``
+    :param config: Costs and fills, or None for the ``BacktestConfig`` defaults
+    """
+    config = config or BacktestConfig()
+    storage = StorageFactory.create_storage(backend, data_path)
+    if symbols is None:
+        symbols = sorted(s for s, i in storage.list_series() if i == interval)
+    symbols = list(symbols)
+    open_time = common_grid(storage, symbols, interval)
+    accumulator = BacktestAccumulator(interval, open_time)
+    workers = workers or os.cpu_count() or 1
+    size = max(math.ceil(len(symbols) / (CHUNKS_PER_WORKER * workers)), 1)
+    logger.info(
+        f"Backtesting {strategy_name} on {len(symbols)} {interval} series "
+        f"with {workers} workers"
+    )
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = [
+            executor.submit(
+                _backtest_chunk,
+                strategy_name,
+                strategy_params,
+                backend,
+                data_path,
+                interval,
+                symbols[i : i + size],
+                open_time,
+                config,
+            )
+            for i in range(0, len(symbols), size)
+        ]
+        for future in futures:
+            metrics, return_sum, active_count = future.result()
+            accumulator.add_metrics(metrics)
+            accumulator.add_portfolio(return_sum, active_count)
+    return accumulator.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a strategy on stored klines")
+    parser.add_argument("--strategy", required=True, help="Strategy name, e.g. Momentum")
+    parser.add_argument("--params", default="{}", help="Strategy parameters as JSON")
+    parser.add_argument("--data-path", required=True, help="Collector data_path")
+    parser.add_argument("--backend", default="npy", choices=sorted(StorageFactory.BACKENDS))
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--symbols", nargs="*", help="Only backtest these symbols")
+    parser.add_argument("--fee-bps", type=float, default=10.0)
+    parser.add_argument("--slippage-bps", type=float, default=5.0)
+    parser.add_argument("--fill", default="next_open", choices=["next_open", "close"])
+    parser.add_argument("--allow-short", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="Backtest processes")
+    parser.add_argument("--output", help="Write per-symbol metrics to this CSV file")
+    args = parser.parse_args()
+
+    setup_logging(log_level=logging.INFO)
+    config = BacktestConfig(args.fee_bps, args.slippage_bps, args.fill, args.allow_short)
+    result = run_backtest_parallel(
+        args.strategy,
+        json.loads(args.params),
+        args.backend,
+        args.data_path,
+        args.interval,
+        args.symbols,
+        config,
+        args.workers,
+    )
+    for name, value in result.summary().items():
+        logger.info(f"Portfolio {name}: {value:.4f}")
+    if args.output:
+        result.metrics.to_csv(args.output, index_label="symbol")
+
+
+if __name__ == "__main__":
+    main()
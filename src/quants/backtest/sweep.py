@@ -0,0 +1,345 @@
+import argparse
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from hashlib import md5
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+import pandas as pd
+
+from ..db.sweep_results import SweepResultStore
+from ..storage import StorageFactory
+from ..storage.base import BaseStorage
+from ..strategies import load_strategies
+from ..strategies.base import BaseStrategy
+from ..strategies.panel import PricePanel
+from ..utils.logger import get_logger, setup_logging
+from .engine import BacktestAccumulator, BacktestConfig, backtest_panel
+
+logger = get_logger(__name__)
+
+ParamSpace = Dict[str, Sequence[Any]]
+
+
+def grid_points(space: ParamSpace) -> List[Dict[str, Any]]:
+    """Every combination of the values in ``space``, in a fixed order."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_points(space: ParamSpace, samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    ``samples`` distinct grid points in random order. For one seed, a larger sample starts
+    with the points of a smaller one, so extending a sample reuses its cached results.
+    """
+    sizes = [len(values) for values in space.values()]
+    total = math.prod(sizes)
+    order = np.random.default_rng(seed).permutation(total)[:samples]
+    names = list(space)
+    return [
+        {name: space[name][int(i)] for name, i in zip(names, np.unravel_index(flat, sizes))}
+        for flat in order
+    ]
+
+
+def sweep_columns(strategy: BaseStrategy) -> List[str]:
+    """Price columns a sweep of ``strategy`` needs on its panel."""
+    required = strategy.required_columns or ["open", "high", "low", "close", "volume"]
+    columns = ["open", "close"]
+    return columns + [c for c in required if c not in columns + ["open_time", "close_time"]]
+
+
+@dataclass(frozen=True)
+class SweepData:
+    """
+    A ``PricePanel`` saved as ``.npy`` files under ``path``, which every worker maps
+    read-only instead of loading its own copy.
+
+    :param data_hash: Identifies the bars in the panel
+    """
+
+    path: str
+    data_hash: str
+
+    @classmethod
+    def from_storage(
+        cls,
+        storage: BaseStorage,
+        symbols: Sequence[str],
+        interval: str,
+        columns: Sequence[str],
+        root: str,
+    ) -> "SweepData":
+        """
+        Save the stored bars of ``symbols`` under ``root``, unless a panel of the same bars
+        is already there.
+        """
+        digest = md5(f"{interval}|{','.join(columns)}".encode())
+        entries = [storage.series_entry(symbol, interval) for symbol in symbols]
+        frames = None
+        if all(entry is not None for entry in entries):
+            for entry in entries:
+                digest.update(f"|{entry.symbol}:{entry.content_hash}".encode())
+        else:
+            # no catalog: hash the bars themselves
+            frames = cls._read(storage, symbols, interval, columns)
+            for symbol, data in frames.items():
+                digest.update(symbol.encode())
+                digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy())
+        data_hash = digest.hexdigest()
+
+        path = os.path.join(root, data_hash)
+        if not os.path.exists(path):
+            if frames is None:
+                frames = cls._read(storage, symbols, interval, columns)
+            cls._save(PricePanel.from_frames(frames, interval, columns=columns), path)
+        return cls(path, data_hash)
+
+    @staticmethod
+    def _read(
+        storage: BaseStorage, symbols: Sequence[str], interval: str, columns: Sequence[str]
+    ) -> Dict[str, pd.DataFrame]:
+        return {symbol: storage.read(symbol, interval, columns=columns) for symbol in symbols}
+
+    @staticmethod
+    def _save(panel: PricePanel, path: str) -> None:
+        staging = f"{path}.tmp{os.getpid()}"
+        os.makedirs(staging, exist_ok=True)
+        np.save(os.path.join(staging, "open_time.npy"), panel.open_time)
+        np.save(os.path.join(staging, "close_time.npy"), panel.close_time)
+        for col, values in panel.fields.items():
+            np.save(os.path.join(staging, f"{col}.npy"), values)
+        with open(os.path.join(staging, "panel.json"), "w") as f:
+            json.dump({"interval": panel.interval, "symbols": panel.symbols}, f)
+        try:
+            os.rename(staging, path)
+        except OSError:
+            # saved concurrently by another sweep
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def load(self) -> PricePanel:
+        with open(os.path.join(self.path, "panel.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name[: -len(".npy")]: np.load(os.path.join(self.path, name), mmap_mode="r")
+            for name in os.listdir(self.path)
+            if name.endswith(".npy")
+        }
+        open_time, close_time = arrays.pop("open_time"), arrays.pop("close_time")
+        return PricePanel(meta["interval"], meta["symbols"], open_time, close_time, arrays)
+
+    @property
+    def bars(self) -> int:
+        return len(np.load(os.path.join(self.path, "open_time.npy"), mmap_mode="r"))
+
+
+_panels: Dict[str, PricePanel] = {}
+_strategy_classes: Dict[str, Type[BaseStrategy]] = {}
+
+
+def _evaluate(
+    strategy_name: str, params: Dict[str, Any], data: SweepData, bars: int, config: BacktestConfig
+) -> Dict[str, float]:
+    """Worker: backtest one parameter point on the last ``bars`` bars of the panel."""
+    if data.path not in _panels:
+        _panels[data.path] = data.load()
+    if strategy_name not in _strategy_classes:
+        _strategy_classes[strategy_name] = type(
+            load_strategies({strategy_name: {}})[strategy_name]
+        )
+    strategy = _strategy_classes[strategy_name](**params)
+    panel = _panels[data.path].tail(bars)
+    frames = None if strategy.supports_panel else panel.frames()
+    accumulator = BacktestAccumulator(panel.interval, panel.open_time)
+    backtest_panel(strategy, frames, panel, config, accumulator)
+    result = accumulator.result()
+    return {**result.summary(), "trades": int(result.metrics["trades"].sum())}
+
+
+class ParameterSweep:
+    """
+    Backtests a strategy over many parameter points in worker processes, on one
+    memory-mapped panel, ranking points by the portfolio ``objective`` (higher is better).
+    Results are cached in a ``SweepResultStore``; cached points are not backtested again.
+    """
+
+    def __init__(
+        self,
+        strategy_name: str,
+        data: SweepData,
+        config: Optional[BacktestConfig] = None,
+        objective: str = "sharpe",
+        base_params: Optional[Dict[str, Any]] = None,
+        results: Optional[SweepResultStore] = None,
+        workers: Optional[int] = None,
+    ):
+        """
+        :param config: Costs and fills, or None for the ``BacktestConfig`` defaults
+        :param base_params: Parameters shared by every point, overridden by the point's
+        :param results: Cache of evaluated points, or None to keep none
+        """
+        self.strategy_name = strategy_name
+        self.data = data
+        self.config = config or BacktestConfig()
+        self.objective = objective
+        self.base_params = base_params or {}
+        self.results = results
+        self.bars = data.bars
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def settings(self, bars: int) -> Dict[str, Any]:
+        settings = {k: v for k, v in asdict(self.config).items() if k != "block_size"}
+        return {**settings, "bars": bars}
+
+    def evaluate(
+        self, points: Sequence[Dict[str, Any]], bars: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Metrics of each point on the last ``bars`` bars (all by default), best first.
+
+        :return: One row per point: its parameters, then the portfolio metrics
+        """
+        bars = min(bars or self.bars, self.bars)
+        settings = self.settings(bars)
+        params = [{**self.base_params, **point} for point in points]
+        metrics: List[Optional[Dict[str, float]]] = [
+            (
+                self.results.get(self.strategy_name, p, self.data.data_hash, settings)
+                if self.results is not None
+                else None
+            )
+            for p in params
+        ]
+        pending = [i for i, m in enumerate(metrics) if m is None]
+        logger.info(
+            f"Sweeping {self.strategy_name} over {len(points)} points on {bars} bars, "
+            f"{len(points) - len(pending)} cached"
+        )
+        futures = {
+            i: self.executor.submit(
+                _evaluate, self.strategy_name, params[i], self.data, bars, self.config
+            )
+            for i in pending
+        }
+        for i, future in futures.items():
+            metrics[i] = future.result()
+            if self.results is not None:
+                self.results.put(
+                    self.strategy_name, params[i], self.data.data_hash, settings, metrics[i]
+                )
+
+        table = pd.concat([pd.DataFrame(list(points)), pd.DataFrame(metrics)], axis=1).assign(
+            bars=bars
+        )
+        return table.sort_values(self.objective, ascending=False, na_position="last")
+
+    def grid(self, space: ParamSpace) -> pd.DataFrame:
+        return self.evaluate(grid_points(space))
+
+    def random(self, space: ParamSpace, samples: int, seed: int = 0) -> pd.DataFrame:
+        return self.evaluate(random_points(space, samples, seed))
+
+    def successive_halving(
+        self,
+        space: ParamSpace,
+        samples: Optional[int] = None,
+        eta: int = 3,
+        min_bars: int = 500,
+        seed: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Evaluate every point on a short recent window, keep the best ``1 / eta``, and
+        repeat on an ``eta`` times longer window until the survivors run on all bars.
+
+        :param samples: Random points to start from, or None for the whole grid
+        :return: The rows of every round, the final round first
+        """
+        points = grid_points(space) if samples is None else random_points(space, samples, seed)
+        rounds = int(math.log(len(points), eta)) if len(points) > 1 else 0
+        tables = []
+        for i in range(rounds + 1):
+            bars = max(self.bars // eta ** (rounds - i), min(min_bars, self.bars))
+            table = self.evaluate(points, bars)
+            tables.append(table)
+            keep = max(math.ceil(len(points) / eta), 1)
+            # rows keep their point's position as index
+            points = [points[j] for j in table.index[:keep]]
+        return pd.concat(tables[::-1], ignore_index=True)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep strategy parameters over stored klines")
+    parser.add_argument("--strategy", required=True, help="Strategy name, e.g. Momentum")
+    parser.add_argument(
+        "--space", required=True, help='Parameter values as JSON, e.g. {"period": [5, 10, 20]}'
+    )
+    parser.add_argument("--params", default="{}", help="Fixed strategy parameters as JSON")
+    parser.add_argument("--method", default="grid", choices=["grid", "random", "halving"])
+    parser.add_argument("--samples", type=int, default=None, help="Random points to try")
+    parser.add_argument("--eta", type=int, default=3, help="Successive-halving reduction")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--objective", default="sharpe")
+    parser.add_argument("--data-path", required=True, help="Collector data_path")
+    parser.add_argument("--backend", default="npy", choices=sorted(StorageFactory.BACKENDS))
+    parser.add_argument("--interval", default="1h")
+    parser.add_argument("--symbols", nargs="*", help="Only backtest these symbols")
+    parser.add_argument("--fee-bps", type=float, default=10.0)
+    parser.add_argument("--slippage-bps", type=float, default=5.0)
+    parser.add_argument("--fill", default="next_open", choices=["next_open", "close"])
+    parser.add_argument("--allow-short", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="Backtest processes")
+    parser.add_argument("--top", type=int, default=10, help="Points to print")
+    parser.add_argument("--output", help="Write all evaluated points to this CSV file")
+    args = parser.parse_args()
+
+    setup_logging(log_level=logging.INFO)
+    space = json.loads(args.space)
+    base_params = json.loads(args.params)
+    storage = StorageFactory.create_storage(args.backend, args.data_path)
+    symbols = args.symbols or sorted(s for s, i in storage.list_series() if i == args.interval)
+    strategy = load_strategies({args.strategy: base_params})[args.strategy]
+    data = SweepData.from_storage(
+        storage,
+        symbols,
+        args.interval,
+        sweep_columns(strategy),
+        os.path.join(args.data_path, "sweeps"),
+    )
+    sweep = ParameterSweep(
+        args.strategy,
+        data,
+        BacktestConfig(args.fee_bps, args.slippage_bps, args.fill, args.allow_short),
+        args.objective,
+        base_params,
+        SweepResultStore(os.path.join(args.data_path, "sweep_results.db")),
+        args.workers,
+    )
+    try:
+        if args.method == "grid":
+            table = sweep.grid(space)
+        elif args.method == "random":
+            table = sweep.random(space, args.samples or 20, args.seed)
+        else:
+            table = sweep.successive_halving(space, args.samples, args.eta, seed=args.seed)
+    finally:
+        sweep.close()
+    logger.info(f"Top points by {args.objective}:\n{table.head(args.top).to_string(index=False)}")
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import yaml
 
@@ -41,6 +41,18 @@ class CEXConfig:
     platform: str
     kline_intervals: List[str]
     timezone: str
+    refresh_workers: int = 8
+    request_weight_limit: int = 6000
+    ingestion: str = "poll"
+    stream_url: str = "wss://stream.binance.com:9443"
+    metadata_ttl_seconds: int = 300
+    metadata_snapshot_path: Optional[str] = None
+    market_snapshot_max_age_seconds: int = 60
+    base_interval: Optional[str] = None
+    resample_timezone: str = "UTC"
+    strategy_execution: str = "symbol"
+    indicator_cache_entries: int = 4096
+    strategy_workers: Optional[int] = None
 
 
 @dataclass
@@ -59,6 +71,11 @@ class AnalysisConfig:
 class DataStorageConfig:
     data_path: str
     enabled: bool
+    backend: str = "csv"
+    compaction_interval: int = 100
+    ring_buffer_bars: int = 0
+    ring_buffer_replace: bool = False
+    features_enabled: bool = False
 
 
 @dataclass
@@ -1,14 +1,31 @@
 from .binance_collector import BinanceDataCollector
 from .coingecko_collector import CoinGeckoDataCollector
-from .coinmarketcap_collector import CoinMarketCapDataCollector
+from .cmc_collector import CoinMarketCapDataCollector
+from .alignment import AsofAligner, SourceSeries
+from .identity import SOURCES, AssetIdentity, AssetIdentityIndex
+from .snapshot import MarketSnapshot, SnapshotCache
 
 from ..config import AppConfig
-
-__all__ = ["BinanceDataCollector"]
-
-
+from ..utils.timeframes import interval_to_ms, to_epoch_ms, to_epoch_ms_array
+
+__all__ = [
+    "AssetIdentity",
+    "AssetIdentityIndex",
+    "AsofAligner",
+    "BinanceDataCollector",
+    "CoinGeckoDataCollector",
+    "CoinMarketCapDataCollector",
+    "MarketSnapshot",
+    "SnapshotCache",
+    "SourceSeries",
+    "UnifiedDataCollector",
+]
+
+
+import os
 import pandas as pd
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import pytz
 import logging
@@ -16,60 +33,151 @@ import logging
 logger = logging.getLogger(__name__)
 
 class UnifiedDataCollector:
+    # weight of each source in unified_price; sources missing from a bar are left out
+    SOURCE_WEIGHTS = {"binance": 1.0, "coingecko": 1.0, "cmc": 1.0}
+
     def __init__(self, binance_collector: BinanceDataCollector, 
                  coingecko_collector: CoinGeckoDataCollector, 
                  coinmarketcap_collector: CoinMarketCapDataCollector,
-                 config: AppConfig):
+                 config: AppConfig,
+                 source_weights: Optional[Dict[str, float]] = None,
+                 tolerance_bars: float = 1.0):
         self.binance_collector = binance_collector
         self.coingecko_collector = coingecko_collector
         self.coinmarketcap_collector = coinmarketcap_collector
         self.config = config
         self.local_tz = pytz.timezone(config.cex.timezone)
+        self.source_weights = {**self.SOURCE_WEIGHTS, **(source_weights or {})}
+        self.tolerance_bars = tolerance_bars
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="unified")
+        self.identity_index = AssetIdentityIndex(
+            os.path.join(config.data_storage.data_path, "asset_index.json"))
 
     def collect_price_data(self, symbol: str, interval: str, 
                            start_time: datetime, end_time: datetime) -> pd.DataFrame:
-        # Collect data from all sources
-        binance_data = self.binance_collector.collect_historical_data(
-            symbol, interval, start_time, end_time)
-        coingecko_data = self.coingecko_collector.collect_historical_data(
-            symbol, 'usd', (end_time - start_time).days)
-        cmc_data = self.coinmarketcap_collector.collect_historical_data(
-            symbol, start_time, end_time)
-
-        # Merge dataframes
-        merged_data = self._merge_price_data(binance_data, coingecko_data, cmc_data)
-        
-        return merged_data
+        # Only the sources that list the asset are queried, concurrently; a failing
+        # source only drops its column
+        identity = self._resolve(symbol)
+        if identity is None:
+            logger.warning(f"{symbol} is not listed by any source")
+            return pd.DataFrame()
+
+        ids = identity.ids
+        fetches = {}
+        if "binance" in ids:
+            fetches["binance"] = lambda: self.binance_collector.collect_historical_data(
+                ids["binance"], interval, start_time, end_time)
+        if "coingecko" in ids:
+            fetches["coingecko"] = lambda: self.coingecko_collector.collect_historical_data(
+                ids["coingecko"], 'usd', (end_time - start_time).days)
+        if "cmc" in ids:
+            fetches["cmc"] = lambda: self.coinmarketcap_collector.collect_historical_data(
+                ids["cmc"], start_time, end_time)
+        frames = self._fan_out(symbol, fetches, default=pd.DataFrame)
+
+        return self._merge_price_data(
+            frames.get("binance", pd.DataFrame()),
+            frames.get("coingecko", pd.DataFrame()),
+            frames.get("cmc", pd.DataFrame()),
+            interval, start_time, end_time)
+
+    def _fan_out(
+        self, name: str, fetches: Dict[str, Callable[[], Any]], default: Callable[[], Any]
+    ) -> Dict[str, Any]:
+        futures = {source: self._executor.submit(fetch) for source, fetch in fetches.items()}
+        results = {}
+        for source, future in futures.items():
+            try:
+                results[source] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to collect {source} data for {name}: {e}")
+                results[source] = default()
+        return results
+
+    def _resolve(self, symbol: str) -> Optional[AssetIdentity]:
+        if not self.identity_index.assets:
+            self.refresh_identity_index()
+        return self.identity_index.resolve(symbol)
+
+    def refresh_identity_index(self) -> None:
+        """Rebuild the asset index from each source's listing, keeping sources that fail."""
+        listings = self._fan_out(
+            "asset index",
+            {
+                "binance": self._binance_listing,
+                "coingecko": self.coingecko_collector.get_coin_listing,
+                "cmc": self.coinmarketcap_collector.get_all_cryptocurrencies,
+            },
+            default=list,
+        )
+        if listings["binance"]:
+            self.identity_index.update_binance(listings["binance"])
+        if listings["coingecko"]:
+            self.identity_index.update_coingecko(listings["coingecko"])
+        if listings["cmc"]:
+            self.identity_index.update_cmc(listings["cmc"])
+        self.identity_index.save()
+
+    def _binance_listing(self) -> List[Tuple[str, str]]:
+        metadata = self.binance_collector.platform.get_metadata()
+        return [(pair, metadata.get(pair).base_asset) for pair in metadata.trading_pairs("USDT")]
 
     def _merge_price_data(self, binance_df: pd.DataFrame, 
                           coingecko_df: pd.DataFrame, 
-                          cmc_df: pd.DataFrame) -> pd.DataFrame:
-        # Ensure all dataframes have a common timestamp column
-        binance_df = binance_df.rename(columns={'open_time': 'timestamp'})
-        coingecko_df = coingecko_df.rename(columns={'timestamp': 'timestamp'})
-        cmc_df = cmc_df.rename(columns={'timestamp': 'timestamp'})
-
-        # Merge dataframes
-        merged_df = pd.merge(binance_df, coingecko_df, on='timestamp', how='outer', suffixes=('_binance', '_coingecko'))
-        merged_df = pd.merge(merged_df, cmc_df, on='timestamp', how='outer', suffixes=('', '_cmc'))
-
-        # Fill missing values with the average of available values
-        price_columns = ['close_binance', 'price_coingecko', 'close_cmc']
-        merged_df['unified_price'] = merged_df[price_columns].mean(axis=1)
-
-        return merged_df.sort_values('timestamp')
+                          cmc_df: pd.DataFrame,
+                          interval: str,
+                          start_time: Optional[datetime] = None,
+                          end_time: Optional[datetime] = None) -> pd.DataFrame:
+        # Sample every source as-of each bar close on a shared grid of bar open times;
+        # Binance closes are observed at close_time, the aggregators at their timestamps
+        w = self.source_weights
+        sources = [
+            SourceSeries.from_frame(
+                "close_binance", binance_df, "close_time", "close", w["binance"]),
+            SourceSeries.from_frame(
+                "price_coingecko", coingecko_df, "timestamp", "price", w["coingecko"]),
+            SourceSeries.from_frame("close_cmc", cmc_df, "timestamp", "close", w["cmc"]),
+        ]
+        step_ms = interval_to_ms(interval)
+        aligner = AsofAligner(step_ms, tolerance_ms=int(step_ms * self.tolerance_bars))
+        aligned = aligner.align(
+            sources,
+            start_ms=self._to_epoch_ms(start_time) if start_time is not None else None,
+            end_ms=self._to_epoch_ms(end_time) if end_time is not None else None,
+        )
+
+        return pd.DataFrame(aligned)
+
+    def _to_epoch_ms(self, time: datetime) -> int:
+        # naive datetimes are local, as in the per-source collectors
+        if time.tzinfo is None:
+            time = self.local_tz.localize(time)
+        return to_epoch_ms(time)
 
     def collect_market_cap_data(self, symbols: List[str]) -> Dict[str, float]:
-        binance_market_cap = self.binance_collector.collect_market_cap_data(symbols)
-        coingecko_market_cap = self.coingecko_collector.collect_market_cap_data(symbols)
-        cmc_market_cap = self.coinmarketcap_collector.collect_market_cap_data(symbols)
+        identities = {symbol: self._resolve(symbol) for symbol in symbols}
+        ids = {
+            source: [i.ids[source] for i in identities.values() if i and source in i.ids]
+            for source in SOURCES
+        }
+        market_caps = self._fan_out(
+            "market caps",
+            {
+                "binance": lambda: self.binance_collector.collect_market_cap_data(ids["binance"]),
+                "coingecko": lambda: self.coingecko_collector.collect_market_cap_data(
+                    ids["coingecko"]),
+                "cmc": lambda: self.coinmarketcap_collector.collect_market_cap_data(ids["cmc"]),
+            },
+            default=dict,
+        )
 
         unified_market_cap = {}
-        for symbol in symbols:
+        for symbol, identity in identities.items():
+            if identity is None:
+                continue
             values = [
-                binance_market_cap.get(symbol),
-                coingecko_market_cap.get(symbol),
-                cmc_market_cap.get(symbol)
+                market_caps[source].get(source_id)
+                for source, source_id in identity.ids.items()
             ]
             valid_values = [v for v in values if v is not None]
             if valid_values:
@@ -77,19 +185,26 @@ class UnifiedDataCollector:
 
         return unified_market_cap
 
-    def update_data_for_all_symbols(self, interval: str, lookback_days: int = 90) -> None:
+    def update_data_for_all_symbols(
+        self, interval: str, lookback_days: int = 90, listed_on: Optional[str] = "binance"
+    ) -> None:
+        """
+        Refresh unified data for every indexed asset, querying each source only for the
+        assets it lists.
+
+        :param listed_on: Only refresh assets this source lists (by default the Binance
+            trading universe); None refreshes every indexed asset
+        """
         end_time = datetime.now(self.local_tz)
         start_time = end_time - timedelta(days=lookback_days)
 
-        # Get all symbols from each source
-        binance_symbols = set(self.binance_collector.get_all_usdt_pairs())
-        coingecko_symbols = set(coin['symbol'] for coin in self.coingecko_collector.get_all_coins())
-        cmc_symbols = set(crypto['symbol'] for crypto in self.coinmarketcap_collector.get_all_cryptocurrencies())
-
-        # Combine all symbols
-        all_symbols = binance_symbols.union(coingecko_symbols, cmc_symbols)
+        self.refresh_identity_index()
+        identities = self.identity_index.assets_listed_on(listed_on)
+        request_count = sum(len(identity.ids) for identity in identities)
+        logger.info(f"Updating {len(identities)} assets with {request_count} source requests")
 
-        for symbol in all_symbols:
+        for identity in identities:
+            symbol = identity.asset
             try:
                 data = self.collect_price_data(symbol, interval, start_time, end_time)
                 if not data.empty:
@@ -98,23 +213,28 @@ class UnifiedDataCollector:
             except Exception as e:
                 logger.error(f"Failed to update data for {symbol}: {e}")
 
+    def _unified_path(self, symbol: str, interval: str) -> str:
+        # canonical ids of secondary assets contain ':'
+        file_name = f"{symbol.replace(':', '_')}_{interval}_unified.csv"
+        return os.path.join(self.config.data_storage.data_path, file_name)
+
     def _save_unified_data(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
-        file_path = os.path.join(self.config.data_storage.data_path, f"{symbol}_{interval}_unified.csv")
+        file_path = self._unified_path(symbol, interval)
         data.to_csv(file_path, index=False)
         logger.info(f"Saved unified data for {symbol} to {file_path}")
 
     def load_unified_data(self, symbol: str, interval: str) -> pd.DataFrame:
-        file_path = os.path.join(self.config.data_storage.data_path, f"{symbol}_{interval}_unified.csv")
+        file_path = self._unified_path(symbol, interval)
         try:
-            df = pd.read_csv(file_path, parse_dates=['timestamp'])
+            df = pd.read_csv(file_path)
             logger.info(f"Loaded unified data for {symbol} from {file_path}")
+            # older files hold datetime text
+            df['timestamp'] = to_epoch_ms_array(df['timestamp'])
             return df
         except FileNotFoundError:
             logger.info(f"No unified data found for {symbol} at interval {interval}")
             return pd.DataFrame()
 
     def get_all_symbols(self) -> List[str]:
-        binance_symbols = set(self.binance_collector.get_all_usdt_pairs())
-        coingecko_symbols = set(coin['symbol'] for coin in self.coingecko_collector.get_all_coins())
-        cmc_symbols = set(crypto['symbol'] for crypto in self.coinmarketcap_collector.get_all_cryptocurrencies())
-        return list(binance_symbols.union(coingecko_symbols, cmc_symbols))
\ No newline at end of file
+        self.refresh_identity_index()
+        return [identity.asset for identity in self.identity_index.assets_listed_on()]
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.timeframes import to_epoch_ms_array
+
+
+@dataclass
+class SourceSeries:
+    """
+    Price observations from one source.
+
+    :param name: Output column for the source's aligned prices
+    :param times: Observation times as UTC epoch ms
+    :param prices: Observed prices
+    :param weight: Weight of the source in ``unified_price``
+    """
+
+    name: str
+    times: np.ndarray
+    prices: np.ndarray
+    weight: float = 1.0
+
+    @classmethod
+    def from_frame(
+        cls, name: str, df: pd.DataFrame, time_column: str, price_column: str, weight: float = 1.0
+    ) -> "SourceSeries":
+        if df.empty or time_column not in df or price_column not in df:
+            return cls(name, np.empty(0, np.int64), np.empty(0, np.float64), weight)
+        times = to_epoch_ms_array(df[time_column])
+        prices = df[price_column].to_numpy(dtype=np.float64)
+        if len(times) > 1 and np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind="stable")
+            times, prices = times[order], prices[order]
+        return cls(name, times, prices, weight)
+
+
+def bar_grid(start_ms: int, end_ms: int, step_ms: int) -> np.ndarray:
+    """Bar open times, aligned to multiples of ``step_ms``, covering [start_ms, end_ms]."""
+    first = start_ms - start_ms % step_ms
+    return np.arange(first, end_ms + 1, step_ms, dtype=np.int64)
+
+
+def asof(
+    sample_times: np.ndarray, times: np.ndarray, values: np.ndarray, tolerance_ms: int
+) -> np.ndarray:
+    """
+    Last value observed at or before each sample time, NaN when the latest observation is
+    more than ``tolerance_ms`` old. ``times`` must be sorted.
+    """
+    out = np.full(len(sample_times), np.nan)
+    if len(times) == 0:
+        return out
+    idx = np.searchsorted(times, sample_times, side="right") - 1
+    found = idx >= 0
+    idx = idx[found]
+    fresh = sample_times[found] - times[idx] <= tolerance_ms
+    out[np.flatnonzero(found)[fresh]] = values[idx[fresh]]
+    return out
+
+
+def weighted_mean(aligned: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Row-wise weighted mean over the sources that have a value.
+
+    :param aligned: (bars, sources) array with NaN where a source is missing
+    :param weights: (sources,) array of source weights
+    """
+    present = ~np.isnan(aligned)
+    w = present * weights
+    total = w.sum(axis=1)
+    weighted = np.where(present, aligned, 0.0) @ weights
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, weighted / total, np.nan)
+
+
+class AsofAligner:
+    """
+    Align price series from several sources onto one bar grid.
+
+    Every source is sampled as-of each bar's close (``open + step - 1``) and only counts if
+    its latest observation is within ``tolerance_ms`` of it, so sources that never share a
+    timestamp still line up bar by bar. The grid is processed ``chunk_size`` bars at a time
+    so intermediate arrays stay bounded regardless of history length.
+    """
+
+    def __init__(
+        self, step_ms: int, tolerance_ms: Optional[int] = None, chunk_size: int = 100_000
+    ):
+        self.step_ms = step_ms
+        self.tolerance_ms = step_ms if tolerance_ms is None else tolerance_ms
+        self.chunk_size = chunk_size
+
+    def align(
+        self,
+        sources: List[SourceSeries],
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        :return: ``timestamp`` (bar open, epoch ms), one price column per source, and
+            ``unified_price`` / ``source_count`` over the sources present in each bar
+        """
+        observed = [s for s in sources if len(s.times)]
+        if start_ms is None or end_ms is None:
+            if not observed:
+                return self._empty(sources)
+            start_ms = min(s.times[0] for s in observed) if start_ms is None else start_ms
+            end_ms = max(s.times[-1] for s in observed) if end_ms is None else end_ms
+
+        grid = bar_grid(start_ms, end_ms, self.step_ms)
+        weights = np.array([s.weight for s in sources], dtype=np.float64)
+        aligned = np.full((len(grid), len(sources)), np.nan)
+        unified = np.full(len(grid), np.nan)
+        counts = np.zeros(len(grid), dtype=np.int64)
+        for lo in range(0, len(grid), self.chunk_size):
+            hi = min(lo + self.chunk_size, len(grid))
+            closes = grid[lo:hi] + (self.step_ms - 1)
+            for j, source in enumerate(sources):
+                aligned[lo:hi, j] = asof(closes, source.times, source.prices, self.tolerance_ms)
+            unified[lo:hi] = weighted_mean(aligned[lo:hi], weights)
+            counts[lo:hi] = (~np.isnan(aligned[lo:hi])).sum(axis=1)
+
+        result = {"timestamp": grid}
+        for j, source in enumerate(sources):
+            result[source.name] = aligned[:, j]
+        result["unified_price"] = unified
+        result["source_count"] = counts
+        return result
+
+    @staticmethod
+    def _empty(sources: List[SourceSeries]) -> Dict[str, np.ndarray]:
+        result = {"timestamp": np.empty(0, np.int64)}
+        for source in sources:
+            result[source.name] = np.empty(0, np.float64)
+        result["unified_price"] = np.empty(0, np.float64)
+        result["source_count"] = np.empty(0, np.int64)
+        return result
@@ -1,25 +1,94 @@
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 import pytz
 
 from ..config.base import AppConfig
+from ..db.catalog import SeriesEntry
+from ..db.watermarks import WatermarkStore
+from ..events import BarsClosed, EventBus
 from ..platform.binance import BinancePlatform
+from ..platform.binance_stream import BinanceKlineStream
+from ..storage import SharedBarCache, StorageFactory
 from ..utils.logger import get_logger
+from ..utils.timeframes import interval_to_ms
 from .base import BaseDataCollector
+from .resampling import Resampler
+from .snapshot import MarketSnapshot, SnapshotCache
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class RefreshReport:
+    interval: str
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
 class BinanceDataCollector(BaseDataCollector):
-    def __init__(self, platform: BinancePlatform, config: AppConfig):
+    # snapshot column -> 24h ticker field
+    TICKER_FIELDS = {
+        "last_price": "lastPrice",
+        "volume": "volume",
+        "quote_volume": "quoteVolume",
+        "price_change_percent": "priceChangePercent",
+        "high": "highPrice",
+        "low": "lowPrice",
+    }
+
+    def __init__(
+        self, platform: BinancePlatform, config: AppConfig, events: Optional[EventBus] = None
+    ):
+        """
+        :param events: Bus that gets a ``BarsClosed`` event whenever new closed bars are stored
+        """
         self.platform = platform
-        self.data_dir = os.path.join(config.data_storage.data_path, "csv_data")
-        os.makedirs(self.data_dir, exist_ok=True)
+        self.events = events
+        self.storage = StorageFactory.create_storage(
+            config.data_storage.backend, config.data_storage.data_path
+        )
+        self.compaction_interval = config.data_storage.compaction_interval
+        self.refresh_workers = config.cex.refresh_workers
+        self._appends_since_compaction: Dict[Tuple[str, str], int] = {}
+        self.bar_cache = (
+            SharedBarCache(
+                config.data_storage.ring_buffer_bars,
+                replace=config.data_storage.ring_buffer_replace,
+            )
+            if config.data_storage.ring_buffer_bars
+            else None
+        )
+        self.watermarks = WatermarkStore(
+            os.path.join(config.data_storage.data_path, "watermarks.db")
+        )
         self.local_tz = pytz.timezone(config.cex.timezone)
         self.utc_tz = pytz.UTC
+        self.stream: Optional[BinanceKlineStream] = None
+        self._series_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._series_locks_guard = threading.Lock()
+        self.snapshots = SnapshotCache(config.cex.market_snapshot_max_age_seconds)
+        self.resampler = (
+            Resampler(
+                self.storage,
+                config.cex.base_interval,
+                config.cex.kline_intervals,
+                config.cex.resample_timezone,
+            )
+            if config.cex.base_interval
+            else None
+        )
+
+    def _series_lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._series_locks_guard:
+            return self._series_locks.setdefault((symbol, interval), threading.Lock())
 
     def collect_historical_data(
         self,
@@ -38,8 +107,7 @@ class BinanceDataCollector(BaseDataCollector):
         klines = self.platform.get_historical_klines(
             symbol, interval, start_time_str, end_time_str
         )
-        df = self.platform.create_dataframe(klines)
-        return self._adjust_timezone(df)
+        return self.platform.create_dataframe(klines)
 
     def _to_utc(self, time: Union[str, datetime]) -> datetime:
         if isinstance(time, str):
@@ -48,13 +116,6 @@ class BinanceDataCollector(BaseDataCollector):
             time = self.local_tz.localize(time)
         return time.astimezone(self.utc_tz)
 
-    def _adjust_timezone(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
-        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
-        df["open_time"] = df["open_time"].dt.tz_convert(self.local_tz)
-        df["close_time"] = df["close_time"].dt.tz_convert(self.local_tz)
-        return df
-
     def collect_latest_data(self, symbol: str, interval: str, limit: int = 100) -> pd.DataFrame:
         klines = self.platform.get_latest_klines(symbol, interval, limit)
         return BinancePlatform.create_dataframe(klines)
@@ -73,71 +134,329 @@ class BinanceDataCollector(BaseDataCollector):
                 data[symbol] = df
         return data
 
-    def load_data(self, symbol: str, interval: str) -> pd.DataFrame:
-        file_path = os.path.join(self.data_dir, symbol, f"{interval}.csv")
-        try:
-            df = pd.read_csv(file_path, parse_dates=["open_time", "close_time"])
-            logger.info(f"Data loaded from {file_path}")
-
-            # Convert to timezone-aware datetime if not already
-            if df["open_time"].dt.tz is None:
-                df["open_time"] = (
-                    df["open_time"].dt.tz_localize(self.utc_tz).dt.tz_convert(self.local_tz)
-                )
-                df["close_time"] = (
-                    df["close_time"].dt.tz_localize(self.utc_tz).dt.tz_convert(self.local_tz)
-                )
-            else:
-                df["open_time"] = df["open_time"].dt.tz_convert(self.local_tz)
-                df["close_time"] = df["close_time"].dt.tz_convert(self.local_tz)
-
-            return df
-        except FileNotFoundError:
+    def load_data(
+        self,
+        symbol: str,
+        interval: str,
+        columns: Optional[Sequence[str]] = None,
+        start_time: Optional[Union[str, datetime]] = None,
+        end_time: Optional[Union[str, datetime]] = None,
+    ) -> pd.DataFrame:
+        df = self.storage.read(
+            symbol,
+            interval,
+            columns=columns,
+            start_time=self._to_utc(start_time) if start_time is not None else None,
+            end_time=self._to_utc(end_time) if end_time is not None else None,
+        )
+        if df.empty:
             logger.info(f"No existing data found for {symbol} at interval {interval}")
             return pd.DataFrame()
+        logger.info(f"Data loaded for {symbol} at interval {interval}")
+        return df
 
     def save_data(self, data: Dict[str, pd.DataFrame], interval: str) -> None:
         for symbol, df in data.items():
-            directory = os.path.join(self.data_dir, symbol)
-            os.makedirs(directory, exist_ok=True)
-            file_path = os.path.join(directory, f"{interval}.csv")
-            df.to_csv(file_path, index=False)
-            logger.info(f"Data saved to {file_path}")
+            self.storage.write(symbol, interval, df)
+
+    def load_recent(
+        self, symbol: str, interval: str, bars: int, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load the newest ``bars`` bars, from the shared bar cache when it holds enough of them
+        and storage otherwise.
+        """
+        df = None
+        if self.bar_cache is not None:
+            df = self.bar_cache.recent(symbol, interval, bars, columns)
+        if df is None:
+            df = self.storage.read_recent(symbol, interval, bars, columns)
+        return df
+
+    def _update_bar_cache(
+        self, symbol: str, interval: str, new_data: Optional[pd.DataFrame] = None
+    ) -> None:
+        if (symbol, interval) in self.bar_cache and new_data is not None:
+            self.bar_cache.push(symbol, interval, new_data)
+            return
+        # first sight of the series, or bars changed behind the tail: reload from storage
+        buffer = self.bar_cache.get(symbol, interval)
+        last_open_time = self.storage.last_open_time(symbol, interval)
+        buffer.clear()
+        if last_open_time is not None:
+            start_ms = last_open_time - (buffer.capacity - 1) * interval_to_ms(interval)
+            buffer.push(self.storage.read(symbol, interval, start_time=start_ms))
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.stop()
+        if self.bar_cache is not None:
+            self.bar_cache.close()
+        self.watermarks.close()
 
     def get_all_usdt_pairs(self) -> List[str]:
         return self.platform.get_all_usdt_pairs()
 
-    def update_data_for_interval(self, interval: str, lookback_days: int = 1) -> None:
-        symbols = self.get_all_usdt_pairs()
-        end_time = datetime.now(self.local_tz)
-        start_time = end_time - timedelta(days=lookback_days)
+    def series_entry(self, symbol: str, interval: str) -> Optional[SeriesEntry]:
+        return self.storage.series_entry(symbol, interval)
 
-        for symbol in symbols:
-            new_data = self.collect_historical_data(symbol, interval, start_time, end_time)
-            if not new_data.empty:
-                self.merge_new_data(symbol, interval, new_data)
-        logger.info(f"Data updated for all pairs for interval: {interval}")
+    def stale_symbols(
+        self, interval: str, symbols: Optional[List[str]] = None, now_ms: Optional[int] = None
+    ) -> List[str]:
+        """
+        The symbols with closed bars left to fetch: no closed bar recorded yet, the last
+        closed bar not recorded, or known gaps. Answered from the watermarks, which only
+        move on closed klines, so a series whose newest stored bar was still open when it
+        was fetched stays stale until its final values are stored.
+        """
+        symbols = symbols if symbols is not None else self.get_all_usdt_pairs()
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        step = interval_to_ms(interval)
+        last_close_time = now_ms - now_ms % step - 1
+        high_waters = self.watermarks.high_waters(interval)
+        gapped = self.watermarks.gapped_symbols(interval)
+        return [
+            symbol
+            for symbol in symbols
+            if high_waters.get(symbol) is None
+            or high_waters[symbol] < last_close_time - step + 1
+            or symbol in gapped
+        ]
 
-    def merge_new_data(self, symbol: str, interval: str, new_data: pd.DataFrame) -> None:
-        existing_data = self.load_data(symbol, interval)
-        if existing_data.empty:
-            merged_data = new_data
+    def fetch_intervals(self, intervals: List[str]) -> List[str]:
+        """The intervals that have to be fetched; the rest are resampled from the base."""
+        if self.resampler is None:
+            return list(intervals)
+        derived = set(self.resampler.intervals)
+        fetched = [self.resampler.base_interval]
+        return fetched + [i for i in intervals if i not in derived and i not in fetched]
+
+    def update_data_for_interval(
+        self,
+        interval: str,
+        lookback_days: int = 1,
+        max_workers: Optional[int] = None,
+        symbols: Optional[List[str]] = None,
+    ) -> RefreshReport:
+        """
+        Fetch the bars each symbol is missing: everything after its high-water mark plus its
+        known gaps. Symbols without any stored data get the last ``lookback_days`` days.
+        Refreshing the base interval also updates the intervals resampled from it.
+        """
+        symbols = symbols if symbols is not None else self.get_all_usdt_pairs()
+        now_ms = int(time.time() * 1000)
+        high_water = {}
+        if self.events is not None:
+            high_water = {s: self.watermarks.get_high_water(s, interval) for s in symbols}
+
+        report = RefreshReport(interval)
+        with ThreadPoolExecutor(max_workers=max_workers or self.refresh_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._refresh_symbol, symbol, interval, now_ms, lookback_days
+                ): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    if future.result():
+                        report.updated.append(symbol)
+                    else:
+                        report.unchanged.append(symbol)
+                except Exception as e:
+                    logger.error(f"Failed to update {symbol} for interval {interval}: {e}")
+                    report.failed[symbol] = str(e)
+
+        if self.events is not None:
+            closed = {}
+            for symbol in report.updated:
+                after = self.watermarks.get_high_water(symbol, interval)
+                if after is not None:
+                    closed[symbol] = (high_water[symbol], after)
+            self._publish_closed(interval, closed)
+
+        logger.info(
+            f"Data updated for interval {interval}: {len(report.updated)} updated, "
+            f"{len(report.unchanged)} unchanged, {len(report.failed)} failed"
+        )
+        return report
+
+    def missing_ranges(
+        self, symbol: str, interval: str, now_ms: int, lookback_days: int = 1
+    ) -> List[Tuple[int, int, bool]]:
+        """
+        Plan the open_time ranges to fetch for a series.
+
+        :return: A list of inclusive (start_ms, end_ms, is_gap) ranges, known gaps first
+        """
+        step = interval_to_ms(interval)
+        high_water = self.watermarks.get_high_water(symbol, interval)
+        if high_water is not None:
+            tail_start = high_water + step
         else:
-            merged_data = (
-                pd.concat([existing_data, new_data])
-                .drop_duplicates(subset=["open_time"])
-                .sort_values("open_time")
-            )
-        self.save_data({symbol: merged_data}, interval)
+            last_open_time = self.storage.last_open_time(symbol, interval)
+            if last_open_time is None:
+                tail_start = now_ms - lookback_days * interval_to_ms("1d")
+            else:
+                # series written before watermarks existed: seed the mark and gap list once
+                for gap_start, gap_end in self.scan_gaps(symbol, interval):
+                    self.watermarks.add_gap(symbol, interval, gap_start, gap_end)
+                self.watermarks.set_high_water(symbol, interval, last_open_time - step)
+                tail_start = last_open_time
 
-    def get_symbols(self) -> List[str]:
-        exchange_info = self.platform.get_exchange_info()
+        ranges = [(start, end, True) for start, end in self.watermarks.get_gaps(symbol, interval)]
+        if tail_start <= now_ms:
+            ranges.append((tail_start, now_ms, False))
+        return ranges
+
+    def scan_gaps(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        step = interval_to_ms(interval)
+        open_time = self.storage.read(symbol, interval, columns=["open_time"])
+        if open_time.empty:
+            return []
+        open_time = open_time["open_time"].to_numpy()
+        holes = (open_time[1:] - open_time[:-1]) > step
+        return [
+            (int(before) + step, int(after) - step)
+            for before, after in zip(open_time[:-1][holes], open_time[1:][holes])
+        ]
+
+    @staticmethod
+    def split_range(
+        start_ms: int, end_ms: int, step: int, max_bars: int = 1000
+    ) -> List[Tuple[int, int]]:
+        span = step * max_bars
         return [
-            s["symbol"]
-            for s in exchange_info.get("symbols", [])
-            if s["symbol"].endswith("USDT") and s["status"] == "TRADING"
+            (chunk_start, min(chunk_start + span - 1, end_ms))
+            for chunk_start in range(start_ms, end_ms + 1, span)
         ]
 
+    def _refresh_symbol(
+        self, symbol: str, interval: str, now_ms: int, lookback_days: int = 1
+    ) -> bool:
+        step = interval_to_ms(interval)
+        updated = False
+        changed_from = None
+        errors = []
+        for range_start, range_end, is_gap in self.missing_ranges(
+            symbol, interval, now_ms, lookback_days
+        ):
+            for start_ms, end_ms in self.split_range(
+                range_start, range_end, step, self.platform.KLINES_LIMIT
+            ):
+                try:
+                    klines = self.platform.get_kline_columns(symbol, interval, start_ms, end_ms)
+                except Exception as e:
+                    # gaps stay recorded and the watermark stays put, so the next run retries
+                    errors.append(str(e))
+                    break
+
+                fetched = len(klines["open_time"]) > 0
+                if fetched:
+                    df = pd.DataFrame(klines)
+                    if is_gap:
+                        with self._series_lock(symbol, interval):
+                            self.storage.merge(symbol, interval, df)
+                            if self.bar_cache is not None:
+                                self._update_bar_cache(symbol, interval)
+                        changed_from = (
+                            start_ms if changed_from is None else min(changed_from, start_ms)
+                        )
+                    else:
+                        self.merge_new_data(symbol, interval, df)
+                    updated = True
+                if is_gap:
+                    self.watermarks.remove_gap(symbol, interval, start_ms, end_ms)
+                elif fetched:
+                    closed = klines["open_time"][klines["close_time"] < now_ms]
+                    if len(closed):
+                        self.watermarks.set_high_water(symbol, interval, int(closed.max()))
+
+        if updated:
+            self._resample(symbol, interval, changed_from)
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return updated
+
+    def _resample(self, symbol: str, interval: str, changed_from: Optional[int] = None) -> None:
+        if self.resampler is None or interval != self.resampler.base_interval:
+            return
+        for target in self.resampler.intervals:
+            with self._series_lock(symbol, target):
+                self.resampler.update_interval(symbol, target, changed_from)
+                if self.bar_cache is not None:
+                    self._update_bar_cache(symbol, target)
+
+    def merge_new_data(self, symbol: str, interval: str, new_data: pd.DataFrame) -> None:
+        with self._series_lock(symbol, interval):
+            self.storage.append(symbol, interval, new_data)
+            if self.bar_cache is not None:
+                self._update_bar_cache(symbol, interval, new_data)
+
+            key = (symbol, interval)
+            self._appends_since_compaction[key] = self._appends_since_compaction.get(key, 0) + 1
+            if self.compaction_interval and (
+                self._appends_since_compaction[key] >= self.compaction_interval
+            ):
+                self.storage.compact(symbol, interval)
+                self._appends_since_compaction[key] = 0
+
+    def start_streaming(self, intervals: List[str], symbols: Optional[List[str]] = None) -> None:
+        """Ingest closed klines from the WebSocket stream; REST only fills gaps."""
+        symbols = symbols if symbols is not None else self.get_all_usdt_pairs()
+        self.stream = self.platform.kline_stream()
+        self.stream.start(
+            symbols, intervals, self.handle_stream_kline, self._handle_stream_reconnect
+        )
+
+    def handle_stream_kline(
+        self, symbol: str, interval: str, kline: List[Any], closed: bool
+    ) -> None:
+        if not closed:
+            return
+        open_time = int(kline[0])
+        step = interval_to_ms(interval)
+        high_water = self.watermarks.get_high_water(symbol, interval)
+        if high_water is not None and open_time > high_water + step:
+            # bars were missed while disconnected; the REST refresh picks the gap up
+            self.watermarks.add_gap(symbol, interval, high_water + step, open_time - step)
+
+        df = self.platform.create_dataframe([kline])
+        self.merge_new_data(symbol, interval, df)
+        self.watermarks.set_high_water(symbol, interval, open_time)
+        self._resample(symbol, interval)
+        if self.events is not None:
+            self._publish_closed(interval, {symbol: (high_water, open_time)})
+
+    def _publish_closed(self, interval: str, closed: Dict[str, Tuple[Optional[int], int]]) -> None:
+        """
+        Publish ``BarsClosed`` for the symbols whose last closed bar moved, including the
+        intervals resampled from ``interval``.
+
+        :param closed: Symbol -> (last closed open_time before the update or None, after it)
+        """
+        step = interval_to_ms(interval)
+        by_bar: Dict[Tuple[str, int], List[str]] = {}
+        for symbol, (before, after) in closed.items():
+            if before is not None and after <= before:
+                continue
+            by_bar.setdefault((interval, after + step - 1), []).append(symbol)
+            if self.resampler is not None and interval == self.resampler.base_interval:
+                for target in self.resampler.intervals:
+                    close_time = self.resampler.closed_since(target, before, after)
+                    if close_time is not None:
+                        by_bar.setdefault((target, close_time), []).append(symbol)
+        for (bar_interval, close_time), symbols in by_bar.items():
+            self.events.publish(BarsClosed(bar_interval, tuple(symbols), close_time))
+
+    def _handle_stream_reconnect(self, symbols_by_interval: Dict[str, List[str]]) -> None:
+        for interval, symbols in symbols_by_interval.items():
+            self.update_data_for_interval(interval, symbols=symbols)
+
+    def get_symbols(self) -> List[str]:
+        return self.platform.get_all_usdt_pairs()
+
     def collect_price_data(
         self, symbols: List[str], interval: str, lookback_days: int = 30
     ) -> Dict[str, pd.DataFrame]:
@@ -148,13 +467,26 @@ class BinanceDataCollector(BaseDataCollector):
                 price_data[symbol] = data[["close"]]
         return price_data
 
+    def market_snapshot(self, max_age_seconds: Optional[float] = None) -> MarketSnapshot:
+        """24h ticker statistics for every symbol, reused within the freshness window."""
+        return self.snapshots.get(
+            "binance",
+            lambda: MarketSnapshot.from_records(
+                "binance", self.platform.get_all_tickers_24h(), "symbol", self.TICKER_FIELDS
+            ),
+            max_age_seconds,
+        )
+
     def collect_market_cap_data(self, symbols: List[str]) -> Dict[str, float]:
-        market_cap_data = {}
-        for symbol in symbols:
-            try:
-                ticker = self.platform.client.get_ticker(symbol=symbol)
-                market_cap = float(ticker["volume"]) * float(ticker["lastPrice"])
-                market_cap_data[symbol] = market_cap
-            except Exception as e:
-                logger.error(f"Failed to fetch market cap for {symbol}: {e}")
-        return market_cap_data
+        # 24h traded value stands in for market cap
+        snapshot = self.market_snapshot()
+        last_prices = snapshot.lookup(symbols, "last_price")
+        volumes = snapshot.lookup(symbols, "volume")
+        missing = [symbol for symbol in symbols if symbol not in last_prices]
+        if missing:
+            logger.warning(f"No 24h ticker for {len(missing)} symbols: {missing[:10]}")
+        return {
+            symbol: volumes[symbol] * price
+            for symbol, price in last_prices.items()
+            if symbol in volumes
+        }
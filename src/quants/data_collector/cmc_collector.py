@@ -1,25 +1,38 @@
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
 import pytz
 
 from ..config.base import AppConfig
-from ..platform.coinmarketcap import CoinMarketCapPlatform
+from ..platform.cmc import CoinMarketCapPlatform
+from ..storage.csv_storage import append_csv
 from ..utils.logger import get_logger
+from ..utils.timeframes import to_epoch_ms_array
 from .base import BaseDataCollector
+from .snapshot import MarketSnapshot, SnapshotCache
 
 logger = get_logger(__name__)
 
 
 class CoinMarketCapDataCollector(BaseDataCollector):
+    # snapshot column -> USD quote field
+    QUOTE_FIELDS = {
+        'market_cap': 'market_cap',
+        'price': 'price',
+        'volume': 'volume_24h',
+    }
+
     def __init__(self, platform: CoinMarketCapPlatform, config: AppConfig):
         self.platform = platform
         self.data_dir = os.path.join(config.data_storage.data_path, "csv_data")
         os.makedirs(self.data_dir, exist_ok=True)
         self.local_tz = pytz.timezone(config.cex.timezone)
         self.utc_tz = pytz.UTC
+        self.compaction_interval = config.data_storage.compaction_interval
+        self._appends_since_compaction: Dict[str, int] = {}
+        self.snapshots = SnapshotCache(config.cex.market_snapshot_max_age_seconds)
 
     def collect_historical_data(
         self,
@@ -31,12 +44,7 @@ class CoinMarketCapDataCollector(BaseDataCollector):
         start_time_str = start_time.strftime('%Y-%m-%dT%H:%M:%S')
         end_time_str = end_time.strftime('%Y-%m-%dT%H:%M:%S')
         price_data = self.platform.get_historical_price_data(symbol, start_time_str, end_time_str, interval)
-        df = self.platform.create_dataframe(price_data)
-        return self._adjust_timezone(df)
-
-    def _adjust_timezone(self, df: pd.DataFrame) -> pd.DataFrame:
-        df['timestamp'] = df['timestamp'].dt.tz_localize(self.utc_tz).dt.tz_convert(self.local_tz)
-        return df
+        return self.platform.create_dataframe(price_data)
 
     def collect_latest_data(self, symbol: str) -> pd.DataFrame:
         end_time = datetime.now()
@@ -60,12 +68,10 @@ class CoinMarketCapDataCollector(BaseDataCollector):
     def load_data(self, symbol: str) -> pd.DataFrame:
         file_path = os.path.join(self.data_dir, f"{symbol}.csv")
         try:
-            df = pd.read_csv(file_path, parse_dates=['timestamp'])
+            df = pd.read_csv(file_path)
             logger.info(f"Data loaded from {file_path}")
-            if df['timestamp'].dt.tz is None:
-                df['timestamp'] = df['timestamp'].dt.tz_localize(self.utc_tz).dt.tz_convert(self.local_tz)
-            else:
-                df['timestamp'] = df['timestamp'].dt.tz_convert(self.local_tz)
+            # older files hold datetime text
+            df['timestamp'] = to_epoch_ms_array(df['timestamp'])
             return df
         except FileNotFoundError:
             logger.info(f"No existing data found for {symbol}")
@@ -80,6 +86,9 @@ class CoinMarketCapDataCollector(BaseDataCollector):
     def get_all_cryptocurrencies(self) -> List[Dict[str, Any]]:
         return self.platform.get_all_cryptocurrencies()
 
+    def get_symbols(self) -> List[str]:
+        return [crypto['symbol'] for crypto in self.get_all_cryptocurrencies()]
+
     def update_data_for_symbols(self, lookback_days: int = 90) -> None:
         cryptocurrencies = self.get_all_cryptocurrencies()
         end_time = datetime.now()
@@ -92,17 +101,38 @@ class CoinMarketCapDataCollector(BaseDataCollector):
         logger.info(f"Data updated for all cryptocurrencies")
 
     def merge_new_data(self, symbol: str, new_data: pd.DataFrame) -> None:
-        existing_data = self.load_data(symbol)
-        if existing_data.empty:
-            merged_data = new_data
-        else:
-            merged_data = pd.concat([existing_data, new_data]).drop_duplicates(subset=['timestamp']).sort_values('timestamp')
+        file_path = os.path.join(self.data_dir, f"{symbol}.csv")
+        if not os.path.exists(file_path):
+            self.save_data({symbol: new_data})
+            return
+        append_csv(file_path, new_data, "timestamp")
+
+        self._appends_since_compaction[symbol] = self._appends_since_compaction.get(symbol, 0) + 1
+        if self.compaction_interval and (
+            self._appends_since_compaction[symbol] >= self.compaction_interval
+        ):
+            self.compact_data(symbol)
+            self._appends_since_compaction[symbol] = 0
+
+    def compact_data(self, symbol: str) -> None:
+        data = self.load_data(symbol)
+        if data.empty:
+            return
+        merged_data = data.drop_duplicates(subset=["timestamp"], keep="last").sort_values(
+            "timestamp"
+        )
         self.save_data({symbol: merged_data})
 
+    def market_snapshot(self, max_age_seconds: Optional[float] = None) -> MarketSnapshot:
+        """USD quotes for every listed cryptocurrency, keyed by ticker."""
+        def load() -> MarketSnapshot:
+            quotes = [
+                {'symbol': crypto['symbol'], **crypto['quote']['USD']}
+                for crypto in self.get_all_cryptocurrencies()
+            ]
+            return MarketSnapshot.from_records("cmc", quotes, 'symbol', self.QUOTE_FIELDS)
+
+        return self.snapshots.get("cmc", load, max_age_seconds)
+
     def collect_market_cap_data(self, symbols: List[str]) -> Dict[str, float]:
-        market_cap_data = {}
-        cryptocurrencies = self.get_all_cryptocurrencies()
-        for crypto in cryptocurrencies:
-            if crypto['symbol'] in symbols:
-                market_cap_data[crypto['symbol']] = crypto['quote']['USD']['market_cap']
-        return market_cap_data
\ No newline at end of file
+        return self.market_snapshot().lookup(symbols, 'market_cap')
\ No newline at end of file
@@ -1,24 +1,40 @@
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import pytz
 
 from ..config.base import AppConfig
-from ..platform.coin_gecko import CoinGeckoPlatform
+from ..platform.coingecko import CoinGeckoPlatform
+from ..storage.csv_storage import append_csv
 from ..utils.logger import get_logger
+from ..utils.timeframes import to_epoch_ms_array
 from .base import BaseDataCollector
+from .snapshot import MarketSnapshot, SnapshotCache
 
 logger = get_logger(__name__)
 
 class CoinGeckoDataCollector(BaseDataCollector):
-    def __init__(self, platform: CoinGeckoPlatform, config: AppConfig):
+    # snapshot column -> coins/markets field
+    MARKET_FIELDS = {
+        "market_cap": "market_cap",
+        "price": "current_price",
+        "volume": "total_volume",
+    }
+
+    def __init__(
+        self, platform: CoinGeckoPlatform, config: AppConfig, market_pages: int = 4
+    ):
         self.platform = platform
         self.data_dir = os.path.join(config.data_storage.data_path, "csv_data")
         os.makedirs(self.data_dir, exist_ok=True)
         self.local_tz = pytz.timezone(config.cex.timezone)
         self.utc_tz = pytz.UTC
+        self.compaction_interval = config.data_storage.compaction_interval
+        self._appends_since_compaction: Dict[Tuple[str, str], int] = {}
+        self.market_pages = market_pages
+        self.snapshots = SnapshotCache(config.cex.market_snapshot_max_age_seconds)
 
     def collect_historical_data(
         self,
@@ -27,12 +43,7 @@ class CoinGeckoDataCollector(BaseDataCollector):
         days: int,
     ) -> pd.DataFrame:
         price_data = self.platform.get_historical_price_data(coin_id, vs_currency, days)
-        df = self.platform.create_dataframe(price_data)
-        return self._adjust_timezone(df)
-
-    def _adjust_timezone(self, df: pd.DataFrame) -> pd.DataFrame:
-        df['timestamp'] = df['timestamp'].dt.tz_localize(self.utc_tz).dt.tz_convert(self.local_tz)
-        return df
+        return self.platform.create_dataframe(price_data)
 
     def collect_latest_data(self, coin_id: str, vs_currency: str) -> pd.DataFrame:
         price_data = self.platform.get_historical_price_data(coin_id, vs_currency, days=1)
@@ -51,15 +62,21 @@ class CoinGeckoDataCollector(BaseDataCollector):
                 data[coin_id] = df
         return data
 
+    def collect_multiple_symbols(
+        self,
+        symbols: List[str],
+        vs_currency: str,
+        days: int,
+    ) -> Dict[str, pd.DataFrame]:
+        return self.collect_multiple_coins(symbols, vs_currency, days)
+
     def load_data(self, coin_id: str, vs_currency: str) -> pd.DataFrame:
         file_path = os.path.join(self.data_dir, f"{coin_id}_{vs_currency}.csv")
         try:
-            df = pd.read_csv(file_path, parse_dates=['timestamp'])
+            df = pd.read_csv(file_path)
             logger.info(f"Data loaded from {file_path}")
-            if df['timestamp'].dt.tz is None:
-                df['timestamp'] = df['timestamp'].dt.tz_localize(self.utc_tz).dt.tz_convert(self.local_tz)
-            else:
-                df['timestamp'] = df['timestamp'].dt.tz_convert(self.local_tz)
+            # older files hold datetime text
+            df['timestamp'] = to_epoch_ms_array(df['timestamp'])
             return df
         except FileNotFoundError:
             logger.info(f"No existing data found for {coin_id} vs {vs_currency}")
@@ -74,6 +91,21 @@ class CoinGeckoDataCollector(BaseDataCollector):
     def get_all_coins(self) -> List[Dict[str, Any]]:
         return self.platform.get_all_coins()
 
+    def get_coin_listing(self) -> List[Dict[str, Any]]:
+        """
+        Every listed coin, for the asset index. The top ``market_pages`` pages of
+        coins/markets come first with their market caps; coins/list adds the rest
+        without one, so they rank below any coin sharing their ticker.
+        """
+        markets = self.platform.get_coins_markets_pages('usd', pages=self.market_pages)
+        ranked = {coin['id'] for coin in markets}
+        return markets + [
+            coin for coin in self.platform.get_coins_list() if coin['id'] not in ranked
+        ]
+
+    def get_symbols(self) -> List[str]:
+        return [coin['id'] for coin in self.get_all_coins()]
+
     def update_data_for_coins(self, vs_currency: str, days: int = 90) -> None:
         coins = self.get_all_coins()
         for coin in coins:
@@ -84,17 +116,41 @@ class CoinGeckoDataCollector(BaseDataCollector):
         logger.info(f"Data updated for all coins vs {vs_currency}")
 
     def merge_new_data(self, coin_id: str, vs_currency: str, new_data: pd.DataFrame) -> None:
-        existing_data = self.load_data(coin_id, vs_currency)
-        if existing_data.empty:
-            merged_data = new_data
-        else:
-            merged_data = pd.concat([existing_data, new_data]).drop_duplicates(subset=['timestamp']).sort_values('timestamp')
+        file_path = os.path.join(self.data_dir, f"{coin_id}_{vs_currency}.csv")
+        if not os.path.exists(file_path):
+            self.save_data({coin_id: new_data}, vs_currency)
+            return
+        append_csv(file_path, new_data, "timestamp")
+
+        key = (coin_id, vs_currency)
+        self._appends_since_compaction[key] = self._appends_since_compaction.get(key, 0) + 1
+        if self.compaction_interval and (
+            self._appends_since_compaction[key] >= self.compaction_interval
+        ):
+            self.compact_data(coin_id, vs_currency)
+            self._appends_since_compaction[key] = 0
+
+    def compact_data(self, coin_id: str, vs_currency: str) -> None:
+        data = self.load_data(coin_id, vs_currency)
+        if data.empty:
+            return
+        merged_data = data.drop_duplicates(subset=["timestamp"], keep="last").sort_values(
+            "timestamp"
+        )
         self.save_data({coin_id: merged_data}, vs_currency)
 
+    def market_snapshot(self, max_age_seconds: Optional[float] = None) -> MarketSnapshot:
+        """Market data for the top ``market_pages`` pages of coins, keyed by coin id."""
+        return self.snapshots.get(
+            "coingecko",
+            lambda: MarketSnapshot.from_records(
+                "coingecko",
+                self.platform.get_coins_markets_pages('usd', pages=self.market_pages),
+                "id",
+                self.MARKET_FIELDS,
+            ),
+            max_age_seconds,
+        )
+
     def collect_market_cap_data(self, coin_ids: List[str]) -> Dict[str, float]:
-        market_cap_data = {}
-        coins = self.get_all_coins()
-        for coin in coins:
-            if coin['id'] in coin_ids:
-                market_cap_data[coin['id']] = coin['market_cap']
-        return market_cap_data
\ No newline at end of file
+        return self.market_snapshot().lookup(coin_ids, "market_cap")
\ No newline at end of file
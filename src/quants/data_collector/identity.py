@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SOURCES = ("binance", "coingecko", "cmc")
+
+
+@dataclass
+class AssetIdentity:
+    """
+    One canonical asset and the identifier each source knows it by.
+
+    :param asset: Canonical id; the plain ticker (``"BTC"``) for the largest asset using it,
+        ``"TICKER:slug"`` for the others
+    :param ticker: Upper-case ticker
+    :param slug: CoinGecko id / CMC slug, when a source provides one
+    :param ids: Source name -> identifier (``"BTCUSDT"``, ``"bitcoin"``, ``"BTC"``)
+    :param market_cap: Largest market cap reported for the asset, used to rank tickers
+    """
+
+    asset: str
+    ticker: str
+    slug: str = ""
+    ids: Dict[str, str] = field(default_factory=dict)
+    market_cap: float = 0.0
+
+
+class AssetIdentityIndex:
+    """
+    Persistent map between canonical assets and per-source identifiers.
+
+    Each ``update_*`` call takes a listing from one source and replaces that source's ids,
+    leaving the others alone, so the index can be rebuilt one source at a time. Tickers
+    shared by several assets are resolved by market cap: the largest keeps the plain
+    ticker and the rest are keyed by ticker and slug. CoinGecko ids and CMC slugs are both
+    slugs, which is how the secondary assets are matched across the two.
+    """
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.assets: Dict[str, AssetIdentity] = {}
+        self.updated_at: Dict[str, float] = {}
+        self._by_source: Dict[str, Dict[str, str]] = {source: {} for source in SOURCES}
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable asset index {self.index_path}: {e}")
+            return
+        self.assets = {entry["asset"]: AssetIdentity(**entry) for entry in data["assets"]}
+        self.updated_at = data.get("updated_at", {})
+        self._reindex()
+        logger.info(f"Loaded {len(self.assets)} assets from {self.index_path}")
+
+    def save(self) -> None:
+        with self.lock:
+            data = {
+                "updated_at": self.updated_at,
+                "assets": [asdict(identity) for identity in self.assets.values()],
+            }
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.index_path)
+
+    def _reindex(self) -> None:
+        self._by_source = {source: {} for source in SOURCES}
+        for identity in self.assets.values():
+            for source, source_id in identity.ids.items():
+                self._by_source[source][source_id] = identity.asset
+
+    def update_binance(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """:param pairs: (pair, base asset) for each USDT pair, e.g. ("BTCUSDT", "BTC")"""
+        # Binance lists one asset per ticker, and by convention the largest one
+        self._update("binance", [(pair, base, "", 0.0) for pair, base in pairs])
+
+    def update_coingecko(self, coins: Iterable[Dict[str, Any]]) -> None:
+        """:param coins: Entries from CoinGecko's coins/markets or coins/list listings"""
+        self._update(
+            "coingecko",
+            [
+                (coin["id"], coin["symbol"], coin["id"], float(coin.get("market_cap") or 0))
+                for coin in coins
+            ],
+        )
+
+    def update_cmc(self, listings: Iterable[Dict[str, Any]]) -> None:
+        """:param listings: Entries from CMC's cryptocurrency/listings/latest"""
+        self._update(
+            "cmc",
+            [
+                (
+                    crypto["symbol"],
+                    crypto["symbol"],
+                    crypto.get("slug", ""),
+                    float(crypto.get("quote", {}).get("USD", {}).get("market_cap") or 0),
+                )
+                for crypto in listings
+            ],
+        )
+
+    def _update(self, source: str, entries: List[Tuple[str, str, str, float]]) -> None:
+        """:param entries: (source id, ticker, slug, market cap) per listed asset"""
+        with self.lock:
+            for identity in self.assets.values():
+                identity.ids.pop(source, None)
+
+            # largest first, so it claims the plain ticker
+            claimed = set()
+            for source_id, ticker, slug, market_cap in sorted(entries, key=lambda e: -e[3]):
+                ticker = ticker.upper()
+                if source == "cmc" and ticker in claimed:
+                    # CMC queries by ticker, so only the first asset per ticker is reachable
+                    continue
+                identity = self._match(ticker, slug, ticker not in claimed)
+                claimed.add(ticker)
+                identity.ids[source] = source_id
+                identity.market_cap = max(identity.market_cap, market_cap)
+                if slug and not identity.slug:
+                    identity.slug = slug
+
+            self.assets = {asset: i for asset, i in self.assets.items() if i.ids}
+            self.updated_at[source] = time.time()
+            self._reindex()
+        logger.info(f"Asset index updated from {source}: {len(entries)} listings")
+
+    def _match(self, ticker: str, slug: str, primary: bool) -> AssetIdentity:
+        if primary:
+            asset = ticker
+        else:
+            asset = f"{ticker}:{slug}" if slug else ticker
+        identity = self.assets.get(asset)
+        if identity is None:
+            identity = self.assets[asset] = AssetIdentity(asset=asset, ticker=ticker, slug=slug)
+        return identity
+
+    def get(self, asset: str) -> Optional[AssetIdentity]:
+        return self.assets.get(asset)
+
+    def resolve(self, identifier: str) -> Optional[AssetIdentity]:
+        """Find an asset by canonical id or by any source's identifier."""
+        identity = self.assets.get(identifier)
+        if identity is not None:
+            return identity
+        for mapping in self._by_source.values():
+            asset = mapping.get(identifier)
+            if asset is not None:
+                return self.assets[asset]
+        return None
+
+    def assets_listed_on(self, source: Optional[str] = None) -> List[AssetIdentity]:
+        """All assets, or only those the given source lists, largest first."""
+        identities = [i for i in self.assets.values() if source is None or source in i.ids]
+        return sorted(identities, key=lambda i: -i.market_cap)
@@ -0,0 +1,212 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..storage import BaseStorage
+from ..utils.logger import get_logger
+from ..utils.timeframes import interval_to_ms
+
+logger = get_logger(__name__)
+
+DAY_MS = interval_to_ms("1d")
+WEEK_MS = interval_to_ms("1w")
+# weekly bars open on Monday; the epoch fell on a Thursday
+WEEK_ORIGIN_MS = 4 * DAY_MS
+NS_PER_MS = 1_000_000
+
+# kline column -> how bars are combined; columns not listed are dropped
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+    "quote_asset_volume": "sum",
+    "number_of_trades": "sum",
+    "taker_buy_base_asset_volume": "sum",
+    "taker_buy_quote_asset_volume": "sum",
+    "ignore": "last",
+}
+
+
+def _as_ns(epoch_ms: np.ndarray) -> np.ndarray:
+    # nanosecond datetimes, the unit every pandas version keeps, so asi8 is in ns
+    return epoch_ms.astype("datetime64[ms]").astype("datetime64[ns]")
+
+
+def _is_utc(timezone: str) -> bool:
+    return timezone.upper() in ("UTC", "ETC/UTC", "GMT")
+
+
+def bucket_bounds(
+    open_time: np.ndarray, step_ms: int, timezone: str = "UTC"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Open and close time of the coarse bar each fine bar falls into.
+
+    Bars shorter than a day are aligned to UTC, as the exchange does. Daily and longer bars
+    start at local midnight in ``timezone`` (on Monday for weekly multiples), so their
+    length follows daylight saving changes.
+
+    :param open_time: Sorted fine bar open times, UTC epoch ms
+    :param step_ms: Coarse interval length
+    :return: (open_time, close_time) arrays aligned with the input
+    """
+    origin = WEEK_ORIGIN_MS if step_ms % WEEK_MS == 0 else 0
+    if step_ms < DAY_MS or _is_utc(timezone):
+        opens = open_time - (open_time - origin) % step_ms
+        return opens, opens + (step_ms - 1)
+
+    # floor on the local wall clock, then map each distinct local boundary back to UTC
+    local = pd.DatetimeIndex(_as_ns(open_time)).tz_localize("UTC")
+    wall = local.tz_convert(timezone).tz_localize(None).asi8 // NS_PER_MS
+    labels, inverse = np.unique(wall - (wall - origin) % step_ms, return_inverse=True)
+
+    def to_utc(wall_ms: np.ndarray) -> np.ndarray:
+        boundaries = pd.DatetimeIndex(_as_ns(wall_ms)).tz_localize(
+            timezone, ambiguous=np.ones(len(wall_ms), dtype=bool), nonexistent="shift_forward"
+        )
+        return boundaries.tz_convert("UTC").asi8 // NS_PER_MS
+
+    opens = to_utc(labels)
+    closes = to_utc(labels + step_ms) - 1
+    return opens[inverse], closes[inverse]
+
+
+def resample_bars(data: pd.DataFrame, interval: str, timezone: str = "UTC") -> pd.DataFrame:
+    """
+    Combine fine klines into ``interval`` klines.
+
+    The last coarse bar may be partial, like the open candle the exchange returns; it keeps
+    the full bar's close_time and is completed by the next resample.
+
+    :param data: Klines sorted by open_time, with int64 epoch-ms time columns
+    :param interval: Target interval, a multiple of the input interval
+    :param timezone: Timezone daily and longer bars are aligned to
+    """
+    if data.empty:
+        return data.iloc[0:0]
+    opens, closes = bucket_bounds(
+        data["open_time"].to_numpy(dtype=np.int64), interval_to_ms(interval), timezone
+    )
+    starts = np.flatnonzero(np.r_[True, opens[1:] != opens[:-1]])
+    ends = np.r_[starts[1:], len(opens)] - 1
+
+    bars = {}
+    for col in data.columns:
+        if col == "open_time":
+            bars[col] = opens[starts]
+        elif col == "close_time":
+            bars[col] = closes[starts]
+        elif col in AGGREGATIONS:
+            values = data[col].to_numpy()
+            how = AGGREGATIONS[col]
+            if how == "first":
+                bars[col] = values[starts]
+            elif how == "last":
+                bars[col] = values[ends]
+            elif how == "max":
+                bars[col] = np.maximum.reduceat(values, starts)
+            elif how == "min":
+                bars[col] = np.minimum.reduceat(values, starts)
+            else:
+                bars[col] = np.add.reduceat(values, starts)
+    return pd.DataFrame(bars)
+
+
+class Resampler:
+    """
+    Derive coarse kline series from a stored base interval.
+
+    Every interval in ``intervals`` that is a whole multiple of ``base_interval`` (and
+    whose boundaries fall on base bar boundaries in ``timezone``) is built locally, so
+    only the base interval has to be fetched. Updates only recompute the coarse bars the
+    new base bars can change: the stored tail, or everything from an earlier changed bar.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        base_interval: str,
+        intervals: Sequence[str],
+        timezone: str = "UTC",
+    ):
+        self.storage = storage
+        self.base_interval = base_interval
+        self.base_ms = interval_to_ms(base_interval)
+        self.timezone = timezone
+        self.intervals: List[str] = [i for i in intervals if self.derives(i)]
+        skipped = [i for i in intervals if i != base_interval and i not in self.intervals]
+        if skipped:
+            logger.warning(f"Intervals {skipped} cannot be derived from {base_interval}")
+
+    def derives(self, interval: str) -> bool:
+        step = interval_to_ms(interval)
+        if step <= self.base_ms or step % self.base_ms:
+            return False
+        if step < DAY_MS or _is_utc(self.timezone):
+            return True
+        # local midnight has to be a base bar boundary in summer and winter alike
+        probes = pd.DatetimeIndex(["2024-01-01", "2024-07-01"]).tz_localize(self.timezone)
+        offsets_ms = [int(ts.utcoffset().total_seconds() * 1000) for ts in probes]
+        return all(offset % self.base_ms == 0 for offset in offsets_ms)
+
+    def bar_bounds(self, interval: str, open_time: int) -> Tuple[int, int]:
+        """Open and close time of the ``interval`` bar containing ``open_time``."""
+        opens, closes = bucket_bounds(
+            np.array([open_time], dtype=np.int64), interval_to_ms(interval), self.timezone
+        )
+        return int(opens[0]), int(closes[0])
+
+    def closed_since(self, interval: str, before: Optional[int], after: int) -> Optional[int]:
+        """
+        close_time of the newest ``interval`` bar completed by the base bars opening after
+        ``before`` up to ``after``, or None if they complete none.
+
+        :param before: Last base open_time already accounted for, or None for none
+        """
+        open_time, close_time = self.bar_bounds(interval, after)
+        if close_time != after + self.base_ms - 1:
+            # the bar holding ``after`` is still open, so the newest complete bar is the one before
+            close_time = open_time - 1
+        if before is not None and close_time <= before + self.base_ms - 1:
+            return None
+        return close_time
+
+    def update_interval(
+        self, symbol: str, interval: str, changed_from: Optional[int] = None
+    ) -> int:
+        """
+        Bring one coarse series up to date with the stored base series.
+
+        :param changed_from: Earliest base open_time rewritten behind the coarse tail (gap
+            backfills), or None if base bars were only appended
+        :return: The number of coarse bars written
+        """
+        last_open_time = self.storage.last_open_time(symbol, interval)
+        start = last_open_time
+        rebuild = False
+        if last_open_time is not None and changed_from is not None:
+            if changed_from < last_open_time:
+                start = self.bar_bounds(interval, changed_from)[0]
+                rebuild = True
+
+        base = self.storage.read(symbol, self.base_interval, start_time=start)
+        bars = resample_bars(base, interval, self.timezone)
+        if bars.empty:
+            return 0
+        if last_open_time is None:
+            self.storage.write(symbol, interval, bars)
+        elif rebuild:
+            self.storage.merge(symbol, interval, bars)
+        else:
+            self.storage.append(symbol, interval, bars)
+        return len(bars)
+
+    def update(self, symbol: str, changed_from: Optional[int] = None) -> Dict[str, int]:
+        """Update every derived interval; returns the bars written per interval."""
+        return {
+            interval: self.update_interval(symbol, interval, changed_from)
+            for interval in self.intervals
+        }
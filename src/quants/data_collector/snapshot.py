@@ -0,0 +1,140 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MarketSnapshot:
+    """
+    Columnar market data for every symbol of one source at one point in time.
+
+    Columns are float64 arrays aligned with ``symbols``; lookups go through a symbol ->
+    row index built once, so any number of lookups costs one dict access each.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        symbols: List[str],
+        columns: Dict[str, np.ndarray],
+        taken_at: Optional[float] = None,
+    ):
+        self.source = source
+        self.symbols = symbols
+        self.columns = columns
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self.index: Dict[str, int] = {}
+        for row, symbol in enumerate(symbols):
+            # listings come ranked, so a repeated symbol keeps its first (largest) row
+            self.index.setdefault(symbol, row)
+
+    @classmethod
+    def from_records(
+        cls,
+        source: str,
+        records: Iterable[Mapping[str, Any]],
+        key: str,
+        fields: Mapping[str, str],
+        taken_at: Optional[float] = None,
+    ) -> "MarketSnapshot":
+        """
+        :param key: Record field holding the symbol
+        :param fields: Output column -> record field; missing or null values become NaN
+        """
+        records = list(records)
+        symbols = [record[key] for record in records]
+        columns = {
+            column: np.fromiter(
+                (
+                    np.nan if record.get(field) is None else float(record[field])
+                    for record in records
+                ),
+                np.float64,
+                len(records),
+            )
+            for column, field in fields.items()
+        }
+        return cls(source, symbols, columns, taken_at)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def age(self) -> float:
+        return time.time() - self.taken_at
+
+    def get(self, symbol: str, column: str) -> Optional[float]:
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        value = self.columns[column][row]
+        return None if np.isnan(value) else float(value)
+
+    def lookup(self, symbols: Iterable[str], column: str) -> Dict[str, float]:
+        """Values of ``column`` for the listed symbols present in the snapshot."""
+        values = self.columns[column]
+        found = {}
+        for symbol in symbols:
+            row = self.index.get(symbol)
+            if row is not None and not np.isnan(values[row]):
+                found[symbol] = float(values[row])
+        return found
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns, index=pd.Index(self.symbols, name="symbol"))
+
+
+class SnapshotCache:
+    """
+    Keeps the latest snapshot of each source for ``max_age_seconds``.
+
+    Concurrent callers asking for an expired snapshot wait on a single reload instead of
+    each fetching their own. Empty snapshots (a failed listing) are never cached.
+    """
+
+    def __init__(self, max_age_seconds: float = 60.0):
+        self.max_age_seconds = max_age_seconds
+        self._snapshots: Dict[str, MarketSnapshot] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get(
+        self,
+        source: str,
+        loader: Callable[[], MarketSnapshot],
+        max_age_seconds: Optional[float] = None,
+    ) -> MarketSnapshot:
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        snapshot = self._snapshots.get(source)
+        if snapshot is not None and snapshot.age() < max_age:
+            return snapshot
+
+        with self._guard:
+            lock = self._locks.setdefault(source, threading.Lock())
+        with lock:
+            snapshot = self._snapshots.get(source)
+            if snapshot is None or snapshot.age() >= max_age:
+                fresh = loader()
+                if len(fresh) == 0 and snapshot is not None:
+                    # the source failed; keep serving the last good snapshot
+                    logger.warning(f"Empty {source} market snapshot, keeping the previous one")
+                    return snapshot
+                snapshot = fresh
+                if len(snapshot):
+                    self._snapshots[source] = snapshot
+                logger.info(f"Took {source} market snapshot of {len(snapshot)} symbols")
+        return snapshot
+
+    def invalidate(self, source: Optional[str] = None) -> None:
+        if source is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(source, None)
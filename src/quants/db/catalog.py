@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+from dataclasses import astuple, dataclass
+from typing import List, Optional
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SeriesEntry:
+    """
+    What is stored for one series.
+
+    :param first_ms: open_time of the first bar, UTC epoch ms
+    :param last_ms: open_time of the last bar, UTC epoch ms
+    :param rows: Number of stored bars
+    :param size_bytes: Size of the series on disk
+    :param content_hash: Changes whenever the stored bars change
+    :param modified_at: Epoch seconds of the last write
+    """
+
+    source: str
+    symbol: str
+    interval: str
+    first_ms: int
+    last_ms: int
+    rows: int
+    size_bytes: int
+    content_hash: str
+    modified_at: float
+
+
+class SeriesCatalog:
+    """
+    Per-(source, symbol, interval) index of stored series, kept up to date by the storage
+    backends on every write, so extents, sizes and change detection need no file access.
+    """
+
+    def __init__(self, db_path: str = "catalog.db"):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.create_tables()
+        logger.info(f"Series catalog initialized at {db_path}")
+
+    def create_tables(self):
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS series (
+                    source TEXT,
+                    symbol TEXT,
+                    interval TEXT,
+                    first_ms INTEGER,
+                    last_ms INTEGER,
+                    rows INTEGER,
+                    size_bytes INTEGER,
+                    content_hash TEXT,
+                    modified_at REAL,
+                    PRIMARY KEY (source, symbol, interval)
+                )
+            """
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS series_last_ms ON series (source, interval, last_ms)"
+            )
+            self.conn.commit()
+
+    def get(self, source: str, symbol: str, interval: str) -> Optional[SeriesEntry]:
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT * FROM series WHERE source = ? AND symbol = ? AND interval = ?",
+                (source, symbol, interval),
+            )
+            row = cursor.fetchone()
+        return SeriesEntry(*row) if row else None
+
+    def record(self, entry: SeriesEntry) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                astuple(entry),
+            )
+            self.conn.commit()
+
+    def remove(self, source: str, symbol: str, interval: str) -> None:
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM series WHERE source = ? AND symbol = ? AND interval = ?",
+                (source, symbol, interval),
+            )
+            self.conn.commit()
+
+    def entries(self, source: str, interval: Optional[str] = None) -> List[SeriesEntry]:
+        with self.lock:
+            cursor = self.conn.cursor()
+            if interval is None:
+                cursor.execute("SELECT * FROM series WHERE source = ?", (source,))
+            else:
+                cursor.execute(
+                    "SELECT * FROM series WHERE source = ? AND interval = ?", (source, interval)
+                )
+            return [SeriesEntry(*row) for row in cursor.fetchall()]
+
+    def stale(self, source: str, interval: str, before_ms: int) -> List[SeriesEntry]:
+        """Series whose last bar opened before ``before_ms``."""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT * FROM series WHERE source = ? AND interval = ? AND last_ms < ? "
+                "ORDER BY last_ms",
+                (source, interval, int(before_ms)),
+            )
+            return [SeriesEntry(*row) for row in cursor.fetchall()]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,61 @@
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class ImportLedger:
+    """
+    Record of the kline archives that have been imported into storage.
+
+    An archive counts as imported once its rows are stored; it is keyed by file name and
+    size, so a re-downloaded archive with different contents is imported again.
+    """
+
+    def __init__(self, db_path: str = "import_ledger.db"):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.create_tables()
+        logger.info(f"Import ledger initialized at {db_path}")
+
+    def create_tables(self):
+        with self.lock:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS imported_archives (
+                    name TEXT PRIMARY KEY,
+                    size INTEGER,
+                    symbol TEXT,
+                    interval TEXT,
+                    rows INTEGER,
+                    imported_at REAL
+                )
+            """
+            )
+            self.conn.commit()
+
+    def get_size(self, name: str) -> Optional[int]:
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT size FROM imported_archives WHERE name = ?", (name,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def is_imported(self, name: str, size: int) -> bool:
+        return self.get_size(name) == size
+
+    def mark_imported(self, name: str, size: int, symbol: str, interval: str, rows: int) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO imported_archives "
+                "(name, size, symbol, interval, rows, imported_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, int(size), symbol, interval, int(rows), time.time()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
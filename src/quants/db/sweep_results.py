@@ -0,0 +1,84 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class SweepResultStore:
+    """
+    Backtest metrics of parameter-sweep points, keyed by strategy, parameters, the hash of
+    the data backtested and the backtest settings, so a repeated or extended sweep only
+    backtests points it has not seen on the same data.
+    """
+
+    def __init__(self, db_path: str = "sweep_results.db"):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.create_tables()
+        logger.info(f"Sweep result store initialized at {db_path}")
+
+    def create_tables(self):
+        with self.lock:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sweep_results (
+                    strategy TEXT,
+                    params TEXT,
+                    data_hash TEXT,
+                    settings TEXT,
+                    metrics TEXT,
+                    created_at REAL,
+                    PRIMARY KEY (strategy, params, data_hash, settings)
+                )
+            """
+            )
+            self.conn.commit()
+
+    @staticmethod
+    def key(value: Dict[str, Any]) -> str:
+        return json.dumps(value, sort_keys=True)
+
+    def get(
+        self, strategy: str, params: Dict[str, Any], data_hash: str, settings: Dict[str, Any]
+    ) -> Optional[Dict[str, float]]:
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT metrics FROM sweep_results "
+                "WHERE strategy = ? AND params = ? AND data_hash = ? AND settings = ?",
+                (strategy, self.key(params), data_hash, self.key(settings)),
+            )
+            row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(
+        self,
+        strategy: str,
+        params: Dict[str, Any],
+        data_hash: str,
+        settings: Dict[str, Any],
+        metrics: Dict[str, float],
+    ) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sweep_results "
+                "(strategy, params, data_hash, settings, metrics, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    strategy,
+                    self.key(params),
+                    data_hash,
+                    self.key(settings),
+                    json.dumps(metrics),
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class WatermarkStore:
+    """
+    Per-(symbol, interval) high-water marks and known gaps for kline series.
+
+    The high-water mark is the open_time of the newest closed bar that has been stored;
+    gaps are inclusive open_time ranges that are known to be missing from storage.
+    """
+
+    def __init__(self, db_path: str = "watermarks.db"):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.create_tables()
+        logger.info(f"Watermark database initialized at {db_path}")
+
+    def create_tables(self):
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    symbol TEXT,
+                    interval TEXT,
+                    high_water_ms INTEGER,
+                    PRIMARY KEY (symbol, interval)
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS gaps (
+                    symbol TEXT,
+                    interval TEXT,
+                    start_ms INTEGER,
+                    end_ms INTEGER,
+                    PRIMARY KEY (symbol, interval, start_ms)
+                )
+            """
+            )
+            self.conn.commit()
+
+    def get_high_water(self, symbol: str, interval: str) -> Optional[int]:
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT high_water_ms FROM watermarks WHERE symbol = ? AND interval = ?",
+                (symbol, interval),
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def high_waters(self, interval: str) -> Dict[str, int]:
+        """High-water marks of every symbol of an interval."""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT symbol, high_water_ms FROM watermarks WHERE interval = ?", (interval,)
+            )
+            return dict(cursor.fetchall())
+
+    def set_high_water(self, symbol: str, interval: str, high_water_ms: int) -> None:
+        """Raise the high-water mark; it never moves backwards."""
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO watermarks (symbol, interval, high_water_ms) VALUES (?, ?, ?)
+                ON CONFLICT (symbol, interval)
+                DO UPDATE SET high_water_ms = MAX(high_water_ms, excluded.high_water_ms)
+            """,
+                (symbol, interval, int(high_water_ms)),
+            )
+            self.conn.commit()
+
+    def get_gaps(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT start_ms, end_ms FROM gaps WHERE symbol = ? AND interval = ? "
+                "ORDER BY start_ms",
+                (symbol, interval),
+            )
+            return [(start, end) for start, end in cursor.fetchall()]
+
+    def gapped_symbols(self, interval: str) -> Set[str]:
+        """Symbols of an interval with known gaps."""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT DISTINCT symbol FROM gaps WHERE interval = ?", (interval,))
+            return {row[0] for row in cursor.fetchall()}
+
+    def add_gap(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO gaps (symbol, interval, start_ms, end_ms) "
+                "VALUES (?, ?, ?, ?)",
+                (symbol, interval, int(start_ms), int(end_ms)),
+            )
+            self.conn.commit()
+        logger.info(f"Gap recorded for {symbol} {interval}: {start_ms} - {end_ms}")
+
+    def remove_gap(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> None:
+        """Remove [start_ms, end_ms] from the known gaps, trimming gaps that overlap it."""
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT start_ms, end_ms FROM gaps "
+                "WHERE symbol = ? AND interval = ? AND start_ms <= ? AND end_ms >= ?",
+                (symbol, interval, int(end_ms), int(start_ms)),
+            )
+            overlapping = cursor.fetchall()
+            for gap_start, gap_end in overlapping:
+                cursor.execute(
+                    "DELETE FROM gaps WHERE symbol = ? AND interval = ? AND start_ms = ?",
+                    (symbol, interval, gap_start),
+                )
+                remainders = [(gap_start, start_ms - 1), (end_ms + 1, gap_end)]
+                for rest_start, rest_end in remainders:
+                    if rest_start <= rest_end:
+                        cursor.execute(
+                            "INSERT OR REPLACE INTO gaps (symbol, interval, start_ms, end_ms) "
+                            "VALUES (?, ?, ?, ?)",
+                            (symbol, interval, int(rest_start), int(rest_end)),
+                        )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
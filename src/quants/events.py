@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BarsClosed:
+    """
+    New closed bars were stored for ``symbols``.
+
+    :param close_time: close_time of the newest closed bar, UTC epoch ms
+    """
+
+    interval: str
+    symbols: Tuple[str, ...]
+    close_time: int
+
+
+def coalesce(events: List[Any]) -> List[Any]:
+    """Merge ``BarsClosed`` events of the same bar into one, keeping other events as they are."""
+    merged: Dict[Tuple[str, int], Dict[str, None]] = {}
+    others = []
+    for event in events:
+        if isinstance(event, BarsClosed):
+            symbols = merged.setdefault((event.interval, event.close_time), {})
+            symbols.update(dict.fromkeys(event.symbols))
+        else:
+            others.append(event)
+    bars_closed = [
+        BarsClosed(interval, tuple(symbols), close_time)
+        for (interval, close_time), symbols in merged.items()
+    ]
+    return bars_closed + others
+
+
+class EventBus:
+    """
+    In-process publish/subscribe. ``publish`` only enqueues; one dispatcher thread runs the
+    handlers, in order, so publishers (collector and stream threads) never wait on them.
+
+    Events published within ``coalesce_seconds`` of each other are delivered together, so
+    the per-symbol ``BarsClosed`` events of a stream reach handlers as one event per bar.
+    """
+
+    def __init__(self, coalesce_seconds: float = 0.5):
+        self.coalesce_seconds = coalesce_seconds
+        self.handlers: Dict[Type, List[Callable[[Any], None]]] = defaultdict(list)
+        self.queue: "queue.Queue[Optional[Any]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+
+    def subscribe(self, event_type: Type, handler: Callable[[Any], None]) -> None:
+        self.handlers[event_type].append(handler)
+
+    def publish(self, event: Any) -> None:
+        self.queue.put(event)
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._dispatch, name="event-bus", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _dispatch(self) -> None:
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            events = [event]
+            deadline = time.monotonic() + self.coalesce_seconds
+            stopping = False
+            while not stopping:
+                try:
+                    event = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if event is None:
+                    stopping = True
+                else:
+                    events.append(event)
+            for event in coalesce(events):
+                self.deliver(event)
+            if stopping:
+                return
+
+    def deliver(self, event: Any) -> None:
+        """Run the handlers of ``event`` on the calling thread."""
+        for handler in self.handlers.get(type(event), []):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Handler {handler} failed on {event}: {e}")
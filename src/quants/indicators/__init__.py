@@ -0,0 +1,46 @@
+"""
+Technical indicators over whole universes: every kernel takes (bars, symbols) arrays, as in
+``PricePanel``, or 1-D arrays of one symbol, and computes all symbols in one call.
+
+Recursive filters (EMA, Wilder smoothing) run on numba when it is installed and on NumPy
+otherwise; pass ``backend="numpy"`` or ``"numba"`` to choose.
+
+NaN marks a bar a symbol lacks, before it listed or in a gap. Such bars get NaN; recursive
+filters skip them and continue from the bar before, rolling windows holding one are NaN.
+"""
+
+from .kernels import (
+    atr,
+    available_backends,
+    bollinger,
+    default_backend,
+    ema,
+    ewm_mean,
+    macd,
+    momentum,
+    rma,
+    rolling_std,
+    rsi,
+    shift,
+    sma,
+    true_range,
+    zscore,
+)
+
+__all__ = [
+    "atr",
+    "available_backends",
+    "bollinger",
+    "default_backend",
+    "ema",
+    "ewm_mean",
+    "macd",
+    "momentum",
+    "rma",
+    "rolling_std",
+    "rsi",
+    "shift",
+    "sma",
+    "true_range",
+    "zscore",
+]
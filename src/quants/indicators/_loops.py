@@ -0,0 +1,64 @@
+"""
+Recursive filters as explicit loops over each symbol's bars. They run as plain Python, or
+compiled when numba is installed; ``kernels`` picks the backend.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: kernels fall back to NumPy
+    numba = None
+
+
+def ema_loop(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    for j in _range(values.shape[1]):
+        count = 0
+        total = 0.0
+        state = 0.0
+        for t in range(values.shape[0]):
+            x = values[t, j]
+            if math.isnan(x):
+                continue
+            count += 1
+            if count < period:
+                total += x
+                continue
+            if count == period:
+                state = (total + x) / period
+            else:
+                state = alpha * x + (1 - alpha) * state
+            out[t, j] = state
+    return out
+
+
+def ewm_mean_loop(values: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    decay = 1 - alpha
+    for j in _range(values.shape[1]):
+        count = 0
+        weighted = 0.0
+        weights = 0.0
+        for t in range(values.shape[0]):
+            x = values[t, j]
+            if math.isnan(x):
+                continue
+            count += 1
+            weighted = x + decay * weighted
+            weights = 1 + decay * weights
+            if count >= min_periods:
+                out[t, j] = weighted / weights
+    return out
+
+
+if numba is not None:
+    _range = numba.prange
+    ema_loop = numba.njit(parallel=True, cache=True)(ema_loop)
+    ewm_mean_loop = numba.njit(parallel=True, cache=True)(ewm_mean_loop)
+else:
+    _range = range
+
+JIT_AVAILABLE = numba is not None
@@ -0,0 +1,218 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import _loops
+
+# elements per block of the rolling kernels: bounds cumulative-sum drift and temporaries
+BLOCK_ELEMENTS = 1 << 22
+
+
+def available_backends() -> List[str]:
+    return ["numba", "numpy"] if _loops.JIT_AVAILABLE else ["numpy"]
+
+
+def default_backend() -> str:
+    return available_backends()[0]
+
+
+def _as_2d(values: np.ndarray) -> Tuple[np.ndarray, bool]:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        return values[:, None], True
+    return values, False
+
+
+def _restore(values: np.ndarray, flat: bool) -> np.ndarray:
+    return values[:, 0] if flat else values
+
+
+def _backend(backend: Optional[str]) -> str:
+    backend = backend or default_backend()
+    if backend not in available_backends():
+        raise ValueError(f"Indicator backend {backend} is not available")
+    return backend
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """``Series.shift`` along the bar axis."""
+    values = np.asarray(values, dtype=np.float64)
+    shifted = np.full(values.shape, np.nan)
+    if 0 <= periods < len(values):
+        shifted[periods:] = values[: len(values) - periods]
+    return shifted
+
+
+def _blocks(values: np.ndarray, period: int) -> Iterator[Tuple[int, int, int]]:
+    """Row blocks with the ``period`` rows before them: (start, stop, first row read)."""
+    rows = max(BLOCK_ELEMENTS // max(values[0].size, 1), period)
+    for start in range(0, len(values), rows):
+        yield start, min(start + rows, len(values)), max(start - period, 0)
+
+
+def _cumsum(values: np.ndarray) -> np.ndarray:
+    """Cumulative sums along the bar axis, after a row of zeros."""
+    out = np.zeros((len(values) + 1, *values.shape[1:]))
+    np.cumsum(values, axis=0, out=out[1:])
+    return out
+
+
+def _rolling_moments(
+    values: np.ndarray, period: int, ddof: Optional[int] = None
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Rolling mean and, given ``ddof``, variance of full windows (NaN where a window lacks a
+    bar), from cumulative sums restarted every block around the block's mean.
+    """
+    mean = np.full(values.shape, np.nan)
+    var = np.full(values.shape, np.nan) if ddof is not None else None
+    if period > len(values):
+        return mean, var
+    for start, stop, first in _blocks(values, period):
+        block = values[first:stop]
+        valid = ~np.isnan(block)
+        center = np.nansum(block, axis=0) / np.maximum(valid.sum(axis=0), 1)
+        centered = np.where(valid, block - center, 0)
+        # cumulative row c sums the block rows before c, so the windows ending at block
+        # rows lo .. hi - 1 are cumulative rows lo + 1 .. hi minus those period earlier
+        lo, hi = max(start, period - 1) - first, stop - first
+        rows, earlier = slice(lo + 1, hi + 1), slice(lo + 1 - period, hi + 1 - period)
+        sums = _cumsum(centered)
+        total = sums[rows] - sums[earlier]
+        full = None
+        if not valid.all():
+            counts = _cumsum(valid)
+            full = counts[rows] - counts[earlier] == period
+        out_rows = slice(lo + first, hi + first)
+        mean[out_rows] = total / period + center
+        if var is not None:
+            squares = _cumsum(centered * centered)
+            spread = squares[rows] - squares[earlier] - total * total / period
+            var[out_rows] = np.maximum(spread, 0) / (period - ddof)
+        if full is not None:
+            mean[out_rows][~full] = np.nan
+            if var is not None:
+                var[out_rows][~full] = np.nan
+    return mean, var
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average: ``rolling(period).mean()``."""
+    values, flat = _as_2d(values)
+    return _restore(_rolling_moments(values, period)[0], flat)
+
+
+def rolling_std(values: np.ndarray, period: int, ddof: int = 1) -> np.ndarray:
+    """``rolling(period).std(ddof=ddof)``."""
+    values, flat = _as_2d(values)
+    return _restore(np.sqrt(_rolling_moments(values, period, ddof)[1]), flat)
+
+
+def ema(values: np.ndarray, period: int, backend: Optional[str] = None) -> np.ndarray:
+    """
+    Exponential moving average with ``alpha = 2 / (period + 1)``, seeded with the simple
+    average of each symbol's first ``period`` bars (pandas_ta's ``ema``). NaN bars are
+    skipped.
+    """
+    values, flat = _as_2d(values)
+    alpha = 2 / (period + 1)
+    if _backend(backend) == "numba":
+        return _restore(_loops.ema_loop(values, period, alpha), flat)
+    valid = ~np.isnan(values)
+    count = np.cumsum(valid, axis=0)
+    seeded = np.where(count >= period, values, np.nan)
+    # the period-th bar of each symbol starts from the average of its first period bars
+    seed = valid & (count == period)
+    rows, columns = np.nonzero(seed)
+    seeded[rows, columns] = np.cumsum(np.where(valid, values, 0), axis=0)[seed] / period
+    out = pd.DataFrame(seeded).ewm(alpha=alpha, adjust=False, ignore_na=True).mean()
+    return _restore(np.where(np.isnan(seeded), np.nan, out.to_numpy()), flat)
+
+
+def ewm_mean(
+    values: np.ndarray, alpha: float, min_periods: int = 0, backend: Optional[str] = None
+) -> np.ndarray:
+    """``ewm(alpha=alpha, min_periods=min_periods, ignore_na=True).mean()``."""
+    values, flat = _as_2d(values)
+    if _backend(backend) == "numba":
+        return _restore(_loops.ewm_mean_loop(values, alpha, min_periods), flat)
+    out = pd.DataFrame(values).ewm(alpha=alpha, min_periods=min_periods, ignore_na=True).mean()
+    return _restore(np.where(np.isnan(values), np.nan, out.to_numpy()), flat)
+
+
+def rma(values: np.ndarray, period: int, backend: Optional[str] = None) -> np.ndarray:
+    """Wilder's moving average, as pandas_ta's ``rma``."""
+    return ewm_mean(values, 1 / period, period, backend)
+
+
+def momentum(values: np.ndarray, period: int = 10) -> np.ndarray:
+    """Close minus the close ``period`` bars earlier."""
+    return np.asarray(values, dtype=np.float64) - shift(values, period)
+
+
+def rsi(close: np.ndarray, period: int = 14, backend: Optional[str] = None) -> np.ndarray:
+    """Relative strength index (0-100) from Wilder-smoothed gains and losses."""
+    change = np.asarray(close, dtype=np.float64) - shift(close, 1)
+    gains = rma(np.clip(change, 0, None), period, backend)
+    losses = rma(np.clip(-change, 0, None), period, backend)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 * gains / (gains + losses)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Largest of high - low and the distances of high and low from the previous close."""
+    high, low, close = (np.asarray(v, dtype=np.float64) for v in (high, low, close))
+    previous = shift(close, 1)
+    ranges = np.stack([high - low, np.abs(high - previous), np.abs(low - previous)])
+    out = np.max(ranges, axis=0)
+    out[np.isnan(previous)] = np.nan
+    return out
+
+
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    backend: Optional[str] = None,
+) -> np.ndarray:
+    """Average true range, Wilder-smoothed."""
+    return rma(true_range(high, low, close), period, backend)
+
+
+def macd(
+    close: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    backend: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    :return: ``macd`` (fast EMA minus slow EMA), ``signal`` (EMA of macd) and
+        ``histogram`` (macd minus signal)
+    """
+    line = ema(close, fast, backend) - ema(close, slow, backend)
+    signal_line = ema(line, signal, backend)
+    return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+
+
+def bollinger(
+    close: np.ndarray, period: int = 20, width: float = 2.0, ddof: int = 0
+) -> Dict[str, np.ndarray]:
+    """
+    :return: ``lower``, ``middle`` (SMA) and ``upper`` bands, ``width`` standard
+        deviations from the middle
+    """
+    values, flat = _as_2d(close)
+    middle, var = _rolling_moments(values, period, ddof)
+    middle, deviation = _restore(middle, flat), _restore(width * np.sqrt(var), flat)
+    return {"lower": middle - deviation, "middle": middle, "upper": middle + deviation}
+
+
+def zscore(values: np.ndarray, period: int = 30, ddof: int = 1) -> np.ndarray:
+    """Distance from the rolling mean in rolling standard deviations."""
+    values, flat = _as_2d(values)
+    mean, var = _rolling_moments(values, period, ddof)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _restore((values - mean) / np.sqrt(var), flat)
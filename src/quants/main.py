@@ -1,10 +1,13 @@
 import logging
+import os
 import time
 from typing import Any
 
 from src.quants.analysis_runner import AnalysisRunner
 from src.quants.auth import BinanceAuth
 from src.quants.data_collector import BinanceDataCollector
+from src.quants.events import EventBus
+from src.quants.ml.feature_store import FeatureStore, price_features
 from src.quants.platform import BinancePlatform
 from src.quants.strategy_runner import StrategyRunner
 from src.quants.task_scheduler import AdvancedTaskScheduler
@@ -21,18 +24,22 @@ logger = get_logger(__name__)
 
 def update_interval_data(collector: BinanceDataCollector, kline_interval: str):
     logger.info(f"Starting data update for interval: {kline_interval}")
-    collector.update_data_for_interval(kline_interval)
+    symbols = collector.get_all_usdt_pairs()
+    # series that already hold their last closed bar have nothing to fetch
+    stale = collector.stale_symbols(kline_interval, symbols)
+    logger.info(f"{len(stale)} of {len(symbols)} symbols need {kline_interval} bars")
+    collector.update_data_for_interval(kline_interval, symbols=stale)
     logger.info(
         f"Data collection and update completed for all USDT pairs for interval: {kline_interval}"
     )
 
 
-def run_strategy(
-    strategy_runner: StrategyRunner, strategy_name: str, symbol: str, kline_interval: str
+def run_strategy_interval(
+    strategy_runner: StrategyRunner, strategy_name: str, kline_interval: str
 ):
-    logger.info(f"Running {strategy_name} strategy for {symbol} on {kline_interval} interval")
-    strategy_runner.run_strategy(strategy_name, symbol, kline_interval)
-    logger.info(f"Strategy {strategy_name} completed for {symbol} on {kline_interval} interval")
+    logger.info(f"Running {strategy_name} strategy for all symbols on {kline_interval} interval")
+    strategy_runner.run_interval(strategy_name, kline_interval)
+    logger.info(f"Strategy {strategy_name} completed for all symbols on {kline_interval} interval")
 
 
 # def run_analysis(analysis_runner: AnalysisRunner, analysis_name: str, symbols: list[str], interval: str):
@@ -46,8 +53,17 @@ def main():
     app_config = ConfigFactory.create_app_config(full_config)
 
     auth = BinanceAuth(app_config.cex.api_key, app_config.cex.api_secret)
-    platform = BinancePlatform(auth)
-    collector = BinanceDataCollector(platform, app_config)
+    platform = BinancePlatform(
+        auth,
+        base_url=app_config.cex.base_url,
+        weight_limit=app_config.cex.request_weight_limit,
+        pool_size=app_config.cex.refresh_workers,
+        stream_url=app_config.cex.stream_url,
+        metadata_ttl_seconds=app_config.cex.metadata_ttl_seconds,
+        metadata_snapshot_path=app_config.cex.metadata_snapshot_path,
+    )
+    events = EventBus()
+    collector = BinanceDataCollector(platform, app_config, events=events)
 
     strategy_runner = StrategyRunner(collector, app_config)
     # analysis_runner = AnalysisRunner(collector, app_config.analysis)
@@ -65,30 +81,33 @@ def main():
     #         interval="1d"  # Use daily data for analysis
     #     )
 
-    # Schedule tasks for each kline interval
-    for interval in app_config.cex.kline_intervals:
-        scheduler.add_task(
-            name=f"update_data_{interval}",
-            interval=interval,
-            task=update_interval_data,
-            collector=collector,
-            kline_interval=interval,
+    # Schedule tasks for each kline interval; in stream mode REST only catches up at startup
+    streaming = app_config.cex.ingestion == "stream"
+    # intervals derived from cex.base_interval are resampled locally, not fetched
+    fetch_intervals = collector.fetch_intervals(app_config.cex.kline_intervals)
+    if not streaming:
+        for interval in fetch_intervals:
+            scheduler.add_task(
+                name=f"update_data_{interval}",
+                interval=interval,
+                task=update_interval_data,
+                collector=collector,
+                kline_interval=interval,
+            )
+
+    # strategies run when the collector reports closed bars, on exactly the affected symbols
+    strategy_runner.subscribe(events)
+
+    feature_store = None
+    if app_config.data_storage.features_enabled:
+        # features are computed on the store's own thread, off the strategy path
+        feature_store = FeatureStore(
+            collector.storage,
+            price_features(),
+            os.path.join(app_config.data_storage.data_path, "features"),
         )
-
-    for strategy_name in strategy_runner.get_available_strategies():
-        for interval in app_config.cex.kline_intervals:
-            for symbol in platform.get_all_usdt_pairs():
-                task_name = f"run_strategy_{strategy_name}_{symbol}_{interval}"
-                scheduler.add_task(
-                    name=task_name,
-                    interval=interval,
-                    task=run_strategy,
-                    runner=strategy_runner,
-                    strategy_name=strategy_name,
-                    symbol=symbol,
-                    kline_interval=interval,
-                )
-                logger.debug(f"Scheduled task: {task_name}")
+        feature_store.subscribe(events)
+        feature_store.start()
 
     # Schedule log cleaning task
     scheduler.add_task(
@@ -103,13 +122,18 @@ def main():
         scheduler.run()
         logger.info("Scheduler started. Waiting for tasks to run...")
 
-        for interval in app_config.cex.kline_intervals:
+        for interval in fetch_intervals:
             update_interval_data(collector, interval)
 
+        if streaming:
+            collector.start_streaming(fetch_intervals)
+
+        # one pass over every series at startup; afterwards only new bars trigger runs
         for strategy_name in strategy_runner.get_available_strategies():
             for interval in app_config.cex.kline_intervals:
-                for symbol in platform.get_all_usdt_pairs():
-                    run_strategy(strategy_runner, strategy_name, symbol, interval)
+                run_strategy_interval(strategy_runner, strategy_name, interval)
+        # bars closed meanwhile are queued and delivered from here on
+        events.start()
 
         while True:
             time.sleep(60)  # Sleep for 60 seconds
@@ -117,6 +141,11 @@ def main():
     except KeyboardInterrupt:
         logger.info("Stopping scheduler...")
         scheduler.stop()
+        events.stop()
+        if feature_store is not None:
+            feature_store.stop()
+        strategy_runner.close()
+        collector.close()
 
 
 if __name__ == "__main__":
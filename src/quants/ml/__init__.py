@@ -0,0 +1,26 @@
+from .base import TradingModel
+from .feature_store import Feature, FeatureSet, FeatureStore, price_features
+from .walk_forward import (
+    DatasetSource,
+    Fold,
+    FoldResult,
+    ModelScorer,
+    WalkForward,
+    score_latest,
+    walk_forward_folds,
+)
+
+__all__ = [
+    "DatasetSource",
+    "Feature",
+    "FeatureSet",
+    "FeatureStore",
+    "Fold",
+    "FoldResult",
+    "ModelScorer",
+    "TradingModel",
+    "WalkForward",
+    "price_features",
+    "score_latest",
+    "walk_forward_folds",
+]
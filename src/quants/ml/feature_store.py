@@ -0,0 +1,247 @@
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..events import BarsClosed, EventBus
+from ..storage import NpyStorage
+from ..storage.base import BaseStorage
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+UpdateListener = Callable[[str, List[str]], None]
+
+
+@dataclass(frozen=True)
+class Feature:
+    """
+    :param compute: Feature values for a frame of bars, aligned with its rows
+    :param lookback: Earlier bars a value depends on
+    """
+
+    name: str
+    compute: Callable[[pd.DataFrame], pd.Series]
+    lookback: int
+
+
+@dataclass(frozen=True)
+class FeatureSet:
+    """
+    Named, versioned list of features. Stored matrices of one version never mix feature
+    definitions: changing the features means bumping ``version``.
+
+    :param bar_columns: Bar columns the features read
+    """
+
+    name: str
+    features: Tuple[Feature, ...]
+    version: int = 1
+    bar_columns: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+    @property
+    def columns(self) -> List[str]:
+        return [feature.name for feature in self.features]
+
+    @property
+    def lookback(self) -> int:
+        return max((feature.lookback for feature in self.features), default=0)
+
+    def compute(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """Feature matrix of ``bars``: open_time, close_time and one float column per feature."""
+        matrix = bars[["open_time", "close_time"]].reset_index(drop=True)
+        for feature in self.features:
+            values = feature.compute(bars)
+            matrix[feature.name] = np.asarray(values, dtype=np.float64)
+        return matrix
+
+
+def price_features() -> FeatureSet:
+    """Returns, volatility, volume and range features of OHLCV bars."""
+
+    def log_return(bars: int) -> Callable[[pd.DataFrame], pd.Series]:
+        return lambda data: np.log(data["close"]).diff(bars)
+
+    def range_position(data: pd.DataFrame) -> pd.Series:
+        low = data["low"].rolling(24).min()
+        return (data["close"] - low) / (data["high"].rolling(24).max() - low)
+
+    return FeatureSet(
+        "price",
+        (
+            Feature("log_return_1", log_return(1), 1),
+            Feature("log_return_4", log_return(4), 4),
+            Feature("log_return_24", log_return(24), 24),
+            Feature(
+                "volatility_24",
+                lambda data: np.log(data["close"]).diff().rolling(24).std(),
+                24,
+            ),
+            Feature(
+                "volume_ratio_24",
+                lambda data: data["volume"] / data["volume"].rolling(24).mean(),
+                23,
+            ),
+            Feature(
+                "sma_ratio_48",
+                lambda data: data["close"] / data["close"].rolling(48).mean() - 1,
+                47,
+            ),
+            Feature("range_position_24", range_position, 23),
+        ),
+    )
+
+
+def _open_times(storage: BaseStorage, symbol: str, interval: str) -> np.ndarray:
+    data = storage.read(symbol, interval, columns=["open_time"])
+    if data.empty:
+        return np.empty(0, dtype=np.int64)
+    return data["open_time"].to_numpy(dtype=np.int64)
+
+
+class FeatureStore:
+    """
+    Feature matrices of one ``FeatureSet`` per symbol and interval, materialized from the
+    bar storage into columnar ``NpyStorage`` under ``<root>/<name>/v<version>``.
+
+    Matrices hold closed bars only and grow incrementally: an update computes the new
+    bars plus the ``lookback`` bars before them. If bars were inserted before the newest
+    stored row (a backfill), the matrix is rebuilt.
+
+    Subscribed to an ``EventBus``, the store updates on its own thread, so the bus (and
+    the strategies it runs) never waits for feature computation or for update listeners.
+    """
+
+    META_FILE = "features.json"
+
+    def __init__(self, bars: BaseStorage, feature_set: FeatureSet, root: str):
+        self.bars = bars
+        self.feature_set = feature_set
+        self.path = os.path.join(root, feature_set.name, f"v{feature_set.version}")
+        self.storage = NpyStorage(self.path)
+        self._check_version()
+        self.update_listeners: List[UpdateListener] = []
+        self.queue: "queue.Queue[Optional[BarsClosed]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+
+    def _check_version(self) -> None:
+        meta_path = os.path.join(self.path, self.META_FILE)
+        meta = {
+            "name": self.feature_set.name,
+            "version": self.feature_set.version,
+            "columns": self.feature_set.columns,
+        }
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as file:
+                stored = json.load(file)
+            if stored["columns"] != meta["columns"]:
+                raise ValueError(
+                    f"Feature set {self.feature_set.name} v{self.feature_set.version} is "
+                    f"stored with columns {stored['columns']}; bump its version"
+                )
+            return
+        with open(meta_path + ".tmp", "w") as file:
+            json.dump(meta, file)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def materialize(self, symbol: str, interval: str, now_ms: Optional[int] = None) -> int:
+        """
+        Bring the feature matrix of a series up to its last closed bar.
+
+        :param now_ms: Bars closing before this are closed; defaults to the current time
+        :return: Number of feature rows written
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        bar_times = _open_times(self.bars, symbol, interval)
+        if not len(bar_times):
+            return 0
+        stored = _open_times(self.storage, symbol, interval)
+        done = int(np.searchsorted(bar_times, stored[-1], side="right")) if len(stored) else 0
+        incremental = done > 0 and done == len(stored)
+        if incremental and done == len(bar_times):
+            return 0
+        if done != len(stored):
+            logger.warning(f"Bars of {symbol} {interval} changed, rebuilding its features")
+
+        start = max(done - self.feature_set.lookback, 0) if incremental else 0
+        bars = self.bars.read(
+            symbol,
+            interval,
+            columns=["close_time", *self.feature_set.bar_columns],
+            start_time=int(bar_times[start]),
+        )
+        bars = bars[bars["close_time"].to_numpy(dtype=np.int64) < now_ms]
+        features = self.feature_set.compute(bars)
+        if incremental:
+            features = features.iloc[done - start :]
+            if features.empty:
+                return 0
+            return self.storage.append(symbol, interval, features)
+        if features.empty:
+            return 0
+        self.storage.write(symbol, interval, features)
+        return len(features)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+    ) -> pd.DataFrame:
+        return self.storage.read(symbol, interval, start_time=start_time, end_time=end_time)
+
+    def latest(self, symbols: Sequence[str], interval: str) -> pd.DataFrame:
+        """Newest feature row of each symbol with features, indexed by symbol."""
+        rows = {}
+        for symbol in symbols:
+            data = self.storage.read_recent(symbol, interval, 1)
+            if not data.empty:
+                rows[symbol] = data.iloc[-1]
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def add_update_listener(self, listener: UpdateListener) -> None:
+        """Call ``listener(interval, symbols)`` on the store's thread after each update."""
+        self.update_listeners.append(listener)
+
+    def subscribe(self, events: EventBus) -> None:
+        events.subscribe(BarsClosed, self.on_bars_closed)
+
+    def on_bars_closed(self, event: BarsClosed) -> None:
+        self.queue.put(event)
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._work, name="feature-store", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def _work(self) -> None:
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            updated = []
+            for symbol in event.symbols:
+                try:
+                    if self.materialize(symbol, event.interval, now_ms=event.close_time + 1):
+                        updated.append(symbol)
+                except Exception as e:
+                    logger.error(f"Feature update failed for {symbol} {event.interval}: {e}")
+            if not updated:
+                continue
+            for listener in self.update_listeners:
+                try:
+                    listener(event.interval, updated)
+                except Exception as e:
+                    logger.error(f"Feature update listener failed on {event.interval}: {e}")
@@ -0,0 +1,260 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from ..storage import NpyStorage, StorageFactory
+from ..utils.logger import get_logger
+from ..utils.timeframes import interval_to_ms
+from .base import TradingModel
+from .feature_store import FeatureStore
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Train and test windows of one walk-forward fold: [start, end) open times, UTC epoch ms."""
+
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def walk_forward_folds(
+    start_ms: int,
+    end_ms: int,
+    interval: str,
+    train_bars: int,
+    test_bars: int,
+    gap_bars: int = 0,
+    expanding: bool = False,
+) -> List[Fold]:
+    """
+    Consecutive test windows of ``test_bars`` covering ``start_ms`` to ``end_ms`` (the last
+    open time), each trained on the bars before it.
+
+    :param gap_bars: Bars left out between train and test, at least the target horizon so
+        training targets never look into the test window
+    :param expanding: Train on every bar since ``start_ms`` instead of the last ``train_bars``
+    """
+    step = interval_to_ms(interval)
+    folds = []
+    test_start = start_ms + (train_bars + gap_bars) * step
+    while test_start <= end_ms:
+        train_end = test_start - gap_bars * step
+        train_start = start_ms if expanding else train_end - train_bars * step
+        test_end = min(test_start + test_bars * step, end_ms + step)
+        folds.append(Fold(len(folds), train_start, train_end, test_start, test_end))
+        test_start += test_bars * step
+    return folds
+
+
+@dataclass(frozen=True)
+class DatasetSource:
+    """
+    Where fold workers read their data: feature matrices of a ``FeatureStore`` and the bars
+    they were computed from, opened in each process.
+
+    :param feature_path: ``FeatureStore.path``
+    :param horizon: Bars ahead of the target, the log return from a bar's close
+    """
+
+    feature_path: str
+    backend: str
+    data_path: str
+    interval: str
+    symbols: Tuple[str, ...]
+    horizon: int = 1
+
+    @property
+    def feature_columns(self) -> List[str]:
+        with open(os.path.join(self.feature_path, FeatureStore.META_FILE), "r") as file:
+            return json.load(file)["columns"]
+
+    def load(self, start_ms: int, end_ms: int) -> pd.DataFrame:
+        """
+        Features and targets of every symbol for open times in [start_ms, end_ms).
+
+        :return: symbol, open_time, the feature columns and target; targets past the stored
+            bars are NaN
+        """
+        features = NpyStorage(self.feature_path)
+        bars = StorageFactory.create_storage(self.backend, self.data_path, catalog=False)
+        step = interval_to_ms(self.interval)
+        columns = ["open_time", *self.feature_columns]
+        frames = []
+        for symbol in self.symbols:
+            data = features.read(
+                symbol, self.interval, columns=columns, start_time=start_ms, end_time=end_ms - 1
+            )
+            if data.empty:
+                continue
+            close = bars.read(
+                symbol,
+                self.interval,
+                columns=["close"],
+                start_time=start_ms,
+                end_time=end_ms - 1 + self.horizon * step,
+            )
+            target = np.log(close["close"].shift(-self.horizon) / close["close"])
+            target.index = close["open_time"]
+            data.insert(0, "symbol", symbol)
+            data["target"] = target.reindex(data["open_time"]).to_numpy()
+            frames.append(data)
+        if not frames:
+            return pd.DataFrame(columns=["symbol", *columns, "target"])
+        return pd.concat(frames, ignore_index=True)
+
+
+@dataclass
+class FoldResult:
+    """
+    :param score: ``evaluate`` of the fold's model on its test window, None if a window
+        had no rows
+    :param predictions: symbol, open_time, target and prediction of every test row
+    """
+
+    fold: Fold
+    score: Any
+    train_rows: int
+    test_rows: int
+    predictions: pd.DataFrame
+    model: Optional[TradingModel] = None
+
+
+def _run_fold(
+    model_class: Type[TradingModel],
+    model_params: Dict[str, Any],
+    source: DatasetSource,
+    fold: Fold,
+) -> FoldResult:
+    train = source.load(fold.train_start, fold.train_end).dropna()
+    test = source.load(fold.test_start, fold.test_end).dropna()
+    if train.empty or test.empty:
+        return FoldResult(fold, None, len(train), len(test), pd.DataFrame())
+    model = model_class(train, **model_params)
+    model.preprocess()
+    model.train()
+    X, y = test[source.feature_columns], test["target"]
+    predictions = test[["symbol", "open_time", "target"]].assign(
+        prediction=np.asarray(model.predict(X))
+    )
+    return FoldResult(fold, model.evaluate(X, y), len(train), len(test), predictions, model)
+
+
+class WalkForward:
+    """
+    Trains and evaluates one model per fold in worker processes, every fold on all symbols
+    of the source at once.
+
+    A model is built as ``model_class(train, **model_params)`` from the fold's training
+    frame (symbol, open_time, feature columns, target), then ``preprocess``ed and
+    ``train``ed; it ``predict``s and ``evaluate``s the feature columns of the test frame.
+    """
+
+    def __init__(
+        self,
+        model_class: Type[TradingModel],
+        source: DatasetSource,
+        model_params: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+    ):
+        self.model_class = model_class
+        self.source = source
+        self.model_params = model_params or {}
+        self.workers = workers or os.cpu_count() or 1
+
+    def folds(
+        self,
+        start_ms: int,
+        end_ms: int,
+        train_bars: int,
+        test_bars: int,
+        expanding: bool = False,
+    ) -> List[Fold]:
+        """Folds whose train and test windows are separated by the target horizon."""
+        return walk_forward_folds(
+            start_ms,
+            end_ms,
+            self.source.interval,
+            train_bars,
+            test_bars,
+            self.source.horizon,
+            expanding,
+        )
+
+    def run(self, folds: Sequence[Fold]) -> List[FoldResult]:
+        if not folds:
+            return []
+        logger.info(
+            f"Walk-forward of {self.model_class.__name__} over {len(folds)} folds and "
+            f"{len(self.source.symbols)} symbols"
+        )
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(folds)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(_run_fold, self.model_class, self.model_params, self.source, fold)
+                for fold in folds
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def summary(results: Sequence[FoldResult]) -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                {
+                    "fold": result.fold.index,
+                    "test_start": result.fold.test_start,
+                    "test_end": result.fold.test_end,
+                    "train_rows": result.train_rows,
+                    "test_rows": result.test_rows,
+                    "score": result.score,
+                }
+                for result in results
+            ]
+        )
+
+
+def score_latest(
+    model: TradingModel, store: FeatureStore, symbols: Sequence[str], interval: str
+) -> pd.Series:
+    """Predictions for the newest feature row of every symbol, in one ``predict`` call."""
+    latest = store.latest(symbols, interval)
+    if latest.empty:
+        return pd.Series(dtype=np.float64)
+    X = latest[store.feature_set.columns].astype(np.float64).dropna()
+    if X.empty:
+        return pd.Series(dtype=np.float64)
+    return pd.Series(np.asarray(model.predict(X), dtype=np.float64), index=X.index)
+
+
+class ModelScorer:
+    """
+    Keeps the latest prediction of a model for every symbol of an interval, rescoring the
+    updated symbols in one batch whenever the feature store updates them. Runs on the
+    feature store's thread, off the strategy path.
+    """
+
+    def __init__(self, model: TradingModel, store: FeatureStore, interval: str):
+        self.model = model
+        self.store = store
+        self.interval = interval
+        self.scores = pd.Series(dtype=np.float64)
+        store.add_update_listener(self.on_features_updated)
+
+    def on_features_updated(self, interval: str, symbols: List[str]) -> None:
+        if interval != self.interval:
+            return
+        scores = score_latest(self.model, self.store, symbols, interval)
+        # replaced rather than updated in place, so readers see one consistent series
+        self.scores = pd.concat([self.scores.drop(scores.index, errors="ignore"), scores])
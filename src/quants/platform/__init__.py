@@ -1,3 +1,12 @@
 from .binance import BinancePlatform
+from .metadata import ExchangeMetadata, ExchangeMetadataCache, SymbolInfo
+from .transport import HttpTransport, ResponseCache
 
-__all__ = ["BinancePlatform"]
+__all__ = [
+    "BinancePlatform",
+    "ExchangeMetadata",
+    "ExchangeMetadataCache",
+    "HttpTransport",
+    "ResponseCache",
+    "SymbolInfo",
+]
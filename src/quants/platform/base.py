@@ -3,16 +3,16 @@ from typing import Any, Dict, List, Union
 
 
 class BasePlatform(ABC):
-    @abstractmethod
     def get_historical_klines(
         self, symbol: str, interval: str, start_time: str, end_time: str
     ) -> List[List[Any]]:
-        pass
+        """Only exchanges that serve klines implement this."""
+        raise NotImplementedError(f"{type(self).__name__} does not serve klines")
 
     @abstractmethod
     def get_exchange_info(self) -> Dict[str, Any]:
         pass
 
-    @abstractmethod
     def get_all_usdt_pairs(self) -> List[str]:
-        pass
+        """Only exchanges with USDT spot markets implement this."""
+        raise NotImplementedError(f"{type(self).__name__} does not list trading pairs")
@@ -1,12 +1,20 @@
-from typing import Any, Dict, List, Union
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Union
 
+import numpy as np
 import pandas as pd
+import requests
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
+from requests.adapters import HTTPAdapter
 
 from ..auth.binance import BinanceAuth
 from ..utils import get_logger
+from ..utils.timeframes import to_epoch_ms
 from .base import BasePlatform
+from .binance_stream import BinanceKlineStream
+from .metadata import ExchangeMetadata, ExchangeMetadataCache, SymbolInfo
+from .rate_limit import WeightRateLimiter
 
 logger = get_logger(__name__)
 
@@ -37,53 +45,208 @@ class BinancePlatform(BasePlatform):
         "1d": Client.KLINE_INTERVAL_1DAY,
     }
 
-    def __init__(self, auth: BinanceAuth):
+    KLINES_LIMIT = 1000
+    KLINES_WEIGHT = 2
+    EXCHANGE_INFO_WEIGHT = 20
+    TICKER_24H_ALL_WEIGHT = 80
+
+    # columns kept as int64; everything else is parsed as float64
+    KLINE_INT_COLS = ("open_time", "close_time", "number_of_trades")
+    _KLINE_STRIP = str.maketrans("", "", '[]"')
+
+    def __init__(
+        self,
+        auth: BinanceAuth,
+        base_url: str = "https://api.binance.com",
+        weight_limit: int = 6000,
+        pool_size: int = 16,
+        timeout: float = 10.0,
+        max_retries: int = 5,
+        stream_url: str = "wss://stream.binance.com:9443",
+        metadata_ttl_seconds: float = 300.0,
+        metadata_snapshot_path: Optional[str] = None,
+    ):
         self.auth = auth
         self.client = auth.get_client()
         self.spot = auth.get_spot()
+        self.base_url = base_url.rstrip("/")
+        self.stream_url = stream_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = WeightRateLimiter(weight_limit=weight_limit)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=pool_size))
+        self.metadata_cache = ExchangeMetadataCache(
+            lambda: self._public_request("/api/v3/exchangeInfo", {}, self.EXCHANGE_INFO_WEIGHT),
+            ttl_seconds=metadata_ttl_seconds,
+            snapshot_path=metadata_snapshot_path,
+        )
+
+    def _public_request(
+        self, path: str, params: Dict[str, Any], weight: int, raw: bool = False
+    ) -> Any:
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(weight)
+            response = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            self.rate_limiter.record_response(response.status_code, response.headers)
+            if (
+                response.status_code in WeightRateLimiter.LIMIT_STATUS_CODES
+                and attempt < self.max_retries
+            ):
+                continue
+            if not response.ok:
+                raise BinanceAPIException(response, response.status_code, response.text)
+            return response.text if raw else response.json()
+
+    def _kline_pages(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int, raw: bool = False
+    ) -> Iterator[Any]:
+        """Yield 1000-bar pages of klines with open_time in [start_ms, end_ms]."""
+        while start_ms <= end_ms:
+            params = {
+                "symbol": symbol,
+                "interval": self.KLINE_INTERVALS.get(interval, interval),
+                "startTime": start_ms,
+                "endTime": end_ms,
+                "limit": self.KLINES_LIMIT,
+            }
+            page = self._public_request("/api/v3/klines", params, self.KLINES_WEIGHT, raw=raw)
+            if raw:
+                page = self.parse_klines(page)
+                open_times = page["open_time"]
+            else:
+                open_times = [kline[0] for kline in page]
+            if len(open_times) == 0:
+                break
+            yield page
+            if len(open_times) < self.KLINES_LIMIT:
+                break
+            start_ms = int(open_times[-1]) + 1
+
+    def get_klines(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int
+    ) -> List[List[Any]]:
+        """
+        Fetch raw klines with open_time in [start_ms, end_ms], paging 1000 bars at a time.
+
+        Requests go through the shared weight budget; API and network errors are raised.
+        """
+        klines: List[List[Any]] = []
+        for page in self._kline_pages(symbol, interval, start_ms, end_ms):
+            klines.extend(page)
+        return klines
+
+    def get_kline_columns(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int
+    ) -> Dict[str, np.ndarray]:
+        """
+        Same as ``get_klines`` but parses each response body straight into typed columns,
+        skipping the intermediate list of Python objects.
+        """
+        pages = list(self._kline_pages(symbol, interval, start_ms, end_ms, raw=True))
+        if len(pages) == 1:
+            return pages[0]
+        if not pages:
+            return self.parse_klines([])
+        return {col: np.concatenate([page[col] for page in pages]) for col in self.KLINE_COLS}
+
+    def kline_stream(self) -> BinanceKlineStream:
+        return BinanceKlineStream(self.stream_url)
 
     def get_historical_klines(
         self, symbol: str, interval: str, start_time: str, end_time: str
     ) -> List[List[Any]]:
 
         try:
-            return self.client.get_historical_klines(
-                symbol, self.KLINE_INTERVALS.get(interval, interval), start_time, end_time
+            return self.get_klines(
+                symbol, interval, to_epoch_ms(start_time), to_epoch_ms(end_time)
             )
-        except BinanceAPIException as e:
+        except (BinanceAPIException, requests.RequestException) as e:
             logger.error(f"Failed to fetch historical klines for {symbol}: {e}")
             return []
 
+    def get_all_tickers_24h(self) -> List[Dict[str, Any]]:
+        """24h rolling ticker statistics for every symbol in a single request."""
+        try:
+            return self._public_request("/api/v3/ticker/24hr", {}, self.TICKER_24H_ALL_WEIGHT)
+        except (BinanceAPIException, requests.RequestException) as e:
+            logger.error(f"Failed to fetch 24h tickers: {e}")
+            return []
+
+    def get_metadata(self) -> ExchangeMetadata:
+        """Indexed exchange metadata, served from the TTL cache."""
+        return self.metadata_cache.get()
+
+    def get_symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        try:
+            return self.get_metadata().get(symbol)
+        except (BinanceAPIException, requests.RequestException) as e:
+            logger.error(f"Failed to fetch exchange info: {e}")
+            return None
+
     def get_exchange_info(self) -> Dict[str, Any]:
         try:
-            return self.client.get_exchange_info()
-        except BinanceAPIException as e:
+            return self.get_metadata().raw
+        except (BinanceAPIException, requests.RequestException) as e:
             logger.error(f"Failed to fetch exchange info: {e}")
             return {}
 
     def get_all_usdt_pairs(self) -> List[str]:
         try:
-            exchange_info = self.get_exchange_info()
-            usdt_pairs = [
-                symbol["symbol"]
-                for symbol in exchange_info["symbols"]
-                if symbol["symbol"].endswith("USDT") and symbol["status"] == "TRADING"
-            ]
-            logger.info(f"Retrieved {len(usdt_pairs)} USDT trading pairs")
+            usdt_pairs = list(self.get_metadata().trading_pairs("USDT"))
+            logger.debug(f"Retrieved {len(usdt_pairs)} USDT trading pairs")
             return usdt_pairs
         except Exception as e:
             logger.error(f"Failed to fetch USDT trading pairs: {e}")
             return []
 
     @staticmethod
-    def create_dataframe(klines: List[List[Any]]) -> pd.DataFrame:
-        df = pd.DataFrame(klines, columns=BinancePlatform.KLINE_COLS)
-        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms")
-        df["close_time"] = pd.to_datetime(df["close_time"], unit="ms")
-        for col in df.columns:
-            if col not in ["open_time", "close_time"]:
-                df[col] = df[col].astype(float)
-        return df
+    def parse_klines(
+        klines: Union[str, bytes, List[List[Any]], List[Dict[str, Any]]]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Parse klines into typed columns in a single pass.
+
+        Times and trade counts come back as int64 (epoch ms for times), the rest as float64.
+
+        :param klines: raw ``/api/v3/klines`` response body, a list of kline rows, or a list
+            of dicts keyed by ``KLINE_COLS`` (as returned by ``get_latest_klines``)
+        """
+        cols = BinancePlatform.KLINE_COLS
+        if isinstance(klines, (str, bytes)):
+            if isinstance(klines, bytes):
+                klines = klines.decode()
+            # the payload is a flat grid of numbers once brackets and quotes are gone
+            values = np.fromstring(klines.translate(BinancePlatform._KLINE_STRIP), sep=",")
+            values = values.reshape(-1, len(cols))
+            return {
+                col: (
+                    values[:, i].astype(np.int64)
+                    if col in BinancePlatform.KLINE_INT_COLS
+                    else np.ascontiguousarray(values[:, i])
+                )
+                for i, col in enumerate(cols)
+            }
+
+        keys = cols if klines and isinstance(klines[0], dict) else range(len(cols))
+        columns = {}
+        for key, col in zip(keys, cols):
+            values = map(itemgetter(key), klines)
+            if col in BinancePlatform.KLINE_INT_COLS:
+                columns[col] = np.fromiter(map(int, values), np.int64, len(klines))
+            else:
+                columns[col] = np.fromiter(map(float, values), np.float64, len(klines))
+        return columns
+
+    @staticmethod
+    def create_dataframe(
+        klines: Union[str, bytes, List[List[Any]], List[Dict[str, Any]]]
+    ) -> pd.DataFrame:
+        """Build a typed kline frame; open_time/close_time stay int64 epoch ms (UTC)."""
+        return pd.DataFrame(
+            BinancePlatform.parse_klines(klines), columns=BinancePlatform.KLINE_COLS
+        )
 
     # You can keep the get_latest_klines method if needed
     def get_latest_klines(
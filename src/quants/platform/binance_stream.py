@@ -0,0 +1,159 @@
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import websocket
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+KlineCallback = Callable[[str, str, List[Any], bool], None]
+ReconnectCallback = Callable[[Dict[str, List[str]]], None]
+
+
+class BinanceKlineStream:
+    """
+    Kline subscriber over Binance combined streams.
+
+    Streams are spread over as few connections as ``streams_per_connection`` allows, each
+    served by its own thread that reconnects with exponential backoff. Kline payloads are
+    converted to the REST row layout (``BinancePlatform.KLINE_COLS``) before being handed
+    to the callback, so they can go through ``create_dataframe`` like polled klines.
+    """
+
+    def __init__(
+        self,
+        stream_url: str = "wss://stream.binance.com:9443",
+        streams_per_connection: int = 200,
+        ping_interval: float = 20.0,
+        min_reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ):
+        self.stream_url = stream_url.rstrip("/")
+        self.streams_per_connection = streams_per_connection
+        self.ping_interval = ping_interval
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.stop_event = threading.Event()
+        self.threads: List[threading.Thread] = []
+        self.apps: List[websocket.WebSocketApp] = []
+        self._on_kline: Optional[KlineCallback] = None
+        self._on_reconnect: Optional[ReconnectCallback] = None
+
+    def start(
+        self,
+        symbols: Sequence[str],
+        intervals: Sequence[str],
+        on_kline: KlineCallback,
+        on_reconnect: Optional[ReconnectCallback] = None,
+    ) -> None:
+        """
+        Subscribe to every (symbol, interval) kline stream.
+
+        :param on_kline: Called as ``on_kline(symbol, interval, kline_row, closed)``
+        :param on_reconnect: Called on a separate thread after a dropped connection comes
+                             back, with the affected symbols grouped by interval
+        """
+        self._on_kline = on_kline
+        self._on_reconnect = on_reconnect
+        self.stop_event.clear()
+        streams = [
+            f"{symbol.lower()}@kline_{interval}" for interval in intervals for symbol in symbols
+        ]
+        for index in range(0, len(streams), self.streams_per_connection):
+            chunk = streams[index : index + self.streams_per_connection]
+            thread = threading.Thread(
+                target=self._run_connection,
+                args=(chunk,),
+                name=f"kline-stream-{index // self.streams_per_connection}",
+                daemon=True,
+            )
+            thread.start()
+            self.threads.append(thread)
+        logger.info(
+            f"Kline stream started: {len(streams)} streams on {len(self.threads)} connections"
+        )
+
+    def _run_connection(self, streams: List[str]) -> None:
+        url = f"{self.stream_url}/stream?streams={'/'.join(streams)}"
+        delay = self.min_reconnect_delay
+        reconnecting = False
+        while not self.stop_event.is_set():
+            opened = threading.Event()
+
+            def on_open(ws, reconnecting=reconnecting):
+                opened.set()
+                if reconnecting and self._on_reconnect is not None:
+                    threading.Thread(
+                        target=self._on_reconnect, args=(self._group(streams),), daemon=True
+                    ).start()
+
+            app = websocket.WebSocketApp(
+                url,
+                on_open=on_open,
+                on_message=lambda ws, message: self._handle_message(message),
+                on_error=lambda ws, error: logger.error(f"Kline stream error: {error}"),
+            )
+            self.apps.append(app)
+            app.run_forever(
+                ping_interval=self.ping_interval,
+                ping_timeout=self.ping_interval / 2,
+                reconnect=0,
+            )
+            self.apps.remove(app)
+
+            if self.stop_event.is_set():
+                break
+            if opened.is_set():
+                delay = self.min_reconnect_delay
+            reconnecting = True
+            logger.warning(f"Kline stream disconnected, reconnecting in {delay:.1f}s")
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    @staticmethod
+    def _group(streams: List[str]) -> Dict[str, List[str]]:
+        symbols_by_interval: Dict[str, List[str]] = defaultdict(list)
+        for stream in streams:
+            symbol, interval = stream.split("@kline_")
+            symbols_by_interval[interval].append(symbol.upper())
+        return dict(symbols_by_interval)
+
+    @staticmethod
+    def to_kline_row(kline: Dict[str, Any]) -> List[Any]:
+        return [
+            kline["t"],
+            kline["o"],
+            kline["h"],
+            kline["l"],
+            kline["c"],
+            kline["v"],
+            kline["T"],
+            kline["q"],
+            kline["n"],
+            kline["V"],
+            kline["Q"],
+            kline.get("B", "0"),
+        ]
+
+    def _handle_message(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+            data = payload.get("data", payload)
+            if data.get("e") != "kline":
+                return
+            kline = data["k"]
+            self._on_kline(kline["s"], kline["i"], self.to_kline_row(kline), bool(kline["x"]))
+        except Exception as e:
+            logger.error(f"Failed to handle kline stream message: {e}")
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        for app in list(self.apps):
+            app.close()
+        for thread in self.threads:
+            thread.join(timeout=5)
+        self.threads = []
+        logger.info("Kline stream stopped")
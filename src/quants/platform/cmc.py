@@ -1,26 +1,49 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+import requests
 
-from ..auth.coinmarketcap import CoinMarketCapAuth
+from ..auth.cmc import CoinMarketCapAuth
 from ..utils import get_logger
+from ..utils.timeframes import to_epoch_ms_array
 from .base import BasePlatform
+from .transport import HttpTransport
 
 logger = get_logger(__name__)
 
 class CoinMarketCapPlatform(BasePlatform):
-    def __init__(self, auth: CoinMarketCapAuth):
+    # seconds a cached response stays valid; endpoints not listed are never cached
+    CACHE_TTLS = {
+        'cryptocurrency/listings/latest': 300,
+        'cryptocurrency/ohlcv/historical': 3600,
+        'exchange/info': 86400,
+    }
+
+    def __init__(
+        self,
+        auth: CoinMarketCapAuth,
+        cache_dir: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 5,
+    ):
         self.auth = auth
         self.session = auth.get_session()
         self.base_url = auth.base_url
+        self.transport = HttpTransport(
+            self.base_url,
+            session=self.session,
+            pool_size=pool_size,
+            timeout=timeout,
+            max_retries=max_retries,
+            cache_dir=cache_dir,
+            cache_ttls=self.CACHE_TTLS,
+        )
 
     def _make_request(self, endpoint: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
-        url = self.base_url + endpoint
         try:
-            response = self.session.get(url, params=parameters)
-            data = json.loads(response.text)
-            return data
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
+            return self.transport.get(endpoint, parameters)
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error making request to {endpoint}: {e}")
             return {}
 
@@ -54,7 +77,7 @@ class CoinMarketCapPlatform(BasePlatform):
     @staticmethod
     def create_dataframe(price_data: List[Dict[str, Any]]) -> pd.DataFrame:
         df = pd.DataFrame(price_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df['timestamp'] = to_epoch_ms_array(df['timestamp'])
         for col in ['open', 'high', 'low', 'close', 'volume']:
             df[col] = df[col].astype(float)
         return df
\ No newline at end of file
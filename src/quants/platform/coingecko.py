@@ -1,13 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Union
 
 import pandas as pd
-from ..auth import CoinGeckoAuth
+from ..auth.coingecko import CoinGeckoAuth
 from ..utils import get_logger
 from .base import BasePlatform
 
 logger = get_logger(__name__)
 
 class CoinGeckoPlatform(BasePlatform):
+    MARKETS_PAGE_SIZE = 250
+
     def __init__(self, auth: CoinGeckoAuth):
         self.auth = auth
         self.client = auth.get_client()
@@ -40,9 +43,47 @@ class CoinGeckoPlatform(BasePlatform):
             logger.error(f"Failed to fetch coins: {e}")
             return []
 
+    def get_coins_list(self) -> List[Dict[str, Any]]:
+        """Every coin CoinGecko lists (id, symbol, name), in a single unpaged request."""
+        try:
+            coins = self.client.get_coins_list()
+            logger.info(f"Retrieved {len(coins)} listed coins")
+            return coins
+        except Exception as e:
+            logger.error(f"Failed to fetch coins list: {e}")
+            return []
+
+    def get_coins_markets_pages(
+        self,
+        vs_currency: str = 'usd',
+        pages: int = 4,
+        per_page: int = MARKETS_PAGE_SIZE,
+        max_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the first ``pages`` pages of coins/markets concurrently, in market-cap order.
+
+        Pages that fail are logged and skipped.
+        """
+        def fetch(page: int) -> List[Dict[str, Any]]:
+            return self.client.get_coins_markets(
+                vs_currency=vs_currency, per_page=per_page, page=page
+            )
+
+        coins: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(fetch, page) for page in range(1, pages + 1)]
+            for page, future in enumerate(futures, start=1):
+                try:
+                    coins.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to fetch coins markets page {page}: {e}")
+        logger.info(f"Retrieved {len(coins)} coins from {pages} market pages")
+        return coins
+
     @staticmethod
     def create_dataframe(price_data: List[List[Any]]) -> pd.DataFrame:
         df = pd.DataFrame(price_data, columns=['timestamp', 'price'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df['timestamp'] = df['timestamp'].astype('int64')
         df['price'] = df['price'].astype(float)
         return df
\ No newline at end of file
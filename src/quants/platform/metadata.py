@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def _decimals(step: str) -> int:
+    """Number of decimals implied by a filter step such as ``"0.00100000"``."""
+    if "." not in step:
+        return 0
+    return len(step.rstrip("0").split(".")[1])
+
+
+@dataclass(frozen=True)
+class SymbolInfo:
+    symbol: str
+    base_asset: str
+    quote_asset: str
+    status: str
+    tick_size: float = 0.0
+    step_size: float = 0.0
+    min_qty: float = 0.0
+    min_notional: float = 0.0
+    price_precision: int = 8
+    quantity_precision: int = 8
+    filters: Dict[str, Dict[str, Any]] = field(default_factory=dict, compare=False)
+
+    @property
+    def trading(self) -> bool:
+        return self.status == "TRADING"
+
+    @classmethod
+    def from_exchange_info(cls, entry: Dict[str, Any]) -> "SymbolInfo":
+        filters = {f["filterType"]: f for f in entry.get("filters", [])}
+        price_filter = filters.get("PRICE_FILTER", {})
+        lot_size = filters.get("LOT_SIZE", {})
+        notional = filters.get("NOTIONAL") or filters.get("MIN_NOTIONAL") or {}
+        tick_size = price_filter.get("tickSize")
+        step_size = lot_size.get("stepSize")
+        return cls(
+            symbol=entry["symbol"],
+            base_asset=entry.get("baseAsset", ""),
+            quote_asset=entry.get("quoteAsset", ""),
+            status=entry.get("status", ""),
+            tick_size=float(tick_size or 0),
+            step_size=float(step_size or 0),
+            min_qty=float(lot_size.get("minQty", 0)),
+            min_notional=float(notional.get("minNotional", 0)),
+            price_precision=(
+                _decimals(tick_size) if tick_size else entry.get("quotePrecision", 8)
+            ),
+            quantity_precision=(
+                _decimals(step_size) if step_size else entry.get("baseAssetPrecision", 8)
+            ),
+            filters=filters,
+        )
+
+
+class ExchangeMetadata:
+    """
+    Indexed view of one ``exchangeInfo`` payload.
+
+    Lookups by symbol and the per-quote lists of trading pairs are built once on load.
+    """
+
+    def __init__(self, exchange_info: Dict[str, Any], fetched_at: float):
+        self.raw = exchange_info
+        self.fetched_at = fetched_at
+        self.symbols: Dict[str, SymbolInfo] = {
+            entry["symbol"]: SymbolInfo.from_exchange_info(entry)
+            for entry in exchange_info.get("symbols", [])
+        }
+        by_quote: Dict[str, List[str]] = {}
+        for info in self.symbols.values():
+            if info.trading:
+                by_quote.setdefault(info.quote_asset, []).append(info.symbol)
+        self._by_quote: Dict[str, Tuple[str, ...]] = {
+            quote: tuple(symbols) for quote, symbols in by_quote.items()
+        }
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.symbols
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        return self.symbols.get(symbol)
+
+    def trading_pairs(self, quote_asset: str) -> Tuple[str, ...]:
+        return self._by_quote.get(quote_asset, ())
+
+
+class ExchangeMetadataCache:
+    """
+    TTL cache around an exchange-info loader with stale-while-revalidate.
+
+    Fresh entries are served directly. Once an entry is older than ``ttl_seconds`` it is
+    still served while a single background thread reloads it; a failed reload keeps the
+    stale entry. With ``snapshot_path`` set, every successful load is written to disk and a
+    cold start serves the snapshot (revalidating it if stale) instead of blocking on the API.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Dict[str, Any]],
+        ttl_seconds: float = 300.0,
+        snapshot_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_path = snapshot_path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._metadata: Optional[ExchangeMetadata] = None
+        self._refreshing = False
+
+    def get(self) -> ExchangeMetadata:
+        metadata = self._metadata
+        if metadata is None:
+            # cold start: one caller loads, concurrent callers wait for its result
+            with self._lock:
+                if self._metadata is None:
+                    self._metadata = self._load_snapshot()
+                if self._metadata is None:
+                    return self.refresh()
+                metadata = self._metadata
+
+        if self._clock() - metadata.fetched_at >= self.ttl_seconds:
+            self._revalidate()
+        return metadata
+
+    def refresh(self) -> ExchangeMetadata:
+        """Load synchronously, replacing the cached entry; loader errors are raised."""
+        metadata = ExchangeMetadata(self.loader(), self._clock())
+        self._metadata = metadata
+        self._save_snapshot(metadata)
+        logger.info(f"Exchange metadata refreshed: {len(metadata.symbols)} symbols")
+        return metadata
+
+    def invalidate(self) -> None:
+        self._metadata = None
+
+    def _revalidate(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Exchange metadata refresh failed, serving stale entry: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _load_snapshot(self) -> Optional[ExchangeMetadata]:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, "r") as file:
+                snapshot = json.load(file)
+            metadata = ExchangeMetadata(snapshot["exchange_info"], snapshot["fetched_at"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable exchange metadata snapshot: {e}")
+            return None
+        logger.info(f"Loaded exchange metadata snapshot from {self.snapshot_path}")
+        return metadata
+
+    def _save_snapshot(self, metadata: ExchangeMetadata) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump({"fetched_at": metadata.fetched_at, "exchange_info": metadata.raw}, file)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Failed to write exchange metadata snapshot: {e}")
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Callable, Mapping, Optional
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class WeightRateLimiter:
+    """
+    Client-side request-weight budget over Binance's fixed one-minute windows.
+
+    Callers reserve weight before each request and report every response back. The
+    ``X-MBX-USED-WEIGHT-1M`` header corrects the local estimate when other clients share
+    the IP, and 429/418 responses pause all callers for at least the server's Retry-After
+    while shrinking the budget until a full window passes without being limited.
+    """
+
+    USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+    LIMIT_STATUS_CODES = (418, 429)
+
+    def __init__(
+        self,
+        weight_limit: int = 6000,
+        window_seconds: float = 60.0,
+        headroom: float = 0.9,
+        ban_pause_seconds: float = 120.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.weight_limit = weight_limit
+        self.window_seconds = window_seconds
+        self.headroom = headroom
+        self.ban_pause_seconds = ban_pause_seconds
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._window_start = 0.0
+        self._used = 0
+        self._scale = 1.0
+        self._limited_in_window = False
+        self._penalty = 0.0
+        self._paused_until = 0.0
+
+    @property
+    def budget(self) -> int:
+        return max(1, int(self.weight_limit * self.headroom * self._scale))
+
+    @property
+    def used_weight(self) -> int:
+        return self._used
+
+    def _roll_window(self, now: float) -> None:
+        window_start = now - (now % self.window_seconds)
+        if window_start == self._window_start:
+            return
+        if not self._limited_in_window:
+            self._scale = min(1.0, self._scale * 1.25)
+            self._penalty /= 2
+        self._window_start = window_start
+        self._used = 0
+        self._limited_in_window = False
+
+    def acquire(self, weight: int = 1) -> None:
+        """Block until ``weight`` fits in the current window and no pause is active."""
+        with self._condition:
+            while True:
+                now = self._clock()
+                self._roll_window(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._used + weight <= self.budget or self._used == 0:
+                        self._used += weight
+                        return
+                    wait = self._window_start + self.window_seconds - now
+                self._condition.wait(timeout=max(wait, 0.01))
+
+    def record_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update the budget from a response's status code and rate-limit headers."""
+        used = headers.get(self.USED_WEIGHT_HEADER)
+        with self._condition:
+            now = self._clock()
+            self._roll_window(now)
+            if used is not None:
+                self._used = max(self._used, int(used))
+
+            if status_code in self.LIMIT_STATUS_CODES:
+                # responses to requests already in flight when the pause started count once
+                if now >= self._paused_until:
+                    self._penalty = min(max(self._penalty * 2, 1.0), self.window_seconds)
+                    self._scale = max(0.1, self._scale / 2)
+                retry_after = self._retry_after(headers)
+                pause = max(retry_after or 0.0, self._penalty)
+                if status_code == 418:
+                    pause = max(pause, self.ban_pause_seconds)
+                self._paused_until = max(self._paused_until, now + pause)
+                self._limited_in_window = True
+                logger.warning(
+                    f"Rate limited (HTTP {status_code}), pausing requests for {pause:.1f}s "
+                    f"with budget {self.budget}/{self.weight_limit}"
+                )
+            self._condition.notify_all()
+
+    @staticmethod
+    def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        value = headers.get("Retry-After")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
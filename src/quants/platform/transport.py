@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """
+    On-disk cache of response bodies, addressed by a hash of the request.
+
+    Entries live at ``<cache_dir>/<key[:2]>/<key>.json`` and expire by file age, so TTLs
+    are chosen per lookup rather than fixed at write time.
+    """
+
+    def __init__(self, cache_dir: str, clock: Callable[[], float] = time.time):
+        self.cache_dir = cache_dir
+        self._clock = clock
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        canonical = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str, ttl_seconds: float) -> Optional[str]:
+        path = self._path(key)
+        try:
+            if self._clock() - os.path.getmtime(path) >= ttl_seconds:
+                return None
+            with open(path, "r") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, body: str) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                file.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache response {key}: {e}")
+
+
+class HttpTransport:
+    """
+    Shared GET transport for the REST platforms.
+
+    Wraps a pooled ``requests.Session`` with per-request timeouts and retries 429/5xx
+    responses and connection errors with jittered exponential backoff, waiting at least as
+    long as the provider's ``Retry-After`` or rate-limit reset headers ask. With
+    ``cache_dir`` set, successful bodies of endpoints listed in ``cache_ttls`` are served
+    from a ``ResponseCache`` until their TTL runs out.
+    """
+
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[requests.Session] = None,
+        pool_size: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 5,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 60.0,
+        cache_dir: Optional[str] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.base_url = base_url
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.cache_ttls = cache_ttls or {}
+        self._sleep = sleep
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET ``base_url + endpoint`` and decode the JSON body.
+
+        :raises requests.RequestException: once retries are exhausted or on other HTTP errors
+        """
+        url = self.base_url + endpoint
+        ttl = self.cache_ttls.get(endpoint)
+        key = None
+        if self.cache is not None and ttl:
+            key = ResponseCache.key(url, params)
+            body = self.cache.get(key, ttl)
+            if body is not None:
+                return json.loads(body)
+
+        response = self._send(url, params)
+        if key is not None:
+            self.cache.put(key, response.text)
+        return response.json()
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]]) -> requests.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f}s")
+                self._sleep(delay)
+                continue
+
+            if response.status_code in self.RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = max(self._backoff(attempt), self._server_delay(response))
+                logger.warning(f"HTTP {response.status_code} from {url}, retrying in {delay:.1f}s")
+                self._sleep(delay)
+                continue
+            response.raise_for_status()
+            return response
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _server_delay(self, response: requests.Response) -> float:
+        """Seconds the provider asked us to wait, from Retry-After or a reset header."""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(self.max_backoff_seconds, float(retry_after))
+            except ValueError:
+                pass
+        for header in self.RESET_HEADERS:
+            reset = response.headers.get(header)
+            if reset is None:
+                continue
+            try:
+                reset = float(reset)
+            except ValueError:
+                continue
+            # providers send either an epoch timestamp or seconds until the reset
+            wait = reset - time.time() if reset > 1e9 else reset
+            return min(self.max_backoff_seconds, max(0.0, wait))
+        return 0.0
@@ -0,0 +1,42 @@
+import os
+
+from ..db.catalog import SeriesCatalog
+from .base import TIME_COLUMNS, BaseStorage
+from .csv_storage import CSVStorage
+from .npy_storage import NpyStorage
+from .ring_buffer import SharedBarBuffer, SharedBarCache
+
+
+class StorageFactory:
+    BACKENDS = {
+        "csv": (CSVStorage, "csv_data"),
+        "npy": (NpyStorage, "npy_data"),
+    }
+
+    CATALOG_FILE = "catalog.db"
+
+    @staticmethod
+    def create_storage(backend: str, data_path: str, catalog: bool = True) -> BaseStorage:
+        """
+        :param catalog: Keep a ``SeriesCatalog`` of the stored series in the backend's root
+        """
+        if backend not in StorageFactory.BACKENDS:
+            raise ValueError(f"Unknown storage backend: {backend}")
+        storage_class, directory = StorageFactory.BACKENDS[backend]
+        storage = storage_class(os.path.join(data_path, directory))
+        if catalog:
+            storage.attach_catalog(
+                SeriesCatalog(os.path.join(storage.root, StorageFactory.CATALOG_FILE))
+            )
+        return storage
+
+
+__all__ = [
+    "BaseStorage",
+    "CSVStorage",
+    "NpyStorage",
+    "SharedBarBuffer",
+    "SharedBarCache",
+    "StorageFactory",
+    "TIME_COLUMNS",
+]
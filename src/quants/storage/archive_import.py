@@ -0,0 +1,308 @@
+import argparse
+import hashlib
+import logging
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..db.import_ledger import ImportLedger
+from ..db.watermarks import WatermarkStore
+from ..platform.binance import BinancePlatform
+from ..utils.logger import get_logger, setup_logging
+from ..utils.timeframes import interval_to_ms
+from . import StorageFactory
+from .base import TIME_COLUMNS, BaseStorage
+
+logger = get_logger(__name__)
+
+# e.g. BTCUSDT-1m-2023-01.zip (monthly) or BTCUSDT-1m-2023-01-15.zip (daily)
+ARCHIVE_PATTERN = re.compile(
+    r"^(?P<symbol>[A-Z0-9]+)-(?P<interval>\d+[smhdw])-(?P<period>\d{4}-\d{2}(?:-\d{2})?)\.zip$"
+)
+# spot archives switched to microsecond timestamps in 2025; no ms timestamp gets this large
+MICROSECOND_THRESHOLD = 10**14
+HASH_BLOCK_SIZE = 1 << 20
+
+KLINE_DTYPES = {
+    col: np.int64 if col in BinancePlatform.KLINE_INT_COLS else np.float64
+    for col in BinancePlatform.KLINE_COLS
+}
+
+
+@dataclass(frozen=True)
+class KlineArchive:
+    path: str
+    symbol: str
+    interval: str
+    period: str
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def daily(self) -> bool:
+        return len(self.period) == len("YYYY-MM-DD")
+
+    @property
+    def month(self) -> str:
+        return self.period[:7]
+
+    @classmethod
+    def from_path(cls, path: str) -> Optional["KlineArchive"]:
+        match = ARCHIVE_PATTERN.match(os.path.basename(path))
+        if match is None:
+            return None
+        return cls(path, match["symbol"], match["interval"], match["period"])
+
+
+@dataclass
+class ImportReport:
+    rows: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    imported: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+def find_archives(
+    archive_dir: str,
+    symbols: Optional[Sequence[str]] = None,
+    intervals: Optional[Sequence[str]] = None,
+) -> List[KlineArchive]:
+    """
+    Find kline archives anywhere under archive_dir, ordered by series and period.
+
+    Daily archives of a month that also has a monthly archive are left out.
+
+    :param symbols: Only these symbols, or None for all
+    :param intervals: Only these intervals, or None for all
+    """
+    archives = []
+    for dirpath, _, filenames in os.walk(archive_dir):
+        for filename in filenames:
+            archive = KlineArchive.from_path(os.path.join(dirpath, filename))
+            if archive is None:
+                continue
+            if symbols and archive.symbol not in symbols:
+                continue
+            if intervals and archive.interval not in intervals:
+                continue
+            archives.append(archive)
+
+    monthly = {(a.symbol, a.interval, a.month) for a in archives if not a.daily}
+    archives = [
+        a for a in archives if not a.daily or (a.symbol, a.interval, a.month) not in monthly
+    ]
+    return sorted(archives, key=lambda a: (a.symbol, a.interval, a.period))
+
+
+def verify_checksum(path: str) -> Optional[bool]:
+    """
+    Check an archive against the ``<archive>.CHECKSUM`` file published next to it.
+
+    :return: Whether the SHA-256 digests match, or None if there is no checksum file
+    """
+    checksum_path = f"{path}.CHECKSUM"
+    if not os.path.exists(checksum_path):
+        return None
+    with open(checksum_path, "r") as file:
+        expected = file.read().split()[0].lower()
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest() == expected
+
+
+def read_archive(path: str) -> Dict[str, np.ndarray]:
+    """
+    Parse the kline CSV inside an archive into ``KLINE_COLS`` arrays with ms time columns.
+
+    The CSV is decompressed while it is parsed, never extracted to disk.
+    """
+    with zipfile.ZipFile(path) as archive:
+        members = [name for name in archive.namelist() if name.endswith(".csv")]
+        if len(members) != 1:
+            raise ValueError(f"Expected one CSV in {path}, found {len(members)}")
+        with archive.open(members[0]) as stream:
+            # newer archives start with a header row
+            first = stream.peek(1)[:1]
+            df = pd.read_csv(
+                stream,
+                header=None if first.isdigit() else 0,
+                names=BinancePlatform.KLINE_COLS,
+                dtype=KLINE_DTYPES,
+            )
+
+    columns = {col: df[col].to_numpy() for col in BinancePlatform.KLINE_COLS}
+    for col in TIME_COLUMNS:
+        values = columns[col]
+        columns[col] = np.where(values >= MICROSECOND_THRESHOLD, values // 1000, values)
+    return columns
+
+
+def load_archive(path: str) -> Tuple[Optional[Dict[str, np.ndarray]], Optional[str]]:
+    """Verify and parse one archive in a worker process; errors are returned, not raised."""
+    try:
+        if verify_checksum(path) is False:
+            return None, "checksum mismatch"
+        return read_archive(path), None
+    except Exception as e:
+        return None, str(e)
+
+
+class ArchiveImporter:
+    """
+    Bulk import of Binance public kline archives into a storage backend.
+
+    Archives are verified and parsed in worker processes while the parent writes the
+    results, ``batch_size`` archives of a series at a time: appended when they extend the
+    stored series, merged (replacing stored bars with the same open time) otherwise.
+    Every stored archive is recorded in the ledger, so an interrupted import resumes with
+    the archives it had not stored yet. With ``watermarks`` set, known gaps the archives
+    cover are cleared and the high-water mark is raised past imported bars.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        ledger: ImportLedger,
+        watermarks: Optional[WatermarkStore] = None,
+        workers: Optional[int] = None,
+        batch_size: int = 24,
+    ):
+        self.storage = storage
+        self.ledger = ledger
+        self.watermarks = watermarks
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def run(self, archives: Sequence[KlineArchive]) -> ImportReport:
+        report = ImportReport()
+        pending = []
+        for archive in archives:
+            if self.ledger.is_imported(archive.name, os.path.getsize(archive.path)):
+                report.skipped.append(archive.name)
+            else:
+                pending.append(archive)
+        logger.info(
+            f"Importing {len(pending)} archives ({len(report.skipped)} already imported) "
+            f"with {self.workers} workers"
+        )
+
+        remaining = iter(pending)
+        in_flight: Deque[Tuple[KlineArchive, Future]] = deque()
+        batch: List[Tuple[KlineArchive, Dict[str, np.ndarray]]] = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+
+            def submit() -> None:
+                # parse ahead of the writer, but only a bounded number of archives
+                while len(in_flight) < 2 * self.workers:
+                    archive = next(remaining, None)
+                    if archive is None:
+                        return
+                    in_flight.append((archive, executor.submit(load_archive, archive.path)))
+
+            submit()
+            while in_flight:
+                archive, future = in_flight.popleft()
+                submit()
+                columns, error = future.result()
+                if error is not None:
+                    logger.error(f"Skipping {archive.name}: {error}")
+                    report.failed[archive.name] = error
+                    continue
+
+                if batch and (
+                    (batch[0][0].symbol, batch[0][0].interval)
+                    != (archive.symbol, archive.interval)
+                    or len(batch) >= self.batch_size
+                ):
+                    self._store(batch, report)
+                    batch = []
+                batch.append((archive, columns))
+            if batch:
+                self._store(batch, report)
+
+        logger.info(
+            f"Imported {len(report.imported)} archives into {len(report.rows)} series, "
+            f"{len(report.failed)} failed"
+        )
+        return report
+
+    def _store(
+        self, batch: List[Tuple[KlineArchive, Dict[str, np.ndarray]]], report: ImportReport
+    ) -> None:
+        symbol, interval = batch[0][0].symbol, batch[0][0].interval
+        data = pd.concat([pd.DataFrame(columns) for _, columns in batch], ignore_index=True)
+        data = data.drop_duplicates(subset=["open_time"], keep="last")
+        data = data.sort_values("open_time", kind="mergesort").reset_index(drop=True)
+
+        last_open_time = self.storage.last_open_time(symbol, interval)
+        if last_open_time is None:
+            self.storage.write(symbol, interval, data)
+        elif data["open_time"].iloc[0] >= last_open_time:
+            self.storage.append(symbol, interval, data)
+        else:
+            self.storage.merge(symbol, interval, data)
+
+        for archive, columns in batch:
+            open_time = columns["open_time"]
+            if self.watermarks is not None and len(open_time):
+                self._update_watermarks(symbol, interval, int(open_time[0]), int(open_time[-1]))
+            self.ledger.mark_imported(
+                archive.name, os.path.getsize(archive.path), symbol, interval, len(open_time)
+            )
+            report.imported.append(archive.name)
+        key = (symbol, interval)
+        report.rows[key] = report.rows.get(key, 0) + len(data)
+        logger.info(f"Stored {len(data)} rows from {len(batch)} archives for {symbol} {interval}")
+
+    def _update_watermarks(self, symbol: str, interval: str, first: int, last: int) -> None:
+        # an archive holds every bar the exchange produced in its period
+        self.watermarks.remove_gap(symbol, interval, first, last)
+        high_water = self.watermarks.get_high_water(symbol, interval)
+        if high_water is None or last <= high_water:
+            # unseeded series are seeded from storage on the collector's next refresh
+            return
+        step = interval_to_ms(interval)
+        if first > high_water + step:
+            self.watermarks.add_gap(symbol, interval, high_water + step, first - step)
+        self.watermarks.set_high_water(symbol, interval, last)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import Binance kline archives")
+    parser.add_argument("--archives", required=True, help="Directory of kline .zip archives")
+    parser.add_argument("--data-path", required=True, help="Collector data_path")
+    parser.add_argument("--backend", default="npy", choices=sorted(StorageFactory.BACKENDS))
+    parser.add_argument("--symbols", nargs="*", help="Only import these symbols")
+    parser.add_argument("--intervals", nargs="*", help="Only import these intervals")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes")
+    parser.add_argument("--batch-size", type=int, default=24, help="Archives per write")
+    args = parser.parse_args()
+
+    setup_logging(log_level=logging.INFO)
+    storage = StorageFactory.create_storage(args.backend, args.data_path)
+    importer = ArchiveImporter(
+        storage,
+        ImportLedger(os.path.join(args.data_path, "import_ledger.db")),
+        WatermarkStore(os.path.join(args.data_path, "watermarks.db")),
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    archives = find_archives(args.archives, args.symbols, args.intervals)
+    report = importer.run(archives)
+    for name, error in report.failed.items():
+        logger.error(f"{name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
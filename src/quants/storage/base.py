@@ -0,0 +1,256 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..db.catalog import SeriesCatalog, SeriesEntry
+from ..utils.timeframes import TimeLike, interval_to_ms, to_epoch_ms, to_epoch_ms_array
+
+TIME_COLUMNS = ("open_time", "close_time")
+
+
+class BaseStorage(ABC):
+    """
+    Storage backend for kline series keyed by (symbol, interval).
+
+    Frames handed to a backend may carry their time columns as datetimes or as epoch
+    milliseconds; frames returned by ``read`` always carry them as int64 UTC epoch
+    milliseconds and are sorted by ``open_time``.
+
+    With a catalog attached, every write is recorded in it and ``last_open_time`` is
+    answered from it.
+    """
+
+    catalog: Optional[SeriesCatalog] = None
+    source: str = "binance"
+
+    @abstractmethod
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        """
+        Replace the stored series for a symbol and interval.
+
+        :param symbol: The trading symbol (e.g., 'BTCUSDT')
+        :param interval: The candlestick interval (e.g., '1h', '4h', '1d')
+        :param data: The full series to store
+        """
+        pass
+
+    @abstractmethod
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        columns: Optional[Sequence[str]] = None,
+        start_time: Optional[TimeLike] = None,
+        end_time: Optional[TimeLike] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a stored series, optionally projected and restricted to a time range.
+
+        :param symbol: The trading symbol (e.g., 'BTCUSDT')
+        :param interval: The candlestick interval (e.g., '1h', '4h', '1d')
+        :param columns: Columns to return (``open_time`` is always included), or None for all
+        :param start_time: Inclusive lower bound on ``open_time``
+        :param end_time: Inclusive upper bound on ``open_time``
+        :return: A DataFrame, empty if nothing is stored
+        """
+        pass
+
+    @abstractmethod
+    def append(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        Append bars newer than the stored tail without rewriting the series.
+
+        Only the last stored ``open_time`` is inspected: rows older than it are ignored and
+        a row with the same ``open_time`` replaces the stored last bar (the candle that was
+        still open when it was written).
+
+        :param symbol: The trading symbol (e.g., 'BTCUSDT')
+        :param interval: The candlestick interval (e.g., '1h', '4h', '1d')
+        :param data: The new bars
+        :return: The number of rows written
+        """
+        pass
+
+    @abstractmethod
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        """
+        Get the ``open_time`` of the last stored bar.
+
+        :return: UTC epoch milliseconds, or None if nothing is stored
+        """
+        pass
+
+    def read_recent(
+        self, symbol: str, interval: str, bars: int, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """Read the bars of the last ``bars`` interval steps, empty if nothing is stored."""
+        last_open_time = self.last_open_time(symbol, interval)
+        if last_open_time is None:
+            return pd.DataFrame()
+        start_ms = last_open_time - (bars - 1) * interval_to_ms(interval)
+        return self.read(symbol, interval, columns=columns, start_time=start_ms)
+
+    def merge(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        """
+        Merge bars anywhere in the series, e.g. to backfill a gap behind the tail.
+
+        Rows in ``data`` replace stored rows with the same ``open_time``.
+        """
+        merged = pd.concat([self.read(symbol, interval), self.normalize(data)])
+        self.write(symbol, interval, merged.drop_duplicates(subset=["open_time"], keep="last"))
+
+    def compact(self, symbol: str, interval: str) -> None:
+        """Rewrite a series with duplicate bars removed and rows sorted by open_time."""
+        data = self.read(symbol, interval)
+        if data.empty:
+            return
+        data = data.drop_duplicates(subset=["open_time"], keep="last")
+        self.write(symbol, interval, data)
+
+    @abstractmethod
+    def exists(self, symbol: str, interval: str) -> bool:
+        pass
+
+    @abstractmethod
+    def size_bytes(self, symbol: str, interval: str) -> int:
+        """Size of the stored series on disk."""
+        pass
+
+    def attach_catalog(self, catalog: SeriesCatalog, source: str = "binance") -> None:
+        self.catalog = catalog
+        self.source = source
+
+    def series_entry(self, symbol: str, interval: str) -> Optional[SeriesEntry]:
+        """
+        The catalog entry of a series. Series stored before the catalog was attached are
+        scanned and recorded the first time they are asked for.
+
+        :return: The entry, or None without a catalog or stored data
+        """
+        if self.catalog is None:
+            return None
+        entry = self.catalog.get(self.source, symbol, interval)
+        if entry is None and self.exists(symbol, interval):
+            entry = self._catalog_write(symbol, interval, self.read(symbol, interval))
+        return entry
+
+    def _catalog_get(self, symbol: str, interval: str) -> Optional[SeriesEntry]:
+        return self.catalog.get(self.source, symbol, interval) if self.catalog else None
+
+    def _catalog_write(
+        self, symbol: str, interval: str, data: pd.DataFrame, content_hash: Optional[str] = None
+    ) -> Optional[SeriesEntry]:
+        """Record a whole normalized series."""
+        if self.catalog is None:
+            return None
+        if data.empty:
+            self.catalog.remove(self.source, symbol, interval)
+            return None
+        open_time = data["open_time"].to_numpy()
+        entry = SeriesEntry(
+            source=self.source,
+            symbol=symbol,
+            interval=interval,
+            first_ms=int(open_time[0]),
+            last_ms=int(open_time[-1]),
+            rows=len(data),
+            size_bytes=self.size_bytes(symbol, interval),
+            content_hash=content_hash or content_digest(data),
+            modified_at=time.time(),
+        )
+        self.catalog.record(entry)
+        return entry
+
+    def _catalog_append(
+        self, symbol: str, interval: str, previous: Optional[SeriesEntry], tail: pd.DataFrame
+    ) -> None:
+        """Record an append of ``tail``, the normalized rows at or after the stored tail."""
+        if self.catalog is None or tail.empty:
+            return
+        if previous is None:
+            self.series_entry(symbol, interval)
+            return
+        open_time = tail["open_time"].to_numpy()
+        self.catalog.record(
+            replace(
+                previous,
+                last_ms=max(previous.last_ms, int(open_time[-1])),
+                rows=previous.rows + int((open_time > previous.last_ms).sum()),
+                size_bytes=self.size_bytes(symbol, interval),
+                content_hash=content_digest(tail, previous.content_hash),
+                modified_at=time.time(),
+            )
+        )
+
+    def _catalog_merge(
+        self, symbol: str, interval: str, previous: Optional[SeriesEntry], data: pd.DataFrame
+    ) -> None:
+        """Record a merge of ``data`` anywhere in the series."""
+        if self.catalog is None:
+            return
+        if previous is None:
+            self.series_entry(symbol, interval)
+            return
+        # extents come from the open_time column alone; the hash chains the merged rows
+        self._catalog_write(
+            symbol,
+            interval,
+            self.read(symbol, interval, columns=["open_time"]),
+            content_digest(data, previous.content_hash),
+        )
+
+    @abstractmethod
+    def list_series(self) -> List[Tuple[str, str]]:
+        """
+        List the stored series.
+
+        :return: A list of (symbol, interval) tuples
+        """
+        pass
+
+    @staticmethod
+    def normalize(data: pd.DataFrame) -> pd.DataFrame:
+        """Convert time columns to int64 epoch milliseconds and sort by open_time."""
+        data = data.copy()
+        for col in TIME_COLUMNS:
+            if col in data.columns:
+                data[col] = to_epoch_ms_array(data[col])
+        if "open_time" in data.columns:
+            data = data.sort_values("open_time", kind="mergesort").reset_index(drop=True)
+        return data
+
+    @staticmethod
+    def tail_rows(data: pd.DataFrame, last_open_time: Optional[int]) -> pd.DataFrame:
+        """Select the rows of a normalized frame that belong at or after the stored tail."""
+        data = data.drop_duplicates(subset=["open_time"], keep="last")
+        if last_open_time is None:
+            return data
+        return data[data["open_time"].to_numpy() >= last_open_time].reset_index(drop=True)
+
+    @staticmethod
+    def time_bounds(
+        start_time: Optional[TimeLike], end_time: Optional[TimeLike]
+    ) -> Tuple[int, int]:
+        lower = to_epoch_ms(start_time) if start_time is not None else np.iinfo(np.int64).min
+        upper = to_epoch_ms(end_time) if end_time is not None else np.iinfo(np.int64).max
+        return lower, upper
+
+    @staticmethod
+    def projection(available: Sequence[str], columns: Optional[Sequence[str]]) -> List[str]:
+        if columns is None:
+            return list(available)
+        wanted = ["open_time"] + [c for c in columns if c != "open_time"]
+        return [c for c in wanted if c in available]
+
+
+def content_digest(data: pd.DataFrame, previous: str = "") -> str:
+    """Hash of a frame's values, chained onto ``previous`` for incremental updates."""
+    digest = hashlib.sha256(previous.encode())
+    digest.update(",".join(map(str, data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:32]
@@ -0,0 +1,168 @@
+import csv
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ..utils.logger import get_logger
+from ..utils.timeframes import TimeLike, to_epoch_ms, to_epoch_ms_array
+from .base import BaseStorage
+
+logger = get_logger(__name__)
+
+TAIL_BLOCK_SIZE = 4096
+
+
+def read_csv_tail(file_path: str) -> Tuple[List[str], int, Optional[List[str]]]:
+    """
+    Read the header and the last row of a CSV file without scanning the rows in between.
+
+    :param file_path: The CSV file
+    :return: The header, the byte offset where the last row starts and the last row's fields
+             (None if the file has no rows)
+    """
+    with open(file_path, "rb") as file:
+        header = next(csv.reader([file.readline().decode()]))
+        header_end = file.tell()
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+
+        tail = b""
+        while position > header_end:
+            step = min(TAIL_BLOCK_SIZE, position - header_end)
+            position -= step
+            file.seek(position)
+            tail = file.read(step) + tail
+            content = tail.rstrip(b"\r\n")
+            newline = content.rfind(b"\n")
+            if newline != -1:
+                row = next(csv.reader([content[newline + 1 :].decode()]))
+                return header, position + newline + 1, row
+
+        content = tail.rstrip(b"\r\n")
+        if not content:
+            return header, header_end, None
+        return header, header_end, next(csv.reader([content.decode()]))
+
+
+def append_csv(file_path: str, data: pd.DataFrame, time_column: str) -> int:
+    """
+    Append rows at or after the last row of an existing CSV file.
+
+    The last row is replaced when ``data`` contains a row with the same timestamp; rows
+    older than it are ignored. Columns are written in the file's header order.
+
+    :param file_path: An existing CSV file with a header
+    :param data: The new rows, in the same representation as the file
+    :param time_column: The column holding the row timestamps
+    :return: The number of rows written
+    """
+    header, last_offset, last_row = read_csv_tail(file_path)
+    times = to_epoch_ms_array(data[time_column])
+    last_time = to_epoch_ms(last_row[header.index(time_column)]) if last_row else None
+
+    if last_time is not None:
+        data = data[times >= last_time]
+    data = data.drop_duplicates(subset=[time_column], keep="last")
+    if data.empty:
+        return 0
+    data = data.iloc[to_epoch_ms_array(data[time_column]).argsort(kind="mergesort")]
+
+    if last_time is not None and (times == last_time).any():
+        with open(file_path, "r+b") as file:
+            file.truncate(last_offset)
+    with open(file_path, "a", newline="") as file:
+        data.reindex(columns=header).to_csv(file, header=False, index=False)
+    return len(data)
+
+
+class CSVStorage(BaseStorage):
+    """
+    Legacy layout: ``<root>/<SYMBOL>/<interval>.csv``.
+
+    Time columns are written as epoch milliseconds. Files written before that hold datetime
+    text, possibly mixed with epoch rows appended later; both are read back as epoch ms.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol, f"{interval}.csv")
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        data = self.normalize(data)
+        file_path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        data.to_csv(file_path, index=False)
+        self._catalog_write(symbol, interval, data)
+        logger.info(f"Data saved to {file_path}")
+
+    def append(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        file_path = self._path(symbol, interval)
+        if not os.path.exists(file_path):
+            self.write(symbol, interval, data)
+            return len(data)
+        previous = self._catalog_get(symbol, interval)
+        data = self.normalize(data)
+        written = append_csv(file_path, data, "open_time")
+        if written:
+            tail = self.tail_rows(data, previous.last_ms if previous else None)
+            self._catalog_append(symbol, interval, previous, tail)
+        logger.info(f"Appended {written} rows to {file_path}")
+        return written
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        entry = self._catalog_get(symbol, interval)
+        if entry is not None:
+            return entry.last_ms
+        file_path = self._path(symbol, interval)
+        if not os.path.exists(file_path):
+            return None
+        header, _, last_row = read_csv_tail(file_path)
+        if last_row is None:
+            return None
+        return to_epoch_ms(last_row[header.index("open_time")])
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        columns: Optional[Sequence[str]] = None,
+        start_time: Optional[TimeLike] = None,
+        end_time: Optional[TimeLike] = None,
+    ) -> pd.DataFrame:
+        file_path = self._path(symbol, interval)
+        if not os.path.exists(file_path):
+            return pd.DataFrame()
+
+        usecols = None
+        if columns is not None:
+            wanted = set(columns) | {"open_time"}
+            usecols = wanted.__contains__
+        df = self.normalize(pd.read_csv(file_path, usecols=usecols))
+
+        if start_time is not None or end_time is not None:
+            lower, upper = self.time_bounds(start_time, end_time)
+            df = df[(df["open_time"] >= lower) & (df["open_time"] <= upper)]
+            df = df.reset_index(drop=True)
+        return df[self.projection(df.columns, columns)]
+
+    def exists(self, symbol: str, interval: str) -> bool:
+        return os.path.exists(self._path(symbol, interval))
+
+    def size_bytes(self, symbol: str, interval: str) -> int:
+        file_path = self._path(symbol, interval)
+        return os.path.getsize(file_path) if os.path.exists(file_path) else 0
+
+    def list_series(self) -> List[Tuple[str, str]]:
+        series = []
+        for symbol in sorted(os.listdir(self.root)):
+            symbol_dir = os.path.join(self.root, symbol)
+            if not os.path.isdir(symbol_dir):
+                continue
+            for filename in sorted(os.listdir(symbol_dir)):
+                if filename.endswith(".csv"):
+                    series.append((symbol, filename[: -len(".csv")]))
+        return series
@@ -0,0 +1,50 @@
+import argparse
+import logging
+
+from ..utils.logger import get_logger, setup_logging
+from . import StorageFactory
+from .base import BaseStorage
+from .csv_storage import CSVStorage
+
+logger = get_logger(__name__)
+
+
+def migrate_csv_tree(source_dir: str, target: BaseStorage, overwrite: bool = False) -> int:
+    """
+    Copy every ``<SYMBOL>/<interval>.csv`` series under source_dir into another backend.
+
+    :param source_dir: Root of the legacy CSV tree (usually ``<data_path>/csv_data``)
+    :param target: The storage backend to write into
+    :param overwrite: Replace series that already exist in the target
+    :return: The number of series migrated
+    """
+    source = CSVStorage(source_dir)
+    migrated = 0
+    for symbol, interval in source.list_series():
+        if not overwrite and target.exists(symbol, interval):
+            logger.info(f"Skipping {symbol} {interval}: already migrated")
+            continue
+        data = source.read(symbol, interval)
+        if data.empty:
+            continue
+        target.write(symbol, interval, data)
+        migrated += 1
+    logger.info(f"Migrated {migrated} series from {source_dir}")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate a legacy CSV kline tree")
+    parser.add_argument("--source", required=True, help="Legacy csv_data directory")
+    parser.add_argument("--data-path", required=True, help="Target data_path")
+    parser.add_argument("--backend", default="npy", choices=sorted(StorageFactory.BACKENDS))
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+
+    setup_logging(log_level=logging.INFO)
+    target = StorageFactory.create_storage(args.backend, args.data_path)
+    migrate_csv_tree(args.source, target, overwrite=args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import io
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+from ..utils.timeframes import TimeLike
+from .base import TIME_COLUMNS, BaseStorage
+
+logger = get_logger(__name__)
+
+
+class NpyStorage(BaseStorage):
+    """
+    Columnar layout partitioned by interval, symbol and UTC month:
+    ``<root>/<interval>/<SYMBOL>/<YYYY-MM>/<column>.npy``.
+
+    Reads memory-map only the requested columns of the partitions that overlap the
+    requested time range, so projections and range queries never touch the rest.
+    """
+
+    SCHEMA_FILE = "schema.json"
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _series_dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol)
+
+    def _partitions(self, symbol: str, interval: str) -> List[str]:
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(series_dir)
+            if os.path.isdir(os.path.join(series_dir, name))
+        )
+
+    def _load_schema(self, symbol: str, interval: str) -> List[str]:
+        schema_path = os.path.join(self._series_dir(symbol, interval), self.SCHEMA_FILE)
+        if not os.path.exists(schema_path):
+            return []
+        with open(schema_path, "r") as file:
+            return json.load(file)["columns"]
+
+    def _save_schema(self, symbol: str, interval: str, columns: Sequence[str]) -> None:
+        schema_path = os.path.join(self._series_dir(symbol, interval), self.SCHEMA_FILE)
+        with open(schema_path + ".tmp", "w") as file:
+            json.dump({"columns": list(columns)}, file)
+        os.replace(schema_path + ".tmp", schema_path)
+
+    @staticmethod
+    def month_keys(open_time: np.ndarray) -> np.ndarray:
+        months = open_time.astype("datetime64[ms]").astype("datetime64[M]")
+        return np.datetime_as_string(months, unit="M")
+
+    @staticmethod
+    def month_bounds(key: str) -> Tuple[int, int]:
+        start = np.datetime64(key, "M")
+        return (
+            int(start.astype("datetime64[ms]").astype(np.int64)),
+            int((start + 1).astype("datetime64[ms]").astype(np.int64)),
+        )
+
+    @staticmethod
+    def to_arrays(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        arrays = {}
+        for col in data.columns:
+            if col in TIME_COLUMNS:
+                arrays[col] = data[col].to_numpy(dtype=np.int64)
+            elif pd.api.types.is_numeric_dtype(data[col]):
+                arrays[col] = data[col].to_numpy()
+            else:
+                arrays[col] = pd.to_numeric(data[col]).to_numpy(dtype=np.float64)
+        return arrays
+
+    @staticmethod
+    def _save_array(path: str, array: np.ndarray) -> None:
+        with open(path + ".tmp", "wb") as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(path + ".tmp", path)
+
+    def _write_partition(self, partition_dir: str, arrays: Dict[str, np.ndarray]) -> None:
+        os.makedirs(partition_dir, exist_ok=True)
+        for col, array in arrays.items():
+            self._save_array(os.path.join(partition_dir, f"{col}.npy"), array)
+
+    @staticmethod
+    def _grow_plan(path: str, array: np.ndarray, replace_last: bool) -> Optional[tuple]:
+        """Plan an in-place append to a 1-D .npy file, or None if its header can't be reused."""
+        with open(path, "rb") as file:
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+            else:
+                return None
+            header_length = file.tell()
+        if len(shape) != 1 or fortran_order:
+            return None
+
+        keep = shape[0] - int(replace_last)
+        header = {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (keep + len(array),),
+        }
+        buffer = io.BytesIO()
+        if version == (1, 0):
+            np.lib.format.write_array_header_1_0(buffer, header)
+        else:
+            np.lib.format.write_array_header_2_0(buffer, header)
+        # numpy pads headers so the length axis can grow without moving the data
+        if len(buffer.getvalue()) != header_length:
+            return None
+        payload = np.ascontiguousarray(array, dtype=dtype).tobytes()
+        return header_length + keep * dtype.itemsize, payload, buffer.getvalue()
+
+    def _append_partition(
+        self, partition_dir: str, arrays: Dict[str, np.ndarray], replace_last: bool
+    ) -> bool:
+        plans = {}
+        for col, array in arrays.items():
+            plan = self._grow_plan(os.path.join(partition_dir, f"{col}.npy"), array, replace_last)
+            if plan is None:
+                return False
+            plans[col] = plan
+        for col, (offset, payload, header) in plans.items():
+            with open(os.path.join(partition_dir, f"{col}.npy"), "r+b") as file:
+                file.seek(offset)
+                file.write(payload)
+                file.truncate()
+                # the header goes last so a partial write leaves the old length visible
+                file.seek(0)
+                file.write(header)
+        return True
+
+    def _rewrite_partition(
+        self, partition_dir: str, arrays: Dict[str, np.ndarray], replace_last: bool
+    ) -> None:
+        merged = {}
+        for col, array in arrays.items():
+            existing = np.load(os.path.join(partition_dir, f"{col}.npy"))
+            if replace_last:
+                existing = existing[:-1]
+            merged[col] = np.concatenate([existing, array.astype(existing.dtype)])
+        self._write_partition(partition_dir, merged)
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        series_dir = self._series_dir(symbol, interval)
+        data = self.normalize(data)
+        os.makedirs(series_dir, exist_ok=True)
+        self._save_schema(symbol, interval, data.columns)
+
+        arrays = self.to_arrays(data)
+        keys = self.month_keys(arrays["open_time"]) if len(data) else np.array([], dtype="U7")
+        unique_keys, starts = np.unique(keys, return_index=True)
+        bounds = list(starts[1:]) + [len(keys)]
+
+        for stale in set(self._partitions(symbol, interval)) - set(unique_keys):
+            shutil.rmtree(os.path.join(series_dir, stale))
+        for key, start, stop in zip(unique_keys, starts, bounds):
+            partition = {col: array[start:stop] for col, array in arrays.items()}
+            self._write_partition(os.path.join(series_dir, key), partition)
+        self._catalog_write(symbol, interval, data)
+        logger.info(f"Data saved to {series_dir} ({len(unique_keys)} partitions)")
+
+    def append(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        schema = self._load_schema(symbol, interval)
+        data = self.normalize(data)
+        if not schema:
+            self.write(symbol, interval, data)
+            return len(data)
+        if set(data.columns) != set(schema):
+            logger.warning(f"Schema change for {symbol} {interval}, rewriting series")
+            merged = pd.concat([self.read(symbol, interval), data])
+            self.write(symbol, interval, merged.drop_duplicates("open_time", keep="last"))
+            return len(data)
+
+        previous = self._catalog_get(symbol, interval)
+        last_open_time = self.last_open_time(symbol, interval)
+        data = self.tail_rows(data, last_open_time)
+        if data.empty:
+            return 0
+
+        series_dir = self._series_dir(symbol, interval)
+        partitions = self._partitions(symbol, interval)
+        arrays = self.to_arrays(data[schema])
+        keys = self.month_keys(arrays["open_time"])
+        unique_keys, starts = np.unique(keys, return_index=True)
+        bounds = list(starts[1:]) + [len(keys)]
+
+        for key, start, stop in zip(unique_keys, starts, bounds):
+            partition = {col: array[start:stop] for col, array in arrays.items()}
+            partition_dir = os.path.join(series_dir, key)
+            if partitions and key == partitions[-1]:
+                replace_last = bool(partition["open_time"][0] == last_open_time)
+                if not self._append_partition(partition_dir, partition, replace_last):
+                    self._rewrite_partition(partition_dir, partition, replace_last)
+            else:
+                self._write_partition(partition_dir, partition)
+        self._catalog_append(symbol, interval, previous, data)
+        logger.info(f"Appended {len(data)} rows to {series_dir}")
+        return len(data)
+
+    def merge(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        schema = self._load_schema(symbol, interval)
+        data = self.normalize(data)
+        if not schema or set(data.columns) != set(schema):
+            super().merge(symbol, interval, data)
+            return
+
+        # only the month partitions the new rows fall into are rewritten
+        previous = self._catalog_get(symbol, interval)
+        series_dir = self._series_dir(symbol, interval)
+        existing_partitions = set(self._partitions(symbol, interval))
+        arrays = self.to_arrays(data[schema])
+        keys = self.month_keys(arrays["open_time"])
+        unique_keys, starts = np.unique(keys, return_index=True)
+        bounds = list(starts[1:]) + [len(keys)]
+
+        for key, start, stop in zip(unique_keys, starts, bounds):
+            partition_dir = os.path.join(series_dir, key)
+            frame = pd.DataFrame({col: array[start:stop] for col, array in arrays.items()})
+            if key in existing_partitions:
+                stored = pd.DataFrame(
+                    {col: np.load(os.path.join(partition_dir, f"{col}.npy")) for col in schema}
+                )
+                frame = pd.concat([stored, frame])
+                frame = frame.drop_duplicates(subset=["open_time"], keep="last")
+                frame = frame.sort_values("open_time", kind="mergesort")
+            self._write_partition(partition_dir, self.to_arrays(frame))
+        self._catalog_merge(symbol, interval, previous, data)
+        logger.info(f"Merged {len(data)} rows into {series_dir}")
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        entry = self._catalog_get(symbol, interval)
+        if entry is not None:
+            return entry.last_ms
+        partitions = self._partitions(symbol, interval)
+        if not partitions:
+            return None
+        open_time = np.load(
+            os.path.join(self._series_dir(symbol, interval), partitions[-1], "open_time.npy"),
+            mmap_mode="r",
+        )
+        return int(open_time[-1]) if len(open_time) else None
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        columns: Optional[Sequence[str]] = None,
+        start_time: Optional[TimeLike] = None,
+        end_time: Optional[TimeLike] = None,
+    ) -> pd.DataFrame:
+        schema = self._load_schema(symbol, interval)
+        if not schema:
+            return pd.DataFrame()
+        selected = self.projection(schema, columns)
+        lower, upper = self.time_bounds(start_time, end_time)
+        series_dir = self._series_dir(symbol, interval)
+
+        chunks: Dict[str, List[np.ndarray]] = {col: [] for col in selected}
+        for key in self._partitions(symbol, interval):
+            month_start, month_end = self.month_bounds(key)
+            if month_end <= lower or month_start > upper:
+                continue
+            partition_dir = os.path.join(series_dir, key)
+            open_time = np.load(os.path.join(partition_dir, "open_time.npy"), mmap_mode="r")
+            lo = np.searchsorted(open_time, lower, side="left")
+            hi = np.searchsorted(open_time, upper, side="right")
+            if hi <= lo:
+                continue
+            for col in selected:
+                array = np.load(os.path.join(partition_dir, f"{col}.npy"), mmap_mode="r")
+                chunks[col].append(array[lo:hi])
+
+        if not chunks["open_time"]:
+            return pd.DataFrame(columns=selected)
+        return pd.DataFrame({col: np.concatenate(parts) for col, parts in chunks.items()})
+
+    def exists(self, symbol: str, interval: str) -> bool:
+        return bool(self._load_schema(symbol, interval))
+
+    def size_bytes(self, symbol: str, interval: str) -> int:
+        series_dir = self._series_dir(symbol, interval)
+        total = 0
+        for key in self._partitions(symbol, interval):
+            with os.scandir(os.path.join(series_dir, key)) as files:
+                total += sum(entry.stat().st_size for entry in files if entry.is_file())
+        return total
+
+    def list_series(self) -> List[Tuple[str, str]]:
+        series = []
+        for interval in sorted(os.listdir(self.root)):
+            interval_dir = os.path.join(self.root, interval)
+            if not os.path.isdir(interval_dir):
+                continue
+            for symbol in sorted(os.listdir(interval_dir)):
+                if os.path.exists(os.path.join(interval_dir, symbol, self.SCHEMA_FILE)):
+                    series.append((symbol, interval))
+        return series
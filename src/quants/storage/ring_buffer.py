@@ -0,0 +1,272 @@
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logger import get_logger
+from ..utils.timeframes import to_epoch_ms_array
+
+logger = get_logger(__name__)
+
+HEADER_WORDS = 4  # seq, count, capacity, n_columns
+
+
+class SharedBarBuffer:
+    """
+    Fixed-capacity ring of the most recent bars of one series in shared memory.
+
+    Layout, in 8-byte words: a header ``[seq, count, capacity, n_columns]``, then
+    ``open_time`` and ``close_time`` as int64[2 * capacity], then every value column as
+    float64[2 * capacity]. Each bar is written at slot ``i`` and ``i + capacity``, so the
+    newest ``capacity`` bars are always one contiguous slice and readers get zero-copy
+    views. There is a single writer; it makes ``seq`` odd while writing, and readers
+    that need a consistent copy retry when ``seq`` moved (a seqlock).
+    """
+
+    TIME_COLUMNS = ["open_time", "close_time"]
+    VALUE_COLUMNS = [
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "quote_asset_volume",
+        "number_of_trades",
+        "taker_buy_base_asset_volume",
+        "taker_buy_quote_asset_volume",
+    ]
+    COLUMNS = TIME_COLUMNS + VALUE_COLUMNS
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        words = np.ndarray((len(shm.buf) // 8,), dtype=np.int64, buffer=shm.buf)
+        self._header = words[:HEADER_WORDS]
+        self.capacity = int(self._header[2])
+        width = 2 * self.capacity
+        self._arrays: Dict[str, np.ndarray] = {}
+        for i, col in enumerate(self.COLUMNS):
+            offset = (HEADER_WORDS + i * width) * 8
+            dtype = np.int64 if col in self.TIME_COLUMNS else np.float64
+            self._arrays[col] = np.ndarray((width,), dtype=dtype, buffer=shm.buf, offset=offset)
+
+    @staticmethod
+    def segment_name(prefix: str, symbol: str, interval: str) -> str:
+        return f"{prefix}_{interval}_{symbol}"
+
+    @classmethod
+    def create(cls, name: str, capacity: int, replace: bool = False) -> "SharedBarBuffer":
+        """
+        :param replace: Unlink an existing segment of the same name first, one left behind
+            by a writer that did not shut down cleanly. Without it an existing segment
+            raises ``FileExistsError``, as it may belong to a live writer.
+        """
+        n_columns = len(cls.COLUMNS)
+        size = (HEADER_WORDS + n_columns * 2 * capacity) * 8
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not replace:
+                raise FileExistsError(
+                    f"Shared bar buffer {name} exists and may belong to a running writer; "
+                    f"create it with replace=True if that writer is gone"
+                ) from None
+            logger.warning(f"Replacing shared bar buffer {name} left by a previous writer")
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = [0, 0, capacity, n_columns]
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedBarBuffer":
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # before 3.13 every attach registers the segment with the resource tracker, which
+            # unlinks it when an unrelated reader process exits; readers must not own it
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return cls(shm, owner=False)
+
+    @property
+    def count(self) -> int:
+        return int(self._header[1])
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def last_open_time(self) -> Optional[int]:
+        if self.count == 0:
+            return None
+        slot = (self.count - 1) % self.capacity
+        return int(self._arrays["open_time"][slot])
+
+    def push(self, data: pd.DataFrame) -> int:
+        """
+        Write bars at or after the newest buffered bar; an equal open_time overwrites it.
+
+        :param data: Bars with the kline columns; times as datetimes or epoch milliseconds
+        :return: The number of bars written
+        """
+        open_time = to_epoch_ms_array(data["open_time"])
+        order = np.argsort(open_time, kind="mergesort")
+        open_time = open_time[order]
+        # keep the last of repeated open_times and nothing older than the newest bar
+        mask = np.append(open_time[1:] != open_time[:-1], True)
+        last = self.last_open_time()
+        if last is not None:
+            mask &= open_time >= last
+        if not mask.any():
+            return 0
+
+        rows = {
+            "open_time": open_time[mask],
+            "close_time": to_epoch_ms_array(data["close_time"])[order][mask],
+        }
+        for col in self.VALUE_COLUMNS:
+            if col in data.columns:
+                rows[col] = data[col].to_numpy(dtype=np.float64)[order][mask]
+            else:
+                rows[col] = np.full(int(mask.sum()), np.nan)
+
+        written = len(rows["open_time"])
+        first = self.count - 1 if last is not None and rows["open_time"][0] == last else self.count
+        slots = np.arange(first, first + written)[-self.capacity :] % self.capacity
+        self._header[0] += 1
+        try:
+            for col, values in rows.items():
+                array = self._arrays[col]
+                array[slots] = values[-self.capacity :]
+                array[slots + self.capacity] = values[-self.capacity :]
+            self._header[1] = first + written
+        finally:
+            self._header[0] += 1
+        return written
+
+    def clear(self) -> None:
+        """Drop every buffered bar, keeping the segment (and attached readers) in place."""
+        self._header[0] += 1
+        self._header[1] = 0
+        self._header[0] += 1
+
+    def _window(self, bars: Optional[int]) -> Tuple[int, int]:
+        available = len(self)
+        n = available if bars is None else min(bars, available)
+        if n == 0:
+            return 0, 0
+        end = (self.count - 1) % self.capacity + 1
+        if end < n:
+            end += self.capacity
+        return end - n, end
+
+    def view(
+        self, bars: Optional[int] = None, columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Zero-copy views of the newest bars, oldest first.
+
+        The views alias the shared segment: they stay valid only until the writer has
+        pushed ``capacity - bars`` more bars. Use ``snapshot`` for a stable copy.
+        """
+        start, end = self._window(bars)
+        selected = columns if columns is not None else list(self._arrays)
+        return {col: self._arrays[col][start:end] for col in selected}
+
+    def snapshot(
+        self, bars: Optional[int] = None, columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """A consistent copy of the newest bars, retried while the writer is mid-update."""
+        while True:
+            seq = int(self._header[0])
+            if seq % 2:
+                continue
+            arrays = {col: view.copy() for col, view in self.view(bars, columns).items()}
+            if int(self._header[0]) == seq:
+                return arrays
+
+    def frame(
+        self, bars: Optional[int] = None, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        return pd.DataFrame(self.snapshot(bars, columns))
+
+    def close(self) -> None:
+        self._arrays = {}
+        self._header = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SharedBarCache:
+    """
+    Registry of ``SharedBarBuffer`` segments keyed by (symbol, interval).
+
+    The collector process owns and writes the segments; other processes create a cache
+    with the same prefix and ``writer=False`` to attach to them by name.
+
+    :param replace: Let the writer take over segments that already exist, left behind by
+        a writer that did not shut down cleanly; only safe when no other writer runs
+    """
+
+    def __init__(
+        self, capacity: int, prefix: str = "quants", writer: bool = True, replace: bool = False
+    ):
+        self.capacity = capacity
+        self.prefix = prefix
+        self.writer = writer
+        self.replace = replace
+        self.buffers: Dict[Tuple[str, str], SharedBarBuffer] = {}
+
+    def get(self, symbol: str, interval: str) -> Optional[SharedBarBuffer]:
+        key = (symbol, interval)
+        if key not in self.buffers:
+            name = SharedBarBuffer.segment_name(self.prefix, symbol, interval)
+            if self.writer:
+                self.buffers[key] = SharedBarBuffer.create(name, self.capacity, self.replace)
+            else:
+                try:
+                    self.buffers[key] = SharedBarBuffer.attach(name)
+                except FileNotFoundError:
+                    return None
+        return self.buffers[key]
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self.buffers
+
+    def recent(
+        self, symbol: str, interval: str, bars: int, columns: Optional[Sequence[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        The newest ``bars`` bars of a series, or None if its segment does not hold that many
+        bars or all of ``columns``.
+        """
+        if columns is not None and not all(col in SharedBarBuffer.COLUMNS for col in columns):
+            return None
+        # writers create a segment on first access, readers attach to an existing one
+        if self.writer and (symbol, interval) not in self.buffers:
+            return None
+        buffer = self.get(symbol, interval)
+        if buffer is None or len(buffer) < bars:
+            return None
+        return buffer.frame(bars, columns)
+
+    def push(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        buffer = self.get(symbol, interval)
+        return buffer.push(data) if buffer is not None else 0
+
+    def series(self) -> List[Tuple[str, str]]:
+        return list(self.buffers)
+
+    def close(self) -> None:
+        for buffer in self.buffers.values():
+            buffer.close()
+        self.buffers = {}
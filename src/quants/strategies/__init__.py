@@ -0,0 +1,38 @@
+import importlib
+from typing import Any, Dict, Optional
+
+from ..utils.logger import get_logger
+from .base import BaseStrategy
+from .indicator_cache import IndicatorCache
+
+logger = get_logger(__name__)
+
+
+def load_strategies(
+    strategy_config: Dict[str, Any], indicator_cache: Optional[IndicatorCache] = None
+) -> Dict[str, BaseStrategy]:
+    """
+    Instantiate the configured strategies: ``FooBar`` is ``FooBarStrategy`` in ``foo_bar.py``.
+
+    :param strategy_config: Strategy name -> constructor parameters
+    :param indicator_cache: Shared by every loaded strategy, if given
+    """
+    strategies = {}
+    for strategy_name, strategy_params in strategy_config.items():
+        try:
+            # Convert strategy name to snake_case for module import
+            module_name = "".join(
+                ["_" + char.lower() if char.isupper() else char for char in strategy_name]
+            ).lstrip("_")
+            module = importlib.import_module(f".{module_name}", __name__)
+
+            strategy_class = getattr(module, f"{strategy_name}Strategy")
+            strategies[strategy_name] = strategy_class(**strategy_params)
+            strategies[strategy_name].indicator_cache = indicator_cache
+            logger.info(f"Successfully loaded strategy: {strategy_name}")
+        except (ImportError, AttributeError) as e:
+            logger.error(f"Failed to load strategy {strategy_name}: {str(e)}")
+    return strategies
+
+
+__all__ = ["BaseStrategy", "IndicatorCache", "load_strategies"]
@@ -1,9 +1,24 @@
+import copy
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional
+
+import numpy as np
 import pandas as pd
 
+from .indicator_cache import IndicatorCache
+from .panel import PricePanel
+
+SIGNAL_NAMES = {1: "BUY", -1: "SELL", 0: "HOLD"}
+
 
 class BaseStrategy(ABC):
+    # Columns and number of most recent bars the strategy needs; None loads everything
+    required_columns: Optional[List[str]] = None
+    lookback_bars: Optional[int] = None
+    # shared with the runner's other strategies once it is attached
+    indicator_cache: Optional[IndicatorCache] = None
+
     def __init__(self, name: str):
         self._name = name
 
@@ -19,15 +34,122 @@ class BaseStrategy(ABC):
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         pass
 
+    def indicator(
+        self,
+        data: pd.DataFrame,
+        name: str,
+        params: Hashable,
+        compute: Callable[[pd.DataFrame], pd.Series],
+        lookback: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Indicator values aligned with ``data``, served from the indicator cache when one is
+        attached and ``data.attrs`` names the symbol and interval of the bars.
+
+        :param name: Indicator name; strategies using the same name and params share values
+        :param compute: Computes the indicator for a frame, aligned with its rows
+        :param lookback: Earlier bars a bar's value depends on, or None if unbounded
+        """
+        symbol, interval = data.attrs.get("symbol"), data.attrs.get("interval")
+        if self.indicator_cache is None or symbol is None or interval is None:
+            return np.asarray(compute(data), dtype=np.float64)
+        return self.indicator_cache.get(symbol, interval, name, params, data, compute, lookback)
+
+    def copy(self) -> "BaseStrategy":
+        """A copy with its own rolling state that still shares the indicator cache."""
+        memo = (
+            {}
+            if self.indicator_cache is None
+            else {id(self.indicator_cache): self.indicator_cache}
+        )
+        return copy.deepcopy(self, memo)
+
+    def generate_signals_panel(self, panel: PricePanel) -> np.ndarray:
+        """
+        Optional vectorized counterpart of ``generate_signals`` for many symbols at once.
+
+        :return: (bars, symbols) array of 1 (buy), -1 (sell) and 0, aligned with the panel
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_panel(self) -> bool:
+        return type(self).generate_signals_panel is not BaseStrategy.generate_signals_panel
+
+    def warmup(self, history: pd.DataFrame) -> None:
+        """
+        Optional incremental counterpart of ``generate_signals``: reset the rolling indicator
+        state and build it up from ``history``, so that ``update`` continues where it ends.
+        """
+        raise NotImplementedError
+
+    def update(self, bar: Mapping[str, Any]) -> int:
+        """
+        Advance the rolling indicator state by one closed bar.
+
+        :param bar: Column -> value of the bar following the bars seen so far
+        :return: The signal ``generate_signals`` gives that bar: 1 (buy), -1 (sell) or 0
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_incremental(self) -> bool:
+        return type(self).update is not BaseStrategy.update
+
+    def check_incremental(self, data: pd.DataFrame, warmup_bars: Optional[int] = None) -> bool:
+        """
+        Check the incremental path against ``generate_signals`` on the same bars.
+
+        A copy of the strategy is warmed up on the first ``warmup_bars`` bars (half of them
+        by default) and fed the rest one by one; the strategy itself is left untouched.
+
+        :return: Whether every fed bar got the same signal as in the batch path
+        """
+        if warmup_bars is None:
+            warmup_bars = len(data) // 2
+        expected = self.generate_signals(data)["signal"].to_numpy()[warmup_bars:]
+        probe = self.copy()
+        probe.warmup(data.iloc[:warmup_bars])
+        actual = [probe.update(bar) for bar in data.iloc[warmup_bars:].to_dict("records")]
+        return bool(np.array_equal(np.asarray(actual, dtype=np.int64), expected))
+
+    def get_plot_config(self, data: pd.DataFrame) -> Dict[str, Any]:
+        return {"indicator_columns": []}
+
     def run(self, data: pd.DataFrame) -> dict:
         data = self.generate_signals(data)
 
         last_signal = data["signal"].iloc[-1]
         trigger = last_signal != 0
 
+        # epoch ms of the last bar's close; renderers convert it to local time
+        if "close_time" in data.columns:
+            trigger_time = int(data["close_time"].iloc[-1])
+        else:
+            trigger_time = data.index[-1]
+
         return {
             "trigger": trigger,
             "signal": "BUY" if last_signal > 0 else "SELL" if last_signal < 0 else "HOLD",
-            "trigger_time": data.index[-1],
+            "trigger_time": trigger_time,
             "data": data,
         }
+
+    def run_panel(self, panel: PricePanel) -> Dict[str, dict]:
+        """
+        Evaluate the latest bar of every symbol in one pass.
+
+        :return: Symbol -> ``run``-style result (without ``data``) for the triggered symbols
+        """
+        if not panel.symbols:
+            return {}
+        last = np.nan_to_num(self.generate_signals_panel(panel)[-1]).astype(np.int64)
+        trigger_time = int(panel.close_time[-1])
+        return {
+            panel.symbols[j]: {
+                "trigger": True,
+                "signal": SIGNAL_NAMES[int(np.sign(last[j]))],
+                "trigger_time": trigger_time,
+            }
+            for j in np.flatnonzero(last)
+        }
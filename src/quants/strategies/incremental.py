@@ -0,0 +1,20 @@
+import math
+from collections import deque
+
+
+class RollingMomentum:
+    """Difference to the value ``period`` updates earlier, like ``s - s.shift(period)``."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        self.window: deque = deque(maxlen=self.period + 1)
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        self.window.append(x)
+        if len(self.window) > self.period:
+            self.value = self.window[-1] - self.window[0]
+        return self.value
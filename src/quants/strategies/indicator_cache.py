@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CacheKey = Tuple[str, str, str, Hashable]
+
+
+@dataclass
+class CachedSeries:
+    """Indicator values of the closed bars of one series, aligned with their open times."""
+
+    open_time: np.ndarray
+    values: np.ndarray
+
+
+def _frozen(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator values shared by all strategies of a runner. Lookups return what
+    ``compute(data)`` would, for the bars of ``data`` alone.
+
+    Entries are kept per (symbol, interval, indicator, params) and hold closed bars only,
+    so a lookup hits when the entry reaches the last closed bar of the requested frame; the
+    still open bar is always computed. When the frame has closed bars past the entry and the
+    indicator's lookback is bounded, only the new bars (plus the bars they look back on) are
+    computed and appended to the entry.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[CacheKey, CachedSeries]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+
+    def get(
+        self,
+        symbol: str,
+        interval: str,
+        name: str,
+        params: Hashable,
+        data: pd.DataFrame,
+        compute: Callable[[pd.DataFrame], pd.Series],
+        lookback: Optional[int] = None,
+        now_ms: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Indicator values for every row of ``data``.
+
+        :param params: Hashable parameters that, with ``name``, identify the indicator
+        :param data: Bars sorted by open_time, with epoch-ms open_time and close_time
+        :param compute: Computes the indicator for a frame, aligned with its rows
+        :param lookback: Earlier bars a bar's value depends on, or None if unbounded
+        :param now_ms: Bars closing before this are final; defaults to the current time
+        :return: Read-only float64 array aligned with ``data``
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        open_time = data["open_time"].to_numpy(dtype=np.int64)
+        closed = int(np.searchsorted(data["close_time"].to_numpy(dtype=np.int64), now_ms))
+        key = (symbol, interval, name, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+
+        cached = None
+        if entry is not None and closed and (closed == len(data) or lookback is not None):
+            cached = self._cached_values(entry, open_time[:closed], data, compute, lookback)
+        if cached is not None:
+            parts = [cached]
+            if lookback and entry.open_time[0] != open_time[0]:
+                # the first bars of the frame lack the history the entry was computed with
+                head = min(lookback, closed)
+                parts = [np.asarray(compute(data.iloc[:head]), dtype=np.float64), cached[head:]]
+            if closed < len(data):
+                start = max(closed - lookback, 0)
+                tail = np.asarray(compute(data.iloc[start:]), dtype=np.float64)
+                parts.append(tail[closed - start :])
+            return cached if len(parts) == 1 else _frozen(np.concatenate(parts))
+
+        with self.lock:
+            self.misses += 1
+        values = _frozen(np.asarray(compute(data), dtype=np.float64))
+        if closed:
+            self._store(key, CachedSeries(open_time[:closed].copy(), values[:closed]))
+        return values
+
+    def _cached_values(
+        self,
+        entry: CachedSeries,
+        open_time: np.ndarray,
+        data: pd.DataFrame,
+        compute: Callable[[pd.DataFrame], pd.Series],
+        lookback: Optional[int],
+    ) -> Optional[np.ndarray]:
+        """Values of the closed bars ``open_time`` from ``entry``, extending it if needed."""
+        with self.lock:
+            cached_time, cached_values = entry.open_time, entry.values
+        start = int(np.searchsorted(cached_time, open_time[0]))
+        if start == len(cached_time) or cached_time[start] != open_time[0]:
+            return None
+        if lookback is None and start:
+            # unbounded indicators depend on where the frame starts
+            return None
+        covered = len(cached_time) - start
+        if covered >= len(open_time):
+            # both are runs of the same stored series, so equal ends mean equal bars
+            if cached_time[start + len(open_time) - 1] != open_time[-1]:
+                return None
+            with self.lock:
+                self.hits += 1
+            return cached_values[start : start + len(open_time)]
+
+        if lookback is None or open_time[covered - 1] != cached_time[-1]:
+            return None
+        first = max(covered - lookback, 0)
+        new = np.asarray(compute(data.iloc[first : len(open_time)]), dtype=np.float64)
+        values = _frozen(np.concatenate([cached_values, new[covered - first :]]))
+        with self.lock:
+            self.extensions += 1
+            # another thread may have extended the entry meanwhile
+            if entry.open_time is cached_time:
+                entry.open_time = np.concatenate([cached_time, open_time[covered:]])
+                entry.values = values
+        return values[start:]
+
+    def _store(self, key: CacheKey, entry: CachedSeries) -> None:
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "extensions": self.extensions,
+            }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,78 @@
+import math
+from typing import Any, Dict, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .. import indicators
+from .base import BaseStrategy
+from .incremental import RollingMomentum
+from .panel import PricePanel
+
+
+class MomentumStrategy(BaseStrategy):
+    """
+    Buy when momentum (close minus the close ``period`` bars earlier) crosses above
+    ``buy_threshold``, sell when it crosses below ``sell_threshold``.
+    """
+
+    required_columns = ["close"]
+
+    def __init__(self, period: int = 10, buy_threshold: float = 0, sell_threshold: float = 0):
+        super().__init__("Momentum")
+        self.period = period
+        self.buy_threshold = buy_threshold
+        self.sell_threshold = sell_threshold
+        # a crossing needs the momentum of the last two bars
+        self.lookback_bars = period + 2
+        self._momentum = RollingMomentum(period)
+        self._previous = math.nan
+
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        data = data.copy()
+        data["momentum"] = self.indicator(
+            data,
+            "momentum",
+            (self.period,),
+            lambda bars: bars["close"] - bars["close"].shift(self.period),
+            lookback=self.period,
+        )
+        return data
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        data = self.calculate_indicators(data)
+        momentum = data["momentum"]
+        previous = momentum.shift(1)
+        buy = (momentum > self.buy_threshold) & (previous <= self.buy_threshold)
+        sell = (momentum < self.sell_threshold) & (previous >= self.sell_threshold)
+        data["signal"] = np.where(buy, 1, np.where(sell, -1, 0))
+        return data
+
+    def generate_signals_panel(self, panel: PricePanel) -> np.ndarray:
+        momentum = indicators.momentum(panel.close, self.period)
+        previous = indicators.shift(momentum, 1)
+        with np.errstate(invalid="ignore"):
+            buy = (momentum > self.buy_threshold) & (previous <= self.buy_threshold)
+            sell = (momentum < self.sell_threshold) & (previous >= self.sell_threshold)
+        return np.where(buy, 1, np.where(sell, -1, 0))
+
+    def warmup(self, history: pd.DataFrame) -> None:
+        self._momentum.reset()
+        self._previous = math.nan
+        for close in history["close"].to_numpy(dtype=np.float64):
+            self._step(close)
+
+    def update(self, bar: Mapping[str, Any]) -> int:
+        return self._step(float(bar["close"]))
+
+    def _step(self, close: float) -> int:
+        momentum = self._momentum.update(close)
+        previous, self._previous = self._previous, momentum
+        if momentum > self.buy_threshold and previous <= self.buy_threshold:
+            return 1
+        if momentum < self.sell_threshold and previous >= self.sell_threshold:
+            return -1
+        return 0
+
+    def get_plot_config(self, data: pd.DataFrame) -> Dict[str, Any]:
+        return {"indicator_columns": ["momentum"]}
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..utils.timeframes import interval_to_ms
+
+
+@dataclass
+class PricePanel:
+    """
+    Bars of many symbols on one time grid.
+
+    :param interval: Bar interval of the grid
+    :param symbols: Symbol of each column
+    :param open_time: (bars,) grid open times, UTC epoch ms
+    :param close_time: (bars,) grid close times, UTC epoch ms
+    :param fields: Column name -> (bars, symbols) float64 array, NaN where a symbol has no bar
+    """
+
+    interval: str
+    symbols: List[str]
+    open_time: np.ndarray
+    close_time: np.ndarray
+    fields: Dict[str, np.ndarray]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.fields["close"]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.fields["volume"]
+
+    @property
+    def shape(self):
+        return len(self.open_time), len(self.symbols)
+
+    def tail(self, bars: int) -> "PricePanel":
+        """The last ``bars`` bars of the grid, as views."""
+        rows = slice(max(len(self.open_time) - bars, 0), None)
+        return PricePanel(
+            self.interval,
+            self.symbols,
+            self.open_time[rows],
+            self.close_time[rows],
+            {col: values[rows] for col, values in self.fields.items()},
+        )
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """Per-symbol kline frames of the bars each symbol has."""
+        frames = {}
+        for j, symbol in enumerate(self.symbols):
+            rows = ~np.isnan(self.close[:, j])
+            data = {"open_time": self.open_time[rows], "close_time": self.close_time[rows]}
+            data.update((col, values[rows, j]) for col, values in self.fields.items())
+            frames[symbol] = pd.DataFrame(data)
+        return frames
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        interval: str,
+        bars: Optional[int] = None,
+        columns: Sequence[str] = ("close", "volume"),
+    ) -> "PricePanel":
+        """
+        Stack per-symbol kline frames onto the ``bars`` most recent bars of any of them.
+
+        :param frames: Symbol -> frame with an epoch-ms ``open_time`` and ``columns``
+        :param bars: Grid length, or None to span every bar of every frame
+        """
+        step = interval_to_ms(interval)
+        symbols = [symbol for symbol, df in frames.items() if not df.empty]
+        if symbols:
+            end = max(int(frames[symbol]["open_time"].iloc[-1]) for symbol in symbols)
+            if bars is None:
+                start = min(int(frames[symbol]["open_time"].iloc[0]) for symbol in symbols)
+                bars = (end - start) // step + 1
+            open_time = end - step * np.arange(bars - 1, -1, -1, dtype=np.int64)
+        else:
+            open_time = np.empty(0, dtype=np.int64)
+
+        fields = {col: np.full((len(open_time), len(symbols)), np.nan) for col in columns}
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            offset = df["open_time"].to_numpy(dtype=np.int64) - open_time[0]
+            rows = offset // step
+            on_grid = (offset >= 0) & (offset % step == 0) & (rows < len(open_time))
+            for col in columns:
+                fields[col][rows[on_grid], j] = df[col].to_numpy(dtype=np.float64)[on_grid]
+        return cls(interval, symbols, open_time, open_time + (step - 1), fields)
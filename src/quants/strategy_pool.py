@@ -0,0 +1,199 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from hashlib import md5
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.quants.storage import SharedBarCache, StorageFactory
+from src.quants.strategies import IndicatorCache, load_strategies
+from src.quants.strategies.base import SIGNAL_NAMES, BaseStrategy
+from src.quants.utils.logger import get_logger
+from src.quants.visualization.chart_drawer import ChartDrawer
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SignalRecord:
+    """
+    Outcome of one strategy run on one series, as returned by a worker process.
+
+    :param signal: Signal of the last bar: 1 (buy), -1 (sell) or 0
+    :param trigger_time: close_time of the last bar, UTC epoch ms
+    :param chart_path: Chart drawn for a trigger
+    :param error: Why the run failed, if it did
+    """
+
+    strategy: str
+    symbol: str
+    interval: str
+    signal: int = 0
+    trigger_time: Optional[int] = None
+    chart_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def trigger(self) -> bool:
+        return self.signal != 0
+
+    @property
+    def signal_name(self) -> str:
+        return SIGNAL_NAMES[self.signal]
+
+
+@dataclass(frozen=True)
+class WorkerConfig:
+    """
+    What a worker process needs to build its state.
+
+    :param strategies: Strategy name -> constructor parameters
+    :param ring_buffer_bars: Capacity of the collector's shared bar cache, 0 if it has none
+    """
+
+    strategies: Dict[str, Dict[str, Any]]
+    backend: str
+    data_path: str
+    timezone: str
+    ring_buffer_bars: int = 0
+    indicator_cache_entries: int = 4096
+
+
+def data_columns(strategy: Optional[BaseStrategy]) -> Optional[List[str]]:
+    """Columns a strategy run loads: the chart's and the strategy's, or None for all."""
+    if strategy is None or strategy.required_columns is None:
+        return None
+    columns = ["open_time", "close_time", *ChartDrawer.COLUMNS]
+    return columns + [c for c in strategy.required_columns if c not in columns]
+
+
+def closed_bars(data: pd.DataFrame, close_time: int) -> pd.DataFrame:
+    """The bars of ``data`` closed by ``close_time``, dropping a still open last candle."""
+    if data.empty or "close_time" not in data.columns:
+        return data
+    return data[data["close_time"].to_numpy(dtype=np.int64) <= close_time]
+
+
+class StrategyWorker:
+    """
+    State a worker process keeps between runs: loaded strategies with their indicator
+    cache, storage handles and the chart drawer. Bars are read from memory-mapped storage
+    or the collector's shared bar cache, never sent from the parent.
+    """
+
+    def __init__(self, config: WorkerConfig):
+        self.indicator_cache = IndicatorCache(config.indicator_cache_entries)
+        self.strategies = load_strategies(config.strategies, self.indicator_cache)
+        self.storage = StorageFactory.create_storage(config.backend, config.data_path)
+        self.bar_cache = (
+            SharedBarCache(config.ring_buffer_bars, writer=False)
+            if config.ring_buffer_bars
+            else None
+        )
+        self.chart_drawer = ChartDrawer(os.path.join(config.data_path, "charts"), config.timezone)
+
+    def load(
+        self, symbol: str, interval: str, strategy: BaseStrategy, close_time: int
+    ) -> pd.DataFrame:
+        """Bars of a series up to the bar closing at ``close_time``."""
+        columns = data_columns(strategy)
+        if strategy.lookback_bars is None:
+            data = self.storage.read(symbol, interval, columns=columns)
+        else:
+            bars = max(strategy.lookback_bars, ChartDrawer.MAX_CANDLES)
+            data = None
+            if self.bar_cache is not None:
+                data = self.bar_cache.recent(symbol, interval, bars, columns)
+            if data is None:
+                data = self.storage.read_recent(symbol, interval, bars, columns)
+        data = closed_bars(data, close_time)
+        data.attrs.update(symbol=symbol, interval=interval)
+        return data
+
+    def run(self, strategy_name: str, symbol: str, interval: str, close_time: int) -> SignalRecord:
+        strategy = self.strategies.get(strategy_name)
+        if strategy is None:
+            return SignalRecord(strategy_name, symbol, interval, error="strategy not loaded")
+        try:
+            data = self.load(symbol, interval, strategy, close_time)
+            if data.empty:
+                return SignalRecord(strategy_name, symbol, interval, error="no data")
+            result = strategy.run(data)
+            signal = int(result["data"]["signal"].iloc[-1])
+            chart_path = None
+            if signal:
+                strategy_id = md5(strategy_name.encode()).hexdigest()[:8]
+                chart_path = self.chart_drawer.draw_chart(
+                    result["data"],
+                    symbol,
+                    interval,
+                    strategy_id,
+                    result["trigger_time"],
+                    strategy.get_plot_config(result["data"]),
+                )
+            return SignalRecord(
+                strategy_name, symbol, interval, signal, int(result["trigger_time"]), chart_path
+            )
+        except Exception as e:
+            return SignalRecord(strategy_name, symbol, interval, error=str(e))
+
+
+_worker: Optional[StrategyWorker] = None
+
+
+def _init_worker(config: WorkerConfig) -> None:
+    global _worker
+    _worker = StrategyWorker(config)
+
+
+def _run_batch(
+    strategy_name: str, interval: str, symbols: Sequence[str], close_time: int
+) -> List[SignalRecord]:
+    return [_worker.run(strategy_name, symbol, interval, close_time) for symbol in symbols]
+
+
+class StrategyPool:
+    """
+    Runs strategies in worker processes, so signal generation and chart rendering use every
+    core instead of sharing one GIL. Each worker builds a ``StrategyWorker`` once; a run
+    sends it a batch of symbol names and gets ``SignalRecord``s back.
+    """
+
+    # batches per worker and run: enough to balance uneven symbols, few enough to amortize IPC
+    BATCHES_PER_WORKER = 4
+
+    def __init__(self, config: WorkerConfig, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        # spawned rather than forked, as the parent runs scheduler and stream threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+        logger.info(f"Strategy pool started with {self.workers} workers")
+
+    def run(
+        self, strategy_name: str, interval: str, symbols: Sequence[str], close_time: int
+    ) -> List[SignalRecord]:
+        """
+        :param close_time: close_time of the bar to evaluate, UTC epoch ms; later bars, such
+            as a still open candle, are left out
+        """
+        if not symbols:
+            return []
+        size = math.ceil(len(symbols) / (self.BATCHES_PER_WORKER * self.workers))
+        futures = [
+            self.executor.submit(
+                _run_batch, strategy_name, interval, symbols[i : i + size], close_time
+            )
+            for i in range(0, len(symbols), size)
+        ]
+        return [record for future in futures for record in future.result()]
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
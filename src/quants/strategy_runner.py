@@ -1,81 +1,418 @@
-import importlib
 import os
-from typing import Any, Dict
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from hashlib import md5
+from typing import Any, Dict, List, Optional, Tuple
+
 import pandas as pd
 
 from src.quants.config import AppConfig
 from src.quants.db.trigger_log import TriggerLog
+from src.quants.events import BarsClosed, EventBus
+from src.quants.strategies import load_strategies
 from src.quants.strategies.base import BaseStrategy
+from src.quants.strategies.indicator_cache import IndicatorCache
+from src.quants.strategies.panel import PricePanel
+from src.quants.strategy_pool import StrategyPool, WorkerConfig, closed_bars, data_columns
 from src.quants.utils.logger import get_logger
+from src.quants.utils.timeframes import interval_to_ms, to_local_datetime
 from src.quants.visualization.chart_drawer import ChartDrawer
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class SeriesState:
+    """
+    A strategy copy holding the rolling state of one series.
+
+    :param last_open_time: open_time of the last bar fed to the strategy
+    :param rows: Stored bars up to and including that bar, to notice rewritten history
+    """
+
+    strategy: BaseStrategy
+    last_open_time: int
+    rows: int
+
+
 class StrategyRunner:
+    # bars stacked per symbol in panel mode when a strategy does not set lookback_bars
+    PANEL_BARS = 500
+
     def __init__(self, collector: Any, config: AppConfig):
         self.collector = collector
         self.config = config
-        self.chart_drawer = ChartDrawer(os.path.join(config.data_storage.data_path, "charts"))
+        self.chart_drawer = ChartDrawer(
+            os.path.join(config.data_storage.data_path, "charts"), config.cex.timezone
+        )
         self.trigger_log = TriggerLog(
             os.path.join(config.data_storage.data_path, "trigger_log.db")
         )
+        # indicators computed by one strategy are reused by the others
+        self.indicator_cache = IndicatorCache(config.cex.indicator_cache_entries)
         self.strategies = self._load_strategies(config.strategies)
+        # content hash of each (strategy, symbol, interval) series at its last run
+        self._last_run_hashes: Dict[Tuple[str, str, str], str] = {}
+        # incremental strategies: rolling state per series, and whether each passed its check
+        self._series_states: Dict[Tuple[str, str, str], SeriesState] = {}
+        self._incremental_checked: Dict[str, bool] = {}
+        self.pool = None
+        if config.cex.strategy_execution == "process":
+            self.pool = StrategyPool(
+                WorkerConfig(
+                    config.strategies,
+                    config.data_storage.backend,
+                    config.data_storage.data_path,
+                    config.cex.timezone,
+                    config.data_storage.ring_buffer_bars,
+                    config.cex.indicator_cache_entries,
+                ),
+                workers=config.cex.strategy_workers,
+            )
 
     def _load_strategies(self, strategy_config: Dict[str, Any]) -> Dict[str, BaseStrategy]:
-        strategies = {}
-        for strategy_name, strategy_params in strategy_config.items():
-            try:
-                # Convert strategy name to snake_case for module import
-                module_name = ''.join(['_' + char.lower() if char.isupper() else char for char in strategy_name]).lstrip('_')
-                module = importlib.import_module(f"src.quants.strategies.{module_name}")
-                
-                # Use the original strategy name for class name
-                strategy_class_name = f"{strategy_name}Strategy"
-                
-                strategy_class = getattr(module, strategy_class_name)
-                strategies[strategy_name] = strategy_class(**strategy_params)
-                logger.info(f"Successfully loaded strategy: {strategy_name}")
-            except (ImportError, AttributeError) as e:
-                logger.error(f"Failed to load strategy {strategy_name}: {str(e)}")
-        return strategies
-
-    def run_strategy(self, strategy_name: str, symbol: str, interval: str):
-        data = self.prepare_data(symbol, interval)
+        return load_strategies(strategy_config, self.indicator_cache)
+
+    @staticmethod
+    def _closed_until(close_time: Optional[int]) -> int:
+        """close_time of the newest bar to evaluate: the given one, or the last closed bar."""
+        return close_time if close_time is not None else int(time.time() * 1000) - 1
 
+    def run_strategy(
+        self, strategy_name: str, symbol: str, interval: str, close_time: Optional[int] = None
+    ):
+        """
+        :param close_time: close_time of the bar to evaluate, UTC epoch ms; defaults to the
+            last closed bar, so a still open candle is never evaluated
+        """
+        close_time = self._closed_until(close_time)
         strategy = self.strategies.get(strategy_name)
         if not strategy:
             logger.error(f"Strategy {strategy_name} not found")
             return
 
-        result = strategy.run(data)
+        entry = self.collector.series_entry(symbol, interval)
+        run_key = (strategy_name, symbol, interval)
+        if entry is not None and self._last_run_hashes.get(run_key) == entry.content_hash:
+            logger.info(f"Skipping {strategy_name} on {symbol} ({interval}): no new data")
+            return
+
+        incremental = entry is not None and self._incremental_enabled(
+            strategy_name, strategy, symbol, interval, close_time
+        )
+        if incremental:
+            result = self._run_incremental(
+                strategy_name, strategy, symbol, interval, entry, close_time
+            )
+            if result is None:
+                logger.info(f"Skipping {strategy_name} on {symbol} ({interval}): no closed bar")
+                return
+        else:
+            data = self.prepare_data(symbol, interval, strategy, close_time)
+            if data.empty:
+                logger.warning(f"No data available for {symbol} ({interval})")
+                return
+            result = strategy.run(data)
 
         if result["trigger"]:
-            logger.info(f"Trigger condition met for {strategy_name} on {symbol} ({interval})")
+            if "data" not in result:
+                # charts need the symbol's full frame with indicator columns
+                data = self.prepare_data(symbol, interval, strategy, close_time)
+                result["data"] = strategy.generate_signals(data)
+            self._emit_trigger(strategy_name, strategy, symbol, interval, result)
+
+        if entry is not None:
+            self._last_run_hashes[run_key] = entry.content_hash
+        logger.info(f"Strategy run completed for {strategy_name} on {symbol} ({interval})")
+        logger.debug(f"Indicator cache: {self.indicator_cache.stats()}")
 
-            strategy_id = md5(strategy_name.encode()).hexdigest()[:8]
-            plot_config = strategy.get_plot_config(result["data"])
+    def run_strategy_panel(
+        self,
+        strategy_name: str,
+        interval: str,
+        symbols: Optional[List[str]] = None,
+        close_time: Optional[int] = None,
+    ):
+        """
+        Run a strategy over every symbol of an interval in one vectorized pass.
 
-            chart_path = self.chart_drawer.draw_chart(
-    result["data"], symbol, interval, strategy_id, result["trigger_time"], plot_config
-)
-            self.trigger_log.log_trigger(
-                result["trigger_time"],
-                symbol,
-                interval,
-                strategy_name,
-                result["signal"],
-                chart_path,
+        Strategies without ``generate_signals_panel`` run symbol by symbol instead.
+        """
+        close_time = self._closed_until(close_time)
+        strategy = self.strategies.get(strategy_name)
+        if not strategy:
+            logger.error(f"Strategy {strategy_name} not found")
+            return
+
+        symbols = symbols if symbols is not None else self.collector.get_all_usdt_pairs()
+        if not strategy.supports_panel:
+            for symbol in symbols:
+                self.run_strategy(strategy_name, symbol, interval, close_time)
+            return
+
+        # only series whose bars changed since their last run can produce new triggers
+        changed = {}
+        for symbol in symbols:
+            entry = self.collector.series_entry(symbol, interval)
+            content_hash = entry.content_hash if entry is not None else None
+            last_hash = self._last_run_hashes.get((strategy_name, symbol, interval))
+            if content_hash is None or last_hash != content_hash:
+                changed[symbol] = content_hash
+        if not changed:
+            logger.info(f"Skipping {strategy_name} on {interval}: no new data")
+            return
+
+        bars = strategy.lookback_bars or self.PANEL_BARS
+        columns = ["open_time", "close_time", *(strategy.required_columns or ["close", "volume"])]
+        # one bar more than the grid, in case the newest stored bar is still open
+        frames = {
+            symbol: closed_bars(
+                self.collector.load_recent(symbol, interval, bars + 1, columns=columns),
+                close_time,
             )
+            for symbol in symbols
+        }
+        panel = PricePanel.from_frames(frames, interval, bars, columns=columns[2:])
+        results = strategy.run_panel(panel)
 
-        logger.info(f"Strategy run completed for {strategy_name} on {symbol} ({interval})")
+        for symbol, result in results.items():
+            if symbol not in changed:
+                continue
+            # charts need the symbol's full frame with indicator columns
+            data = self.prepare_data(symbol, interval, strategy, close_time)
+            result["data"] = strategy.generate_signals(data)
+            self._emit_trigger(strategy_name, strategy, symbol, interval, result)
 
-    def prepare_data(self, symbol: str, interval: str) -> pd.DataFrame:
-        data = self.collector.load_data(symbol, interval)
+        for symbol, content_hash in changed.items():
+            if content_hash is not None:
+                self._last_run_hashes[(strategy_name, symbol, interval)] = content_hash
+        logger.info(
+            f"Panel run completed for {strategy_name} on {interval}: "
+            f"{len(panel.symbols)} symbols, {len(results)} triggers"
+        )
+
+    def run_strategy_pool(
+        self,
+        strategy_name: str,
+        interval: str,
+        symbols: Optional[List[str]] = None,
+        close_time: Optional[int] = None,
+    ):
+        """Run a strategy over the changed series of an interval in the worker processes."""
+        close_time = self._closed_until(close_time)
+        if strategy_name not in self.strategies:
+            logger.error(f"Strategy {strategy_name} not found")
+            return
+
+        symbols = symbols if symbols is not None else self.collector.get_all_usdt_pairs()
+        hashes = {}
+        for symbol in symbols:
+            entry = self.collector.series_entry(symbol, interval)
+            hashes[symbol] = entry.content_hash if entry is not None else None
+        changed = [
+            symbol
+            for symbol, content_hash in hashes.items()
+            if content_hash is None
+            or self._last_run_hashes.get((strategy_name, symbol, interval)) != content_hash
+        ]
+        if not changed:
+            logger.info(f"Skipping {strategy_name} on {interval}: no new data")
+            return
+
+        records = self.pool.run(strategy_name, interval, changed, close_time)
+        for record in records:
+            symbol = record.symbol
+            if record.error is not None:
+                logger.warning(f"{strategy_name} failed on {symbol} ({interval}): {record.error}")
+                continue
+            if record.trigger:
+                logger.info(f"Trigger condition met for {strategy_name} on {symbol} ({interval})")
+                self.trigger_log.log_trigger(
+                    to_local_datetime(record.trigger_time, self.config.cex.timezone),
+                    symbol,
+                    interval,
+                    strategy_name,
+                    record.signal_name,
+                    record.chart_path,
+                )
+            if hashes[symbol] is not None:
+                self._last_run_hashes[(strategy_name, symbol, interval)] = hashes[symbol]
+        logger.info(
+            f"Pool run completed for {strategy_name} on {interval}: {len(records)} symbols, "
+            f"{sum(record.trigger for record in records)} triggers"
+        )
+
+    def run_interval(
+        self,
+        strategy_name: str,
+        interval: str,
+        symbols: Optional[List[str]] = None,
+        close_time: Optional[int] = None,
+    ):
+        """
+        Run a strategy over the symbols of an interval, all of them by default, in the
+        configured execution mode.
+
+        :param close_time: close_time of the bar to evaluate, UTC epoch ms; defaults to the
+            last closed bar
+        """
+        if self.pool is not None:
+            self.run_strategy_pool(strategy_name, interval, symbols, close_time)
+        elif self.config.cex.strategy_execution == "panel":
+            self.run_strategy_panel(strategy_name, interval, symbols, close_time)
+        else:
+            symbols = symbols if symbols is not None else self.collector.get_all_usdt_pairs()
+            for symbol in symbols:
+                self.run_strategy(strategy_name, symbol, interval, close_time)
+
+    def subscribe(self, events: EventBus):
+        """Run the strategies on exactly the series that got new closed bars."""
+        events.subscribe(BarsClosed, self.on_bars_closed)
+
+    def on_bars_closed(self, event: BarsClosed):
+        if event.interval not in self.config.cex.kline_intervals:
+            return
+        logger.info(f"{len(event.symbols)} {event.interval} bars closed at {event.close_time}")
+        for strategy_name in self.get_available_strategies():
+            self.run_interval(
+                strategy_name, event.interval, list(event.symbols), event.close_time
+            )
+
+    def _incremental_enabled(
+        self,
+        strategy_name: str,
+        strategy: BaseStrategy,
+        symbol: str,
+        interval: str,
+        close_time: int,
+    ) -> bool:
+        """Whether to use a strategy's incremental path, checked against its batch path once."""
+        if not strategy.supports_incremental:
+            return False
+        if strategy_name not in self._incremental_checked:
+            data = self.prepare_data(symbol, interval, strategy, close_time)
+            if len(data) < 2:
+                return False
+            passed = strategy.check_incremental(data)
+            if not passed:
+                logger.error(
+                    f"Incremental signals of {strategy_name} differ from its batch signals "
+                    f"on {symbol} ({interval}); using the batch path"
+                )
+            self._incremental_checked[strategy_name] = passed
+        return self._incremental_checked[strategy_name]
+
+    def _run_incremental(
+        self,
+        strategy_name: str,
+        strategy: BaseStrategy,
+        symbol: str,
+        interval: str,
+        entry: Any,
+        close_time: int,
+    ) -> Optional[dict]:
+        """
+        Feed the bars that closed since the last run to the series' rolling state. The state
+        is warmed up from history on first use, and again if stored history was rewritten.
+
+        :return: ``run``-style result (without ``data``) for the bar closing at
+            ``close_time`` or the newest bar before it, or None if no bar closed since the
+            last run
+        """
+        key = (strategy_name, symbol, interval)
+        state = self._series_states.get(key)
+        bars = None
+        if state is not None:
+            # at most one bar per interval step can have been stored since
+            new_bars = (entry.last_ms - state.last_open_time) // interval_to_ms(interval)
+            bars = pd.DataFrame(columns=["open_time"])
+            if new_bars > 0:
+                bars = self.collector.load_recent(
+                    symbol, interval, new_bars, columns=data_columns(strategy)
+                )
+                bars = bars[bars["open_time"] > state.last_open_time]
+            if entry.rows - len(bars) != state.rows:
+                logger.info(f"Stored {symbol} ({interval}) bars changed, warming up again")
+                state = None
+
+        if state is None:
+            data = self.prepare_data(symbol, interval, strategy)
+            closed = closed_bars(data, close_time)
+            if len(closed) < 2:
+                return None
+            state = SeriesState(strategy.copy(), 0, 0)
+            state.strategy.warmup(closed.iloc[:-1])
+            state.last_open_time = int(closed["open_time"].iloc[-2])
+            state.rows = entry.rows - (len(data) - len(closed) + 1)
+            self._series_states[key] = state
+            bars = closed.iloc[-1:]
+
+        bars = closed_bars(bars, close_time)
+        if bars.empty:
+            return None
+        for bar in bars.to_dict("records"):
+            signal = state.strategy.update(bar)
+        state.last_open_time = int(bars["open_time"].iloc[-1])
+        state.rows += len(bars)
+
+        return {
+            "trigger": signal != 0,
+            "signal": "BUY" if signal > 0 else "SELL" if signal < 0 else "HOLD",
+            "trigger_time": int(bars["close_time"].iloc[-1]),
+        }
+
+    def _emit_trigger(
+        self, strategy_name: str, strategy: BaseStrategy, symbol: str, interval: str, result: dict
+    ):
+        logger.info(f"Trigger condition met for {strategy_name} on {symbol} ({interval})")
+
+        strategy_id = md5(strategy_name.encode()).hexdigest()[:8]
+        plot_config = strategy.get_plot_config(result["data"])
+
+        chart_path = self.chart_drawer.draw_chart(
+    result["data"], symbol, interval, strategy_id, result["trigger_time"], plot_config
+)
+        trigger_time = result["trigger_time"]
+        if not isinstance(trigger_time, datetime):
+            trigger_time = to_local_datetime(trigger_time, self.config.cex.timezone)
+        self.trigger_log.log_trigger(
+            trigger_time,
+            symbol,
+            interval,
+            strategy_name,
+            result["signal"],
+            chart_path,
+        )
+
+    def prepare_data(
+        self,
+        symbol: str,
+        interval: str,
+        strategy: Optional[BaseStrategy] = None,
+        close_time: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        :param close_time: Leave out bars closing after this, UTC epoch ms, such as a still
+            open candle
+        """
+        columns = data_columns(strategy)
+        if strategy is not None and strategy.lookback_bars is not None:
+            bars = max(strategy.lookback_bars, ChartDrawer.MAX_CANDLES)
+            data = self.collector.load_recent(symbol, interval, bars, columns=columns)
+        else:
+            data = self.collector.load_data(symbol, interval, columns=columns)
         if "close_time" not in data.columns:
             logger.warning("'close_time' column not found in data. Chart dates may be incorrect.")
+        elif close_time is not None:
+            data = closed_bars(data, close_time)
+        # lets strategies look up cached indicators of the series
+        data.attrs.update(symbol=symbol, interval=interval)
         return data
 
     def get_available_strategies(self) -> list[str]:
         return list(self.strategies.keys())
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
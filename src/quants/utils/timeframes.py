@@ -0,0 +1,121 @@
+from datetime import datetime, tzinfo
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+INTERVAL_UNITS_MS = {
+    "s": 1_000,
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+}
+
+TimeLike = Union[int, float, str, datetime, pd.Timestamp]
+
+
+def interval_to_ms(interval: str) -> int:
+    """
+    Convert a kline interval string (e.g. '4h', '1d') to milliseconds.
+
+    :param interval: The candlestick interval
+    :return: The interval length in milliseconds
+    """
+    unit = interval[-1]
+    if unit not in INTERVAL_UNITS_MS or not interval[:-1].isdigit():
+        raise ValueError(f"Invalid interval format: {interval}")
+    return int(interval[:-1]) * INTERVAL_UNITS_MS[unit]
+
+
+def to_epoch_ms(value: TimeLike) -> int:
+    """
+    Convert a timestamp to UTC epoch milliseconds. Naive datetimes are treated as UTC.
+
+    :param value: Epoch milliseconds, a datetime or a parseable string
+    :return: UTC epoch milliseconds
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value // 1_000_000)
+
+
+def to_epoch_ms_array(values: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """
+    Convert a column of timestamps to an int64 array of UTC epoch milliseconds.
+
+    :param values: Datetime (naive UTC or tz-aware) or integer epoch millisecond values
+    :return: An int64 numpy array
+    """
+    if isinstance(values, pd.Series):
+        if pd.api.types.is_datetime64_any_dtype(values):
+            # .values drops the timezone and yields UTC datetime64[ns]
+            return values.values.astype("datetime64[ms]").astype(np.int64)
+        if values.dtype == object:
+            # datetime strings, possibly mixed with epoch-ms strings from older files
+            numeric = pd.to_numeric(values, errors="coerce")
+            if numeric.notna().all():
+                return numeric.to_numpy(dtype=np.int64)
+            parsed = pd.to_datetime(values.where(numeric.isna()), utc=True)
+            parsed = parsed.values.astype("datetime64[ms]").astype(np.int64)
+            return np.where(numeric.notna(), numeric.fillna(0).to_numpy(np.int64), parsed)
+        return values.to_numpy(dtype=np.int64)
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ms]").astype(np.int64)
+    return values.astype(np.int64)
+
+
+def to_local_datetime(value_ms: int, tz: Union[str, tzinfo]) -> datetime:
+    """
+    Render one epoch-millisecond timestamp as a timezone-aware datetime.
+
+    :param value_ms: UTC epoch milliseconds
+    :param tz: Target timezone
+    """
+    return pd.Timestamp(int(value_ms), unit="ms", tz="UTC").tz_convert(tz).to_pydatetime()
+
+
+def localize_times(
+    values: Union[pd.Series, np.ndarray], tz: Union[str, tzinfo]
+) -> pd.DatetimeIndex:
+    """
+    Render an array of epoch-millisecond timestamps as timezone-aware datetimes.
+
+    Time stays int64 epoch ms everywhere in the data layer; call this only when the values
+    are displayed or exported.
+
+    :param values: UTC epoch milliseconds
+    :param tz: Target timezone
+    """
+    return (
+        pd.DatetimeIndex(to_epoch_ms_array(values).astype("datetime64[ms]"))
+        .tz_localize("UTC")
+        .tz_convert(tz)
+    )
+
+
+def render_times(
+    data: pd.DataFrame,
+    tz: Union[str, tzinfo],
+    columns: Sequence[str] = ("open_time", "close_time", "timestamp"),
+) -> pd.DataFrame:
+    """
+    Copy of ``data`` with its epoch-millisecond time columns rendered in ``tz``.
+
+    :param data: A frame with int64 epoch-millisecond time columns
+    :param tz: Target timezone
+    :param columns: Time columns to render, where present
+    """
+    data = data.copy()
+    for col in columns:
+        if col in data.columns:
+            data[col] = localize_times(data[col], tz)
+    return data
@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Union
 import pytz
 
 import matplotlib.pyplot as plt
@@ -11,13 +11,17 @@ from mplfinance.original_flavor import candlestick_ohlc
 import matplotlib.ticker as mticker
 
 from ..utils.logger import get_logger
+from ..utils.timeframes import localize_times, to_local_datetime
 
 logger = get_logger(__name__)
 
 class ChartDrawer:
-    def __init__(self, save_dir: str):
+    MAX_CANDLES = 100
+    COLUMNS = ["open", "high", "low", "close", "volume"]
+
+    def __init__(self, save_dir: str, timezone: str = 'UTC'):
         self.base_save_dir = save_dir
-        self.sg_tz = pytz.timezone('Asia/Singapore')
+        self.tz = pytz.timezone(timezone)
 
     def draw_chart(
         self,
@@ -25,36 +29,34 @@ class ChartDrawer:
         symbol: str,
         interval: str,
         strategy_id: str,
-        trigger_time: datetime,
+        trigger_time: Union[int, datetime],
         plot_config: Dict[str, Any]
     ):
         logger.info(f"Drawing chart for {symbol} - {interval} - Strategy ID: {strategy_id}")
 
-        data = data.copy()
-        
-        # Convert to Singapore timezone
+        # Times arrive as UTC epoch ms; only the plotted candles are rendered in local time
+        data = data.tail(self.MAX_CANDLES).copy()
         if 'close_time' in data.columns:
-            data['date'] = pd.to_datetime(data['close_time'], unit='ms', utc=True).dt.tz_convert(self.sg_tz)
+            data['date'] = localize_times(data['close_time'], self.tz)
             data.set_index('date', inplace=True)
         elif not isinstance(data.index, pd.DatetimeIndex):
             if data.index.dtype == 'int64':
-                data.index = pd.to_datetime(data.index, unit='ms', utc=True).tz_convert(self.sg_tz)
+                data.index = localize_times(data.index.to_numpy(), self.tz).rename('date')
             else:
-                data.index = pd.to_datetime(data.index, utc=True).tz_convert(self.sg_tz)
-
-        # Convert trigger_time to Singapore timezone
-        if not isinstance(trigger_time, datetime):
-            trigger_time = pd.to_datetime(trigger_time, unit='ms', utc=True)
-        if trigger_time.tzinfo is None:
-            trigger_time = trigger_time.replace(tzinfo=pytz.UTC)
-        trigger_time = trigger_time.astimezone(self.sg_tz)
+                data.index = pd.to_datetime(data.index, utc=True).tz_convert(self.tz).rename('date')
+
+        if isinstance(trigger_time, datetime):
+            if trigger_time.tzinfo is None:
+                trigger_time = trigger_time.replace(tzinfo=pytz.UTC)
+            trigger_time = trigger_time.astimezone(self.tz)
+        else:
+            trigger_time = to_local_datetime(trigger_time, self.tz)
         
         # Ensure we have a valid trigger_time
         if trigger_time.year == 1970:
             logger.warning("Invalid trigger_time detected. Using current time instead.")
-            trigger_time = datetime.now(self.sg_tz)
+            trigger_time = datetime.now(self.tz)
         
-        data = data.tail(100)  # Last 100 candles
         data = data.sort_index()
 
         # Validate data
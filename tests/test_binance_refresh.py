@@ -0,0 +1,211 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+
+from src.quants.config.base import AppConfig, CEXConfig, DataStorageConfig
+from src.quants.data_collector.binance_collector import BinanceDataCollector
+from src.quants.platform.binance import BinancePlatform
+from src.quants.platform.rate_limit import WeightRateLimiter
+from src.quants.utils.timeframes import interval_to_ms
+
+HOUR = interval_to_ms("1h")
+
+
+class FakeBinance(ThreadingHTTPServer):
+    """Local stand-in for the Binance REST API: exchangeInfo and klines up to now."""
+
+    daemon_threads = True
+
+    def __init__(self, symbols: List[str]):
+        super().__init__(("127.0.0.1", 0), FakeBinanceHandler)
+        self.symbols = symbols
+        self.invalid: Set[str] = set()
+        # (status, headers) served instead of the next kline responses
+        self.scripted: List[Tuple[int, Dict[str, str]]] = []
+        # reported in X-MBX-USED-WEIGHT-1M, as if other clients shared the IP
+        self.used_weight: Optional[int] = None
+        self.kline_requests: List[Tuple[float, str, int]] = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def klines(self, params: Dict[str, str]) -> List[list]:
+        step = interval_to_ms(params["interval"])
+        now_ms = int(time.time() * 1000)
+        first = -(-int(params["startTime"]) // step) * step
+        last = min(int(params["endTime"]), now_ms)
+        open_times = range(first, last + 1, step)[: int(params["limit"])]
+        return [
+            [t, "1.0", "3.0", "0.5", "2.0", "10.0", t + step - 1, "20.0", 5, "4.0", "8.0", "0"]
+            for t in open_times
+        ]
+
+
+class FakeBinanceHandler(BaseHTTPRequestHandler):
+    server: FakeBinance
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        headers: Dict[str, str] = {}
+        if url.path == "/api/v3/exchangeInfo":
+            status, body = 200, {
+                "symbols": [
+                    {"symbol": s, "baseAsset": s[:-4], "quoteAsset": "USDT", "status": "TRADING"}
+                    for s in self.server.symbols
+                ]
+            }
+        elif url.path == "/api/v3/klines":
+            with self.server.lock:
+                scripted = self.server.scripted.pop(0) if self.server.scripted else None
+                status = scripted[0] if scripted else 200
+                self.server.kline_requests.append((time.time(), params["symbol"], status))
+            if scripted:
+                headers = scripted[1]
+                body = {"code": -1003, "msg": "Too many requests."}
+            elif params["symbol"] in self.server.invalid:
+                status, body = 400, {"code": -1121, "msg": "Invalid symbol."}
+            else:
+                body = self.server.klines(params)
+        else:
+            status, body = 404, {"code": -1, "msg": "Not found."}
+
+        if self.server.used_weight is not None:
+            headers[WeightRateLimiter.USED_WEIGHT_HEADER] = str(self.server.used_weight)
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class NoAuth:
+    """The REST refresh only uses public endpoints, so no client is needed."""
+
+    def get_client(self):
+        return None
+
+    def get_spot(self):
+        return None
+
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+
+
+@pytest.fixture
+def server():
+    server = FakeBinance(list(SYMBOLS))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_collector(tmp_path, server: FakeBinance, limiter: WeightRateLimiter):
+    platform = BinancePlatform(NoAuth(), base_url=server.url, max_retries=2)
+    platform.rate_limiter = limiter
+    config = AppConfig(
+        cex=CEXConfig(
+            api_key="",
+            api_secret="",
+            base_url=server.url,
+            platform="binance",
+            kline_intervals=["1h"],
+            timezone="UTC",
+            refresh_workers=4,
+        ),
+        analysis=None,
+        strategies={},
+        data_storage=DataStorageConfig(data_path=str(tmp_path), enabled=True, backend="npy"),
+    )
+    return BinanceDataCollector(platform, config)
+
+
+@pytest.fixture
+def make(tmp_path, server):
+    collectors = []
+
+    def make(limiter: WeightRateLimiter) -> BinanceDataCollector:
+        collectors.append(make_collector(tmp_path, server, limiter))
+        return collectors[-1]
+
+    yield make
+    for collector in collectors:
+        collector.close()
+        collector.platform.session.close()
+
+
+def test_refresh_from_fake_server(server, make):
+    collector = make(WeightRateLimiter())
+    now_ms = int(time.time() * 1000)
+    report = collector.update_data_for_interval("1h")
+
+    assert sorted(report.updated) == sorted(SYMBOLS)
+    assert report.failed == {} and report.unchanged == []
+    last_closed = now_ms - now_ms % HOUR - HOUR
+    for symbol in SYMBOLS:
+        assert len(collector.storage.read(symbol, "1h")) >= 24
+        assert collector.watermarks.get_high_water(symbol, "1h") >= last_closed
+
+
+def test_used_weight_header_throttles_requests(server, make):
+    # another client on the IP has used the whole budget, so every response says so and
+    # each following request has to wait for the next window
+    window = 0.3
+    server.used_weight = 10
+    collector = make(WeightRateLimiter(weight_limit=10, window_seconds=window, headroom=1.0))
+    report = collector.update_data_for_interval("1h", max_workers=1, symbols=SYMBOLS)
+
+    assert sorted(report.updated) == sorted(SYMBOLS)
+    sent = sorted(t for t, _, _ in server.kline_requests)
+    assert len(sent) == len(SYMBOLS)
+    # one request per window: the fourth is at least two full windows after the first
+    assert sent[-1] - sent[0] > 1.5 * window
+
+
+@pytest.mark.parametrize(
+    "status, headers, pause",
+    [(429, {"Retry-After": "1"}, 1.0), (418, {}, 1.5)],
+)
+def test_rate_limit_response_pauses_refresh(server, make, status, headers, pause):
+    limiter = WeightRateLimiter(weight_limit=100, headroom=1.0, ban_pause_seconds=1.5)
+    server.scripted.append((status, headers))
+    collector = make(limiter)
+    report = collector.update_data_for_interval("1h", max_workers=1, symbols=SYMBOLS)
+
+    # the limited request was retried, so nothing failed
+    assert sorted(report.updated) == sorted(SYMBOLS) and report.failed == {}
+    (limited_at, limited_symbol, _), *after = server.kline_requests
+    assert limited_symbol == SYMBOLS[0]
+    assert [(symbol, code) for _, symbol, code in after] == [(s, 200) for s in SYMBOLS]
+    # nothing reached the server during the pause
+    assert after[0][0] - limited_at >= pause - 0.05
+    # and the budget stays reduced for the rest of the window
+    assert limiter.budget == 50
+
+
+def test_failing_symbol_does_not_abort_refresh(server, make):
+    server.invalid.add("ETHUSDT")
+    collector = make(WeightRateLimiter())
+    report = collector.update_data_for_interval("1h", symbols=SYMBOLS)
+
+    assert list(report.failed) == ["ETHUSDT"]
+    assert "Invalid symbol" in report.failed["ETHUSDT"]
+    assert sorted(report.updated) == sorted(s for s in SYMBOLS if s != "ETHUSDT")
+    assert collector.watermarks.get_high_water("ETHUSDT", "1h") is None
+    assert collector.storage.read("ETHUSDT", "1h").empty
+    assert not collector.storage.read("BTCUSDT", "1h").empty
@@ -0,0 +1,274 @@
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pytest
+
+from src.quants.config.base import AppConfig, CEXConfig, DataStorageConfig
+from src.quants.data_collector.binance_collector import BinanceDataCollector
+from src.quants.platform import binance_stream
+from src.quants.platform.binance import BinancePlatform
+from src.quants.platform.binance_stream import BinanceKlineStream
+
+MINUTE = 60_000
+TIMEOUT = 5.0
+
+
+class FakeConnection:
+    """Stand-in for ``websocket.WebSocketApp``: delivers what the test sends it."""
+
+    CLOSE = object()
+
+    def __init__(self, server: "FakeServer", url: str, on_open, on_message, on_error):
+        self.server = server
+        self.url = url
+        self.on_open = on_open
+        self.on_message = on_message
+        self.inbox: "queue.Queue[Any]" = queue.Queue()
+
+    def run_forever(self, **kwargs) -> None:
+        self.on_open(self)
+        self.server.connections.put(self)
+        while True:
+            message = self.inbox.get()
+            try:
+                if message is self.CLOSE:
+                    return
+                self.on_message(self, message)
+            finally:
+                self.inbox.task_done()
+
+    def send(self, *messages: str) -> None:
+        """Deliver messages and wait until the stream has handled them."""
+        for message in messages:
+            self.inbox.put(message)
+        self.inbox.join()
+
+    def close(self) -> None:
+        self.inbox.put(self.CLOSE)
+
+    # the server dropping the connection looks the same to the client
+    drop = close
+
+
+class FakeServer:
+    def __init__(self):
+        self.connections: "queue.Queue[FakeConnection]" = queue.Queue()
+
+    def connect(self, url: str, on_open, on_message, on_error) -> FakeConnection:
+        return FakeConnection(self, url, on_open, on_message, on_error)
+
+    def next_connection(self) -> FakeConnection:
+        return self.connections.get(timeout=TIMEOUT)
+
+
+@pytest.fixture
+def server(monkeypatch) -> FakeServer:
+    server = FakeServer()
+    monkeypatch.setattr(binance_stream.websocket, "WebSocketApp", server.connect)
+    return server
+
+
+def kline_message(symbol: str, interval: str, open_time: int, closed: bool, close: float = 2.0):
+    kline = {
+        "t": open_time,
+        "T": open_time + MINUTE - 1,
+        "s": symbol,
+        "i": interval,
+        "o": "1.0",
+        "c": str(close),
+        "h": "3.0",
+        "l": "0.5",
+        "v": "10.0",
+        "n": 5,
+        "x": closed,
+        "q": "20.0",
+        "V": "4.0",
+        "Q": "8.0",
+        "B": "0",
+    }
+    return json.dumps(
+        {"stream": f"{symbol.lower()}@kline_{interval}", "data": {"e": "kline", "k": kline}}
+    )
+
+
+class Recorder:
+    """Collects callback calls and lets the test wait for them."""
+
+    def __init__(self):
+        self.calls: List[Any] = []
+        self.event = threading.Event()
+
+    def __call__(self, *args) -> None:
+        self.calls.append(args)
+        self.event.set()
+
+    def wait(self) -> List[Any]:
+        assert self.event.wait(TIMEOUT)
+        return self.calls
+
+
+def test_open_and_closed_klines(server):
+    klines = Recorder()
+    stream = BinanceKlineStream("ws://fake", streams_per_connection=2)
+    stream.start(["BTCUSDT", "ETHUSDT"], ["1m"], klines)
+    connection = server.next_connection()
+    try:
+        connection.send(
+            kline_message("BTCUSDT", "1m", 0, closed=False, close=1.5),
+            json.dumps({"result": None, "id": 1}),
+            "not json",
+            kline_message("BTCUSDT", "1m", 0, closed=True),
+        )
+    finally:
+        stream.stop()
+
+    assert "streams=btcusdt@kline_1m/ethusdt@kline_1m" in connection.url
+    assert [(symbol, interval, closed) for symbol, interval, _, closed in klines.calls] == [
+        ("BTCUSDT", "1m", False),
+        ("BTCUSDT", "1m", True),
+    ]
+    # rows have the REST layout, so they parse like polled klines
+    df = BinancePlatform.create_dataframe([klines.calls[1][2]])
+    assert list(df.columns) == BinancePlatform.KLINE_COLS
+    assert df["open_time"].iloc[0] == 0 and df["close_time"].iloc[0] == MINUTE - 1
+    assert df["close"].iloc[0] == 2.0 and df["number_of_trades"].iloc[0] == 5
+
+
+def test_streams_spread_over_connections(server):
+    stream = BinanceKlineStream("ws://fake", streams_per_connection=2)
+    stream.start(["A", "B", "C"], ["1m"], Recorder())
+    try:
+        urls = sorted(server.next_connection().url for _ in range(2))
+    finally:
+        stream.stop()
+    assert [url.split("streams=")[1] for url in urls] == ["a@kline_1m/b@kline_1m", "c@kline_1m"]
+
+
+def test_reconnect_reports_affected_symbols(server):
+    klines, reconnects = Recorder(), Recorder()
+    stream = BinanceKlineStream("ws://fake", min_reconnect_delay=0.01)
+    stream.start(["BTCUSDT", "ETHUSDT"], ["1m", "4h"], klines, reconnects)
+    try:
+        first = server.next_connection()
+        first.send(kline_message("BTCUSDT", "1m", 0, closed=True))
+        first.drop()
+        second = server.next_connection()
+        second.send(kline_message("BTCUSDT", "1m", MINUTE, closed=True))
+        calls = reconnects.wait()
+    finally:
+        stream.stop()
+
+    assert second.url == first.url
+    assert calls == [({"1m": ["BTCUSDT", "ETHUSDT"], "4h": ["BTCUSDT", "ETHUSDT"]},)]
+    assert [row[0] for _, _, row, _ in klines.calls] == [0, MINUTE]
+
+
+def test_stop_ends_connection_threads(server):
+    stream = BinanceKlineStream("ws://fake", min_reconnect_delay=0.01)
+    stream.start(["BTCUSDT"], ["1m"], Recorder())
+    server.next_connection()
+    stream.stop()
+    assert stream.threads == [] and stream.apps == []
+    assert server.connections.empty()
+
+
+class FakePlatform:
+    """REST side of ``BinancePlatform``: serves generated klines up to the last closed minute."""
+
+    KLINES_LIMIT = 1000
+    create_dataframe = staticmethod(BinancePlatform.create_dataframe)
+
+    def __init__(self, symbols: List[str], stream: Callable[[], BinanceKlineStream]):
+        self.symbols = symbols
+        self.stream = stream
+        self.requests: List[tuple] = []
+
+    def get_all_usdt_pairs(self) -> List[str]:
+        return list(self.symbols)
+
+    def kline_stream(self) -> BinanceKlineStream:
+        return self.stream()
+
+    def get_kline_columns(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int
+    ) -> Dict[str, np.ndarray]:
+        self.requests.append((symbol, interval, start_ms, end_ms))
+        first = -(-start_ms // MINUTE) * MINUTE
+        last_closed = int(time.time() * 1000) // MINUTE * MINUTE - MINUTE
+        open_time = np.arange(first, min(end_ms, last_closed) + 1, MINUTE, dtype=np.int64)
+        rows = [
+            [int(t), "1", "3", "0.5", "2", "10", int(t) + MINUTE - 1, "20", 5, "4", "8", "0"]
+            for t in open_time
+        ]
+        df = self.create_dataframe(rows)
+        return {col: df[col].to_numpy() for col in BinancePlatform.KLINE_COLS}
+
+
+def make_collector(tmp_path, platform: FakePlatform) -> BinanceDataCollector:
+    config = AppConfig(
+        cex=CEXConfig(
+            api_key="",
+            api_secret="",
+            base_url="",
+            platform="binance",
+            kline_intervals=["1m"],
+            timezone="UTC",
+            refresh_workers=2,
+        ),
+        analysis=None,
+        strategies={},
+        data_storage=DataStorageConfig(data_path=str(tmp_path), enabled=True, backend="npy"),
+    )
+    return BinanceDataCollector(platform, config)
+
+
+def test_collector_records_gap_and_fills_it_after_reconnect(server, tmp_path):
+    symbol = "BTCUSDT"
+    start = int(time.time() * 1000) // MINUTE * MINUTE - 10 * MINUTE
+    platform = FakePlatform(
+        [symbol], lambda: BinanceKlineStream("ws://fake", min_reconnect_delay=0.01)
+    )
+    collector = make_collector(tmp_path, platform)
+    watermarks = collector.watermarks
+    refreshed = threading.Event()
+    handle_reconnect = collector._handle_stream_reconnect
+
+    def on_reconnect(symbols_by_interval: Dict[str, List[str]]) -> None:
+        handle_reconnect(symbols_by_interval)
+        refreshed.set()
+
+    collector._handle_stream_reconnect = on_reconnect
+    try:
+        collector.start_streaming(["1m"])
+        connection = server.next_connection()
+
+        connection.send(kline_message(symbol, "1m", start, closed=True))
+        assert watermarks.get_high_water(symbol, "1m") == start
+
+        # open candles neither move the watermark nor reach storage
+        connection.send(kline_message(symbol, "1m", start + MINUTE, closed=False))
+        assert watermarks.get_high_water(symbol, "1m") == start
+        assert collector.storage.read(symbol, "1m")["open_time"].tolist() == [start]
+
+        # three bars missed while the stream was quiet
+        connection.send(kline_message(symbol, "1m", start + 4 * MINUTE, closed=True))
+        assert watermarks.get_high_water(symbol, "1m") == start + 4 * MINUTE
+        assert watermarks.get_gaps(symbol, "1m") == [(start + MINUTE, start + 3 * MINUTE)]
+        assert platform.requests == []
+
+        # the reconnect refresh fetches the gap over REST
+        connection.drop()
+        server.next_connection()
+        assert refreshed.wait(TIMEOUT)
+        assert watermarks.get_gaps(symbol, "1m") == []
+    finally:
+        collector.close()
+
+    assert (symbol, "1m", start + MINUTE, start + 3 * MINUTE) in platform.requests
+    open_time = collector.storage.read(symbol, "1m")["open_time"].to_numpy()
+    assert open_time[:5].tolist() == [start + i * MINUTE for i in range(5)]
+    assert (np.diff(open_time) == MINUTE).all()
@@ -0,0 +1,88 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from src.quants.config.base import AppConfig, CEXConfig, DataStorageConfig
+from src.quants.data_collector import CoinGeckoDataCollector, UnifiedDataCollector
+from src.quants.platform.coingecko import CoinGeckoPlatform
+from src.quants.platform.metadata import ExchangeMetadata
+
+
+def coin(coin_id: str, symbol: str, market_cap: float) -> Dict[str, Any]:
+    return {"id": coin_id, "symbol": symbol, "name": coin_id, "market_cap": market_cap}
+
+
+# 300 coins by market cap, so the smallest are on the second 250-coin page
+MARKETS = [coin("bitcoin", "btc", 1e12)] + [
+    coin(f"coin-{rank}", f"c{rank}", 1e9 / rank) for rank in range(2, 300)
+]
+MARKETS.append(coin("tiny-coin", "tiny", 1e6))
+# coins/list has everything, without market data
+LISTED = [{k: c[k] for k in ("id", "symbol", "name")} for c in MARKETS] + [
+    {"id": "bitcoin-clone", "symbol": "btc", "name": "Bitcoin Clone"},
+    {"id": "obscure", "symbol": "obs", "name": "Obscure"},
+]
+
+
+class FakeCoinGeckoClient:
+    def get_coins_markets(self, vs_currency: str, per_page: int = 100, page: int = 1):
+        return MARKETS[(page - 1) * per_page : page * per_page]
+
+    def get_coins_list(self) -> List[Dict[str, Any]]:
+        return LISTED
+
+
+class FakeCoinGeckoAuth:
+    def get_client(self) -> FakeCoinGeckoClient:
+        return FakeCoinGeckoClient()
+
+
+class FakeBinanceCollector:
+    class platform:
+        @staticmethod
+        def get_metadata() -> ExchangeMetadata:
+            symbols = [
+                {"symbol": f"{base}USDT", "baseAsset": base, "quoteAsset": "USDT"}
+                for base in ("BTC", "TINY", "OBS")
+            ]
+            return ExchangeMetadata(
+                {"symbols": [dict(s, status="TRADING") for s in symbols]}, fetched_at=0.0
+            )
+
+
+class FakeCMCCollector:
+    def get_all_cryptocurrencies(self) -> List[Dict[str, Any]]:
+        return []
+
+
+@pytest.fixture
+def config(tmp_path) -> AppConfig:
+    return AppConfig(
+        cex=CEXConfig(
+            api_key="",
+            api_secret="",
+            base_url="",
+            platform="binance",
+            kline_intervals=["1h"],
+            timezone="UTC",
+        ),
+        analysis=None,
+        strategies={},
+        data_storage=DataStorageConfig(data_path=str(tmp_path), enabled=True),
+    )
+
+
+def test_index_covers_coins_beyond_the_first_market_page(config):
+    coingecko = CoinGeckoDataCollector(
+        CoinGeckoPlatform(FakeCoinGeckoAuth()), config, market_pages=1
+    )
+    unified = UnifiedDataCollector(FakeBinanceCollector(), coingecko, FakeCMCCollector(), config)
+    unified.refresh_identity_index()
+    index = unified.identity_index
+
+    # on the second market page, and only in coins/list
+    assert index.resolve("TINYUSDT").ids == {"binance": "TINYUSDT", "coingecko": "tiny-coin"}
+    assert index.resolve("OBSUSDT").ids == {"binance": "OBSUSDT", "coingecko": "obscure"}
+    # a ticker clone without market data does not take the plain ticker
+    assert index.get("BTC").ids == {"binance": "BTCUSDT", "coingecko": "bitcoin"}
+    assert index.get("BTC:bitcoin-clone").ids == {"coingecko": "bitcoin-clone"}
@@ -0,0 +1,188 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.quants import indicators
+
+try:
+    import pandas_ta
+except ImportError:
+    pandas_ta = None
+
+BACKENDS = indicators.available_backends()
+
+
+def make_panel(bars: int, symbols: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Random-walk OHLC. Every second symbol lists partway through and every third has bars
+    missing in the middle of its history.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (bars, symbols)), axis=0))
+    high = close * (1 + rng.uniform(0, 0.01, close.shape))
+    low = close * (1 - rng.uniform(0, 0.01, close.shape))
+    missing = np.zeros(close.shape, dtype=bool)
+    for j in range(1, symbols, 2):
+        missing[: rng.integers(1, bars // 2), j] = True
+    for j in range(0, symbols, 3):
+        for start in rng.integers(0, bars - 40, 4):
+            missing[start : start + rng.integers(1, 40), j] = True
+    for values in (high, low, close):
+        values[missing] = np.nan
+    return {"high": high, "low": low, "close": close}
+
+
+def ema_reference(close: pd.Series, length: int) -> pd.Series:
+    """pandas_ta's ``ema`` of the bars a symbol has: seeded with the SMA of the first ones."""
+    values = close.dropna()
+    if len(values) < length:
+        return pd.Series(np.nan, index=close.index)
+    seed = values.iloc[:length].mean()
+    values.iloc[: length - 1] = np.nan
+    values.iloc[length - 1] = seed
+    return values.ewm(span=length, adjust=False).mean().reindex(close.index)
+
+
+def rma_reference(values: pd.Series, length: int) -> pd.Series:
+    """pandas_ta's ``rma`` of the bars with values."""
+    return values.dropna().ewm(alpha=1 / length, min_periods=length).mean()
+
+
+def references(high: pd.Series, low: pd.Series, close: pd.Series) -> Dict[str, pd.Series]:
+    change = close.diff()
+    gains = rma_reference(change.clip(lower=0), 14).reindex(close.index)
+    losses = rma_reference(-change.clip(upper=0), 14).reindex(close.index)
+    previous = close.shift()
+    true_range = pd.concat([high - low, (high - previous).abs(), (low - previous).abs()], axis=1)
+    true_range = true_range.max(axis=1).where(previous.notna())
+    macd = ema_reference(close, 12) - ema_reference(close, 26)
+    return {
+        "sma": close.rolling(20).mean(),
+        "ema": ema_reference(close, 20),
+        "rsi": 100 * gains / (gains + losses),
+        "atr": rma_reference(true_range, 14).reindex(close.index),
+        "macd": ema_reference(macd, 9),
+        "bollinger": close.rolling(20).mean() + 2 * close.rolling(20).std(ddof=0),
+        "zscore": (close - close.rolling(30).mean()) / close.rolling(30).std(),
+        "momentum": close.diff(10),
+    }
+
+
+def pandas_ta_references(high: pd.Series, low: pd.Series, close: pd.Series) -> Dict[str, object]:
+    return {
+        "sma": pandas_ta.sma(close, 20),
+        "ema": pandas_ta.ema(close, 20),
+        "rsi": pandas_ta.rsi(close, 14),
+        "atr": pandas_ta.atr(high, low, close, 14),
+        "macd": pandas_ta.macd(close).iloc[:, 2],
+        "bollinger": pandas_ta.bbands(close, 20, 2).iloc[:, 2],
+        "zscore": pandas_ta.zscore(close, 30),
+        "momentum": pandas_ta.mom(close, 10),
+    }
+
+
+def kernel_results(panel: Dict[str, np.ndarray], backend: str) -> Dict[str, np.ndarray]:
+    high, low, close = panel["high"], panel["low"], panel["close"]
+    return {
+        "sma": indicators.sma(close, 20),
+        "ema": indicators.ema(close, 20, backend),
+        "rsi": indicators.rsi(close, 14, backend),
+        "atr": indicators.atr(high, low, close, 14, backend),
+        "macd": indicators.macd(close, backend=backend)["signal"],
+        "bollinger": indicators.bollinger(close, 20, 2)["upper"],
+        "zscore": indicators.zscore(close, 30),
+        "momentum": indicators.momentum(close, 10),
+    }
+
+
+def assert_matches(
+    results: Dict[str, np.ndarray], expected: Dict[str, object], close: pd.Series, j: int
+) -> None:
+    for name, values in expected.items():
+        # the kernels have no value on bars a symbol lacks
+        values = pd.Series(values).reindex(close.index).where(close.notna())
+        np.testing.assert_allclose(
+            results[name][:, j],
+            values.to_numpy(dtype=np.float64),
+            rtol=1e-9,
+            atol=1e-9,
+            err_msg=f"{name} of symbol {j}",
+        )
+
+
+@pytest.fixture(scope="module")
+def panel() -> Dict[str, np.ndarray]:
+    return make_panel(1_500, 9, seed=1)
+
+
+def series(panel: Dict[str, np.ndarray], j: int):
+    return (pd.Series(panel[col][:, j]) for col in ("high", "low", "close"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_kernels_match_per_symbol_pandas(panel, backend):
+    results = kernel_results(panel, backend)
+    for j in range(panel["close"].shape[1]):
+        high, low, close = series(panel, j)
+        assert_matches(results, references(high, low, close), close, j)
+
+
+@pytest.mark.skipif(pandas_ta is None, reason="pandas_ta is not installed")
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_kernels_match_pandas_ta(panel, backend):
+    results = kernel_results(panel, backend)
+    for j in range(panel["close"].shape[1]):
+        high, low, close = series(panel, j)
+        if close.isna().any():
+            # pandas_ta seeds its averages by position, so it only applies to full histories
+            continue
+        assert_matches(results, pandas_ta_references(high, low, close), close, j)
+
+
+@pytest.mark.skipif(len(BACKENDS) < 2, reason="numba is not installed")
+def test_backends_agree_across_gaps(panel):
+    numba, numpy = (kernel_results(panel, backend) for backend in ("numba", "numpy"))
+    for name in numba:
+        np.testing.assert_allclose(numba[name], numpy[name], rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_gap_is_skipped(backend):
+    close = np.array([1.0, 2.0, 3.0, np.nan, np.nan, 4.0, 5.0])
+    expected = ema_reference(pd.Series(close), 3).to_numpy()
+    np.testing.assert_allclose(indicators.ema(close, 3, backend), expected)
+    # the bar after the gap continues from the bar before it
+    assert np.isnan(expected[3:5]).all()
+    assert expected[5] == pytest.approx(0.5 * 4.0 + 0.5 * expected[2])
+
+
+def test_rolling_windows_across_blocks(monkeypatch):
+    monkeypatch.setattr(indicators.kernels, "BLOCK_ELEMENTS", 64)
+    values = make_panel(500, 4, seed=2)["close"]
+    for j in range(values.shape[1]):
+        close = pd.Series(values[:, j])
+        np.testing.assert_allclose(
+            indicators.sma(values, 20)[:, j], close.rolling(20).mean(), rtol=1e-9, atol=1e-9
+        )
+        np.testing.assert_allclose(
+            indicators.rolling_std(values, 20)[:, j],
+            close.rolling(20).std(),
+            rtol=1e-9,
+            atol=1e-9,
+        )
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_one_dimensional_input(backend):
+    close = make_panel(200, 1)["close"]
+    np.testing.assert_allclose(
+        indicators.ema(close[:, 0], 10, backend), indicators.ema(close, 10, backend)[:, 0]
+    )
+    assert indicators.rsi(close[:, 0], 14, backend).shape == (200,)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        indicators.ema(np.ones(10), 3, backend="cuda")
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.quants.data_collector.resampling import Resampler, bucket_bounds, resample_bars
+from src.quants.storage import StorageFactory
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
+def ms(timestamp: str) -> int:
+    return pd.Timestamp(timestamp, tz="UTC").value // 1_000_000
+
+
+def klines(start: str, bars: int, step: int = HOUR, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    open_time = ms(start) + step * np.arange(bars, dtype=np.int64)
+    close = 100 + rng.standard_normal(bars).cumsum()
+    return pd.DataFrame(
+        {
+            "open_time": open_time,
+            "open": close + rng.standard_normal(bars),
+            "high": close + 2,
+            "low": close - 2,
+            "close": close,
+            "volume": rng.uniform(size=bars),
+            "close_time": open_time + step - 1,
+            "number_of_trades": rng.integers(0, 100, bars),
+        }
+    )
+
+
+def pandas_resample(data: pd.DataFrame, rule: str, timezone: str) -> pd.DataFrame:
+    index = pd.to_datetime(data["open_time"], unit="ms", utc=True).dt.tz_convert(timezone)
+    grouped = data.set_index(index).resample(rule, label="left", closed="left")
+    expected = grouped.agg(
+        {
+            "open": "first",
+            "high": "max",
+            "low": "min",
+            "close": "last",
+            "volume": "sum",
+            "number_of_trades": "sum",
+        }
+    ).dropna()
+    expected.insert(0, "open_time", expected.index.tz_convert("UTC").asi8 // 1_000_000)
+    return expected.reset_index(drop=True)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return StorageFactory.create_storage("npy", str(tmp_path))
+
+
+def test_bucket_bounds_at_boundaries():
+    open_time = np.array(
+        [ms("2024-03-04 00:00"), ms("2024-03-04 03:00"), ms("2024-03-04 04:00")], dtype=np.int64
+    )
+    opens, closes = bucket_bounds(open_time, 4 * HOUR)
+    assert opens.tolist() == [ms("2024-03-04 00:00")] * 2 + [ms("2024-03-04 04:00")]
+    assert closes.tolist() == [ms("2024-03-04 04:00") - 1] * 2 + [ms("2024-03-04 08:00") - 1]
+
+
+def test_weekly_bars_open_on_monday():
+    # 2024-03-10 is a Sunday, 2024-03-11 a Monday
+    open_time = np.array([ms("2024-03-10 23:00"), ms("2024-03-11 00:00")], dtype=np.int64)
+    opens, closes = bucket_bounds(open_time, 7 * DAY)
+    assert opens.tolist() == [ms("2024-03-04"), ms("2024-03-11")]
+    assert closes.tolist() == [ms("2024-03-11") - 1, ms("2024-03-18") - 1]
+
+
+@pytest.mark.parametrize(
+    "interval, rule, timezone",
+    [
+        ("4h", "4h", "UTC"),
+        ("1d", "1D", "UTC"),
+        ("1w", "W-MON", "UTC"),
+        ("1d", "1D", "Europe/London"),
+        ("1d", "1D", "America/New_York"),
+        ("1d", "1D", "Asia/Singapore"),
+    ],
+)
+def test_resample_matches_pandas(interval, rule, timezone):
+    # spans the March daylight saving changes in Europe and America
+    data = klines("2024-02-26", 24 * 42)
+    bars = resample_bars(data, interval, timezone)
+    expected = pandas_resample(data, rule, timezone)
+    assert bars["open_time"].tolist() == expected["open_time"].tolist()
+    columns = ["open", "high", "low", "close", "volume", "number_of_trades"]
+    np.testing.assert_allclose(bars[columns].to_numpy(float), expected[columns].to_numpy(float))
+
+
+def test_daily_bars_follow_daylight_saving():
+    bars = resample_bars(klines("2024-03-28", 24 * 7), "1d", "Europe/London")
+    hours = (bars["close_time"] - bars["open_time"] + 1) // HOUR
+    london_days = pd.date_range("2024-03-28", periods=len(bars), freq="D", tz="Europe/London")
+    # the clocks went forward on 2024-03-31, a 23 hour day
+    assert dict(zip(london_days.strftime("%m-%d"), hours))["03-31"] == 23
+    assert sorted(set(hours)) == [23, 24]
+    assert (bars["open_time"].to_numpy()[1:] == bars["close_time"].to_numpy()[:-1] + 1).all()
+    # local midnight is 00:00 UTC in winter and 23:00 UTC the day before in summer
+    assert bars["open_time"].iloc[1] == ms("2024-03-29 00:00")
+    assert bars["open_time"].iloc[4] == ms("2024-03-31 23:00")
+
+
+def test_partial_last_bar_keeps_full_close_time():
+    bars = resample_bars(klines("2024-03-04", 6), "4h")
+    assert len(bars) == 2
+    assert bars["close_time"].iloc[-1] == ms("2024-03-04 08:00") - 1
+    assert bars["close"].iloc[-1] == klines("2024-03-04", 6)["close"].iloc[-1]
+
+
+def test_update_completes_partial_bar(storage):
+    data = klines("2024-03-04", 24)
+    resampler = Resampler(storage, "1h", ["4h"])
+    storage.write("X", "1h", data.iloc[:6])
+    assert resampler.update_interval("X", "4h") == 2
+    storage.append("X", "1h", data.iloc[6:])
+    resampler.update_interval("X", "4h")
+    stored = storage.read("X", "4h")
+    expected = resample_bars(data, "4h")
+    assert stored["open_time"].tolist() == expected["open_time"].tolist()
+    np.testing.assert_allclose(stored[expected.columns].to_numpy(float), expected.to_numpy(float))
+
+
+def test_backfill_rebuilds_changed_bars(storage):
+    data = klines("2024-03-04", 24 * 4)
+    gap = slice(30, 40)
+    resampler = Resampler(storage, "1h", ["4h", "1d"])
+    storage.write("X", "1h", data.drop(index=range(gap.start, gap.stop)))
+    resampler.update("X")
+    storage.merge("X", "1h", data.iloc[gap])
+    resampler.update("X", changed_from=int(data["open_time"].iloc[gap.start]))
+    for interval in resampler.intervals:
+        stored = storage.read("X", interval)
+        expected = resample_bars(data, interval)
+        np.testing.assert_allclose(
+            stored[expected.columns].to_numpy(float), expected.to_numpy(float), err_msg=interval
+        )
+
+
+def test_closed_since():
+    resampler = Resampler(None, "1h", ["4h", "1d"], "Europe/London")
+    close_4h = ms("2024-03-04 04:00") - 1
+    # the last base bar of a coarse bar closes it
+    assert resampler.closed_since("4h", ms("2024-03-04 02:00"), ms("2024-03-04 03:00")) == close_4h
+    # a base bar inside a coarse bar: the newest complete one is the bar before
+    assert resampler.closed_since("4h", None, ms("2024-03-04 05:00")) == close_4h
+    assert resampler.closed_since("4h", ms("2024-03-04 03:00"), ms("2024-03-04 05:00")) is None
+    # several base bars at once still name only the newest completed bar
+    close_8h = ms("2024-03-04 08:00") - 1
+    assert resampler.closed_since("4h", ms("2024-03-04 01:00"), ms("2024-03-04 07:00")) == close_8h
+    # the London day starting after the clocks went forward ends at 23:00 UTC
+    last_hour = ms("2024-04-01 22:00")
+    assert resampler.closed_since("1d", last_hour - HOUR, last_hour) == last_hour + HOUR - 1
+
+
+def test_derived_intervals():
+    assert Resampler(None, "1h", ["1h", "4h", "1d", "90m"]).intervals == ["4h", "1d"]
+    # half-hour offsets put local midnight between hourly bars
+    assert Resampler(None, "1h", ["1d"], "Asia/Kolkata").intervals == []
+    assert Resampler(None, "1h", ["1d"], "America/New_York").intervals == ["1d"]
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.quants.storage.ring_buffer import SharedBarBuffer
+
+
+@pytest.fixture
+def name(request) -> str:
+    return f"quants_test_{os.getpid()}_{request.node.name}"[:30]
+
+
+def bars(*open_times: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open_time": list(open_times),
+            "close_time": [t + 59_999 for t in open_times],
+            "close": [float(t) for t in open_times],
+        }
+    )
+
+
+def test_create_keeps_a_live_segment(name):
+    writer = SharedBarBuffer.create(name, 4)
+    reader = SharedBarBuffer.attach(name)
+    try:
+        writer.push(bars(0, 60_000))
+        with pytest.raises(FileExistsError):
+            SharedBarBuffer.create(name, 4)
+        assert reader.frame()["open_time"].tolist() == [0, 60_000]
+        writer.push(bars(120_000))
+        assert reader.last_open_time() == 120_000
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_create_replaces_a_stale_segment(name):
+    stale = SharedBarBuffer.create(name, 4)
+    stale.push(bars(0))
+    stale.shm.close()  # the writer went away without unlinking
+    replacement = SharedBarBuffer.create(name, 8, replace=True)
+    try:
+        assert replacement.capacity == 8 and len(replacement) == 0
+    finally:
+        replacement.close()
+
+
+def test_push_keeps_newest_bars_contiguous(name):
+    buffer = SharedBarBuffer.create(name, 3)
+    try:
+        buffer.push(bars(0, 60_000))
+        buffer.push(bars(60_000, 120_000, 180_000))
+        assert buffer.frame()["open_time"].tolist() == [60_000, 120_000, 180_000]
+        assert buffer.frame(2, ["close"])["close"].tolist() == [120_000.0, 180_000.0]
+    finally:
+        buffer.close()